@@ -0,0 +1,58 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Compares SimulatedAnnealingSolver with the simulated annealing from dwave-neal.
+
+Usage:
+    python benchmarks/annealing_benchmark.py [NUM_READS ...]
+"""
+import sys
+import time
+
+import dimod
+import neal
+from zquantum.qubo.solvers import SimulatedAnnealingSolver
+
+DEFAULT_NUM_READS = [100, 1000]
+NUM_SWEEPS = 1000
+
+PROBLEMS = {
+    "dense-200": lambda: dimod.generators.uniform(
+        200, "SPIN", low=-1, high=1, seed=200
+    ),
+    "sparse-2000": lambda: dimod.generators.gnp_random_bqm(
+        2000, 0.005, "SPIN", random_state=2000
+    ),
+}
+
+
+def run(sampler, bqm, num_reads):
+    start_time = time.perf_counter()
+    sampleset = sampler.sample(
+        bqm, num_reads=num_reads, num_sweeps=NUM_SWEEPS, seed=1234
+    )
+    return time.perf_counter() - start_time, sampleset
+
+
+def main(num_reads_list):
+    print(
+        f"{'problem':>12} {'reads':>6} {'sampler':>8} {'time [s]':>10} "
+        f"{'min energy':>12} {'mean energy':>12}"
+    )
+    for name, make_problem in PROBLEMS.items():
+        bqm = make_problem()
+        for num_reads in num_reads_list:
+            for sampler_name, sampler in [
+                ("numpy", SimulatedAnnealingSolver()),
+                ("neal", neal.SimulatedAnnealingSampler()),
+            ]:
+                elapsed, sampleset = run(sampler, bqm, num_reads)
+                energies = sampleset.record.energy
+                print(
+                    f"{name:>12} {num_reads:>6} {sampler_name:>8} {elapsed:>10.3f} "
+                    f"{energies.min():>12.3f} {energies.mean():>12.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main([int(num_reads) for num_reads in sys.argv[1:]] or DEFAULT_NUM_READS)
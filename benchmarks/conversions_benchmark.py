@@ -0,0 +1,62 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Compares conversion of QUBOs to IsingOperator with the string-parsing route.
+
+Usage:
+    python benchmarks/conversions_benchmark.py [SIZE ...]
+"""
+import sys
+import timeit
+
+import dimod
+from zquantum.core.openfermion import IsingOperator
+from zquantum.qubo import convert_qubo_to_openfermion_ising
+
+DEFAULT_SIZES = [100, 300, 1000]
+
+
+def convert_qubo_to_openfermion_ising_via_string(qubo):
+    """Previous implementation of `convert_qubo_to_openfermion_ising`."""
+    linear_coeffs, quadratic_coeffs, offset = qubo.to_ising()
+
+    list_of_ising_strings = [f"{offset}[]"]
+
+    for i, value in linear_coeffs.items():
+        list_of_ising_strings.append(f"{-value}[Z{i}]")
+
+    for (i, j), value in quadratic_coeffs.items():
+        list_of_ising_strings.append(f"{value}[Z{i} Z{j}]")
+
+    ising_string = " + ".join(list_of_ising_strings)
+    return IsingOperator(ising_string)
+
+
+def main(sizes):
+    print(f"{'size':>6} {'terms':>8} {'string [s]':>12} {'direct [s]':>12}")
+    for size in sizes:
+        qubo = dimod.generators.uniform(size, "BINARY", low=-1, high=1, seed=size)
+        expected = convert_qubo_to_openfermion_ising_via_string(qubo)
+        actual = convert_qubo_to_openfermion_ising(qubo)
+        assert actual.terms == expected.terms, "Coefficients differ"
+
+        string_time = min(
+            timeit.repeat(
+                lambda: convert_qubo_to_openfermion_ising_via_string(qubo),
+                number=1,
+                repeat=3,
+            )
+        )
+        direct_time = min(
+            timeit.repeat(
+                lambda: convert_qubo_to_openfermion_ising(qubo), number=1, repeat=3
+            )
+        )
+        print(
+            f"{size:>6} {len(actual.terms):>8} {string_time:>12.4f} "
+            f"{direct_time:>12.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,63 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Measures polishing of random samples with steepest descent.
+
+Usage:
+    python benchmarks/polishing_benchmark.py [NUM_SAMPLES ...]
+"""
+import sys
+import time
+
+import dimod
+import numpy as np
+from zquantum.qubo import compile_qubo, polish_sampleset
+
+DEFAULT_NUM_SAMPLES = [10000, 100000]
+NUM_VARIABLES = 1000
+
+PROBLEMS = {
+    "sparse-1000": lambda: dimod.generators.gnp_random_bqm(
+        NUM_VARIABLES, 0.005, "SPIN", random_state=1000
+    ),
+    "dense-1000": lambda: dimod.generators.uniform(
+        NUM_VARIABLES, "SPIN", low=-1, high=1, seed=1000
+    ),
+}
+
+
+def random_sampleset(compiled, num_samples):
+    samples = np.random.default_rng(num_samples).choice(
+        np.array([-1, 1], dtype=np.int8), (num_samples, compiled.num_variables)
+    )
+    return dimod.SampleSet.from_samples(
+        (samples, list(compiled.variables)),
+        compiled.vartype,
+        compiled.energies(samples),
+    )
+
+
+def main(num_samples_list):
+    print(
+        f"{'problem':>12} {'samples':>8} {'time [s]':>10} "
+        f"{'mean energy before':>20} {'mean energy after':>18}"
+    )
+    for name, make_problem in PROBLEMS.items():
+        bqm = make_problem()
+        compiled = compile_qubo(bqm)
+        for num_samples in num_samples_list:
+            sampleset = random_sampleset(compiled, num_samples)
+            start_time = time.perf_counter()
+            polished = polish_sampleset(sampleset, bqm)
+            elapsed = time.perf_counter() - start_time
+            energies_before = sampleset.record.energy
+            energies_after = polished.record.energy
+            mean_after = energies_after @ polished.record.num_occurrences / num_samples
+            print(
+                f"{name:>12} {num_samples:>8} {elapsed:>10.3f} "
+                f"{energies_before.mean():>20.3f} {mean_after:>18.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(num_samples) for num_samples in sys.argv[1:]] or DEFAULT_NUM_SAMPLES)
@@ -1,11 +1,25 @@
 ################################################################################
 # © Copyright 2020-2021 Zapata Computing Inc.
 ################################################################################
+from .compiled_qubo import CompiledQubo, clear_compiled_qubo_cache, compile_qubo
 from .conversions import (
+    convert_counts_to_sampleset,
     convert_measurements_to_sampleset,
     convert_openfermion_ising_to_qubo,
     convert_qubo_to_openfermion_ising,
+    convert_qubo_to_sparse_matrix,
     convert_sampleset_to_measurements,
 )
-from .io import load_qubo, load_sampleset, save_qubo, save_sampleset
-from .utils import evaluate_bitstring_for_qubo
+from .decomposition import connected_components, solve_by_components
+from .io import (
+    load_qubo,
+    load_sampleset,
+    load_sampleset_summary,
+    save_qubo,
+    save_sampleset,
+    save_sampleset_summary,
+)
+from .postprocessing import polish_sampleset
+from .preprocessing import PreprocessedBQM, expand_sampleset, preprocess_bqm
+from .summary import SampleSetSummary, summarize_sampleset
+from .utils import evaluate_bitstring_for_qubo, evaluate_bitstrings_for_qubo
@@ -0,0 +1,270 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Sequence, Tuple, Union
+
+import dimod
+import numpy as np
+from scipy.sparse import csr_matrix, triu
+
+# Number of (sample, variable) entries converted to floats at once when evaluating
+# energies in batches. Keeps memory usage bounded for large numbers of samples.
+_BATCH_CHUNK_ENTRIES = 2 ** 22
+
+# Above this fraction of nonzero couplings dense matrix multiplication is faster
+# than the sparse one.
+_DENSE_COUPLINGS_THRESHOLD = 0.1
+
+_CACHE_SIZE = 32
+
+
+class CompiledQubo:
+    """Array representation of a binary quadratic model used for fast evaluation.
+
+    Variables are indexed by their position in `variables`. Couplings are stored
+    in CSR format as an upper triangular matrix, i.e. every interaction between
+    variables with indices i < j is stored exactly once, in row i.
+
+    Instances should be treated as immutable, as they are shared between all
+    users of `compile_qubo`.
+
+    Args:
+        variables: labels of the variables, in the order used by all the arrays.
+        linear: vector of linear biases.
+        indptr: CSR row pointers of the coupling matrix.
+        indices: CSR column indices of the coupling matrix.
+        data: CSR values of the coupling matrix.
+        offset: offset of the model.
+        vartype: vartype of the model.
+    """
+
+    def __init__(
+        self,
+        variables: Sequence[Hashable],
+        linear: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray,
+        offset: float,
+        vartype: dimod.Vartype,
+    ):
+        self.variables = tuple(variables)
+        self.variable_index: Dict[Hashable, int] = {
+            variable: i for i, variable in enumerate(self.variables)
+        }
+        self.linear = linear
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.offset = offset
+        self.vartype = vartype
+        self._coupling_matrix: Optional[Union[np.ndarray, csr_matrix]] = None
+        self._adjacency: Optional[csr_matrix] = None
+        self._bit_positions: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_bqm(cls, bqm: dimod.BinaryQuadraticModel) -> "CompiledQubo":
+        """Compiles given model, bypassing the cache used by `compile_qubo`."""
+        return cls._from_vectors(bqm.to_numpy_vectors(return_labels=True), bqm.vartype)
+
+    @classmethod
+    def _from_vectors(cls, vectors, vartype: dimod.Vartype) -> "CompiledQubo":
+        linear, (rows, cols, biases), offset, labels = vectors
+        num_variables = len(labels)
+        rows, cols = np.minimum(rows, cols), np.maximum(rows, cols)
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(num_variables + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=num_variables), out=indptr[1:])
+        return cls(
+            labels,
+            np.asarray(linear, dtype=float),
+            indptr,
+            cols[order].astype(np.int64),
+            np.asarray(biases, dtype=float)[order],
+            float(offset),
+            vartype,
+        )
+
+    @property
+    def num_variables(self) -> int:
+        return len(self.variables)
+
+    @property
+    def num_interactions(self) -> int:
+        return len(self.data)
+
+    @property
+    def coupling_matrix(self) -> Union[np.ndarray, csr_matrix]:
+        """Upper triangular coupling matrix.
+
+        The matrix is dense if the model is dense enough for dense matrix products
+        to be faster than sparse ones, and a scipy CSR matrix otherwise.
+        """
+        if self._coupling_matrix is None:
+            matrix = csr_matrix(
+                (self.data, self.indices, self.indptr),
+                shape=(self.num_variables, self.num_variables),
+            )
+            if self.num_interactions > (
+                _DENSE_COUPLINGS_THRESHOLD * self.num_variables ** 2
+            ):
+                matrix = matrix.toarray()
+            self._coupling_matrix = matrix
+        return self._coupling_matrix
+
+    @property
+    def adjacency(self) -> csr_matrix:
+        """Symmetric coupling matrix in CSR format.
+
+        Every interaction between variables i and j is stored both in row i and in
+        row j, so the nonzero columns of row i are exactly the neighbours of the
+        i-th variable.
+        """
+        if self._adjacency is None:
+            upper = csr_matrix(
+                (self.data, self.indices, self.indptr),
+                shape=(self.num_variables, self.num_variables),
+            )
+            adjacency = (upper + upper.T).tocsr()
+            adjacency.sort_indices()
+            self._adjacency = adjacency
+        return self._adjacency
+
+    def permuted(self, order: Sequence[int]) -> "CompiledQubo":
+        """Returns equivalent model with variables reordered.
+
+        Args:
+            order: indices of the variables of this model, in the order in which
+                they should appear in the returned model.
+        """
+        order = np.asarray(order, dtype=np.int64)
+        upper = triu(self.adjacency[order][:, order], k=1, format="csr")
+        upper.sort_indices()
+        return CompiledQubo(
+            [self.variables[i] for i in order],
+            self.linear[order],
+            upper.indptr.astype(np.int64),
+            upper.indices.astype(np.int64),
+            upper.data,
+            self.offset,
+            self.vartype,
+        )
+
+    def bit_positions(self, num_bits: int) -> np.ndarray:
+        """Positions of the variables in bitstrings of given length.
+
+        Bitstrings assign their i-th bit to the variable labelled i, hence this
+        requires the variables to be integers smaller than `num_bits`.
+
+        Raises:
+            ValueError: if variables can't be mapped to positions in the bitstring.
+        """
+        if self._bit_positions is None:
+            if not all(
+                isinstance(variable, (int, np.integer)) and variable >= 0
+                for variable in self.variables
+            ):
+                raise ValueError(
+                    "Qubo variables need to be non-negative integers to be "
+                    "evaluated for bitstrings."
+                )
+            self._bit_positions = np.asarray(self.variables, dtype=np.int64)
+        if self.num_variables and self._bit_positions.max() >= num_bits:
+            raise ValueError(
+                "Qubo variables need to be integers smaller than the length of "
+                f"the bitstrings ({num_bits})."
+            )
+        return self._bit_positions
+
+    def energies(
+        self, samples: np.ndarray, columns: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Computes energies of given samples.
+
+        Args:
+            samples: 2-D array with one sample per row. Unless `columns` are
+                given, the i-th column holds values of the i-th variable.
+            columns: indices of the columns of `samples` holding values of
+                consecutive variables. Other columns are ignored.
+
+        Returns:
+            1-D array of energies, one for each sample.
+        """
+        num_samples, num_columns = samples.shape
+        couplings = self.coupling_matrix
+        if columns is not None and np.array_equal(
+            columns, np.arange(num_columns, dtype=columns.dtype)
+        ):
+            columns = None
+
+        energies = np.empty(num_samples, dtype=float)
+        chunk_size = max(1, _BATCH_CHUNK_ENTRIES // max(num_columns, 1))
+        for start in range(0, num_samples, chunk_size):
+            chunk = samples[start : start + chunk_size]
+            if columns is not None:
+                chunk = chunk[:, columns]
+            chunk = chunk.astype(float)
+            energies[start : start + chunk_size] = (
+                self.offset
+                + chunk @ self.linear
+                + np.einsum("ij,ij->i", chunk @ couplings, chunk)
+            )
+        return energies
+
+
+_cache: "OrderedDict[Tuple[str, str], CompiledQubo]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def compile_qubo(bqm: dimod.BinaryQuadraticModel) -> CompiledQubo:
+    """Returns compiled representation of given binary quadratic model.
+
+    Compiled models are cached by the content of the model, so scoring the
+    same model (or an equal copy of it) many times compiles it only once.
+    The least recently used models are evicted once the cache is full.
+
+    Looking a model up still requires extracting and hashing its content, as
+    models can be modified in place without any cheap way of telling.
+
+    Args:
+        bqm: model to be compiled.
+
+    Returns:
+        Compiled model.
+    """
+    vectors = bqm.to_numpy_vectors(return_labels=True)
+    key = (bqm.vartype.name, _digest(vectors))
+
+    with _cache_lock:
+        compiled = _cache.get(key)
+        if compiled is not None:
+            _cache.move_to_end(key)
+        else:
+            compiled = CompiledQubo._from_vectors(vectors, bqm.vartype)
+            _cache[key] = compiled
+            while len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+    return compiled
+
+
+def clear_compiled_qubo_cache() -> None:
+    """Removes all models from the cache used by `compile_qubo`."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def _digest(vectors) -> str:
+    linear, (rows, cols, biases), offset, labels = vectors
+    digest = hashlib.blake2b()
+    for array in (linear, rows, cols, biases):
+        digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update(array.dtype.str.encode())
+    digest.update(repr(float(offset)).encode())
+    if labels == list(range(len(labels))):
+        digest.update(f"range({len(labels)})".encode())
+    else:
+        digest.update(repr(labels).encode())
+    return digest.hexdigest()
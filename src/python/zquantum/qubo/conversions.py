@@ -1,14 +1,18 @@
 ################################################################################
 # © Copyright 2020-2022 Zapata Computing Inc.
 ################################################################################
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import dimod
 import numpy as np
 from dimod import BinaryQuadraticModel, SampleSet
+from scipy import sparse
 from zquantum.core.measurement import Measurements
 from zquantum.core.openfermion import IsingOperator
 
+from .compiled_qubo import compile_qubo
+from .utils import evaluate_bitstrings_for_qubo
+
 
 def convert_qubo_to_openfermion_ising(qubo: BinaryQuadraticModel) -> IsingOperator:
     """Converts dimod BinaryQuadraticModel to OpenFermion IsingOperator object.
@@ -27,18 +31,30 @@ def convert_qubo_to_openfermion_ising(qubo: BinaryQuadraticModel) -> IsingOperat
         IsingOperator: IsingOperator representation of the input qubo.
 
     """
-    linear_coeffs, quadratic_coeffs, offset = qubo.to_ising()
-
-    list_of_ising_strings = [f"{offset}[]"]
-
-    for i, value in linear_coeffs.items():
-        list_of_ising_strings.append(f"{-value}[Z{i}]")
+    # The coefficients are the same as the ones returned by `qubo.to_ising()`, but
+    # they are extracted as arrays and put directly into the operator's terms
+    # rather than formatted into a string which OpenFermion would need to parse.
+    # Factors of each term are sorted by qubit index, as in OpenFermion.
+    linear_coeffs, quadratic, offset, labels = qubo.spin.to_numpy_vectors(
+        return_labels=True
+    )
+    rows, cols, quadratic_coeffs = quadratic
+    qubits = np.asarray(labels, dtype=np.int64)
+    first_qubits = np.minimum(qubits[rows], qubits[cols]).tolist()
+    second_qubits = np.maximum(qubits[rows], qubits[cols]).tolist()
 
-    for (i, j), value in quadratic_coeffs.items():
-        list_of_ising_strings.append(f"{value}[Z{i} Z{j}]")
+    terms = {(): float(offset)}
+    terms.update(zip([((i, "Z"),) for i in qubits.tolist()], (-linear_coeffs).tolist()))
+    terms.update(
+        zip(
+            [((i, "Z"), (j, "Z")) for i, j in zip(first_qubits, second_qubits)],
+            quadratic_coeffs.tolist(),
+        )
+    )
 
-    ising_string = " + ".join(list_of_ising_strings)
-    return IsingOperator(ising_string)
+    operator = IsingOperator()
+    operator.terms = terms
+    return operator
 
 
 def convert_openfermion_ising_to_qubo(operator: IsingOperator) -> BinaryQuadraticModel:
@@ -85,6 +101,37 @@ def convert_openfermion_ising_to_qubo(operator: IsingOperator) -> BinaryQuadrati
     return dimod_ising.change_vartype(dimod.Vartype.BINARY, inplace=False)
 
 
+def convert_qubo_to_sparse_matrix(qubo: BinaryQuadraticModel) -> sparse.coo_matrix:
+    """Converts dimod BinaryQuadraticModel to sparse upper triangular matrix.
+
+    This is a sparse counterpart of `BinaryQuadraticModel.to_numpy_matrix`: linear
+    coefficients are placed on the diagonal and quadratic coefficients above it,
+    rows and columns follow the sorted order of variables (if they are sortable),
+    and the offset is dropped. The matrix is built directly in COO format, so
+    even very large sparse models are never densified.
+
+    Args:
+        qubo: Object we want to convert
+
+    Returns:
+        sparse.coo_matrix: matrix representation of the input qubo.
+    """
+    compiled = compile_qubo(qubo)
+    size = compiled.num_variables
+    diagonal = np.arange(size)
+    rows = np.repeat(diagonal, np.diff(compiled.indptr))
+    return sparse.coo_matrix(
+        (
+            np.concatenate([compiled.linear, compiled.data]),
+            (
+                np.concatenate([diagonal, rows]),
+                np.concatenate([diagonal, compiled.indices]),
+            ),
+        ),
+        shape=(size, size),
+    )
+
+
 def convert_sampleset_to_measurements(
     sampleset: SampleSet,
     change_bitstring_convention: bool = False,
@@ -108,23 +155,20 @@ def convert_sampleset_to_measurements(
     """
     if sampleset.vartype != dimod.BINARY:
         raise TypeError("Sampleset needs to have vartype BINARY")
-    for i in range(max(sampleset.variables)):
-        if sampleset.variables[i] != i:
-            raise ValueError(
-                "Variables of sampleset need to be ordered list of integers"
-            )
+    if sampleset.variables != range(len(sampleset.variables)):
+        raise ValueError("Variables of sampleset need to be ordered list of integers")
 
-    bitstrings = [
-        tuple(int(change_bitstring_convention != sample[i]) for i in range(len(sample)))
-        for sample in sampleset.samples()
-    ]
-    return Measurements(bitstrings)
+    bitstrings = sampleset.record.sample
+    if change_bitstring_convention:
+        bitstrings = bitstrings ^ 1
+    return Measurements(list(map(tuple, bitstrings.tolist())))
 
 
 def convert_measurements_to_sampleset(
     measurements: Measurements,
     bqm: Optional[BinaryQuadraticModel] = None,
     change_bitstring_convention: bool = False,
+    aggregate: bool = False,
 ) -> SampleSet:
     """
     Converts dimod SampleSet to zquantum.core Measurements.
@@ -150,19 +194,91 @@ def convert_measurements_to_sampleset(
         bqm: if provided, SampleSet will include energy values for each sample.
         change_bitstring_convention: whether to flip the bits in bitstrings to, depends
             on the convention one is using (see note).
+        aggregate: if True, every distinct bitstring is stored only once, with
+            its number of occurrences, and its energy is evaluated only once.
     Returns:
         SampleSet object
     """
-    bitstrings = [
-        tuple(int(change_bitstring_convention != bit) for bit in bitstring)
-        for bitstring in measurements.bitstrings
-    ]
+    bitstrings = np.asarray(measurements.bitstrings, dtype=np.int8)
+    num_occurrences = None
+    if aggregate:
+        bitstrings, num_occurrences = _unique_bitstrings(bitstrings)
+
+    return _bitstrings_to_sampleset(
+        bitstrings, num_occurrences, bqm, change_bitstring_convention
+    )
+
+
+def convert_counts_to_sampleset(
+    counts: Dict[str, int],
+    bqm: Optional[BinaryQuadraticModel] = None,
+    change_bitstring_convention: bool = False,
+) -> SampleSet:
+    """
+    Converts bitstring counts to aggregated dimod SampleSet.
+    Counts are expected in the format returned by `Measurements.get_counts`,
+    i.e. a dictionary mapping bitstrings like "0110" to the number of times they
+    were measured. Bitstrings are never expanded into separate samples, so
+    energy of every distinct bitstring is evaluated only once.
+
+    Args:
+        counts: dictionary mapping bitstrings to their number of occurrences.
+        bqm: if provided, SampleSet will include energy values for each sample.
+        change_bitstring_convention: whether to flip the bits in bitstrings to, depends
+            on the convention one is using (see note in
+            `convert_measurements_to_sampleset`).
+    Returns:
+        SampleSet object with num_occurrences taken from counts.
+    """
+    num_bits = len(next(iter(counts), ""))
+    bitstrings = np.frombuffer("".join(counts).encode(), dtype=np.uint8).reshape(
+        len(counts), num_bits
+    ).astype(np.int8) - ord("0")
+    num_occurrences = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+
+    return _bitstrings_to_sampleset(
+        bitstrings, num_occurrences, bqm, change_bitstring_convention
+    )
+
+
+def _bitstrings_to_sampleset(
+    bitstrings: np.ndarray,
+    num_occurrences: Optional[np.ndarray],
+    bqm: Optional[BinaryQuadraticModel],
+    change_bitstring_convention: bool,
+) -> SampleSet:
+    if change_bitstring_convention:
+        bitstrings ^= 1
 
     if not bqm:
         return SampleSet.from_samples(
-            bitstrings, "BINARY", [np.nan for _ in bitstrings]
+            bitstrings,
+            "BINARY",
+            np.full(len(bitstrings), np.nan),
+            num_occurrences=num_occurrences,
         )
     if bqm.vartype != dimod.BINARY:
         raise TypeError("BQM needs to have vartype BINARY")
 
-    return SampleSet.from_samples_bqm(bitstrings, bqm)
+    return SampleSet.from_samples(
+        bitstrings,
+        bqm.vartype,
+        evaluate_bitstrings_for_qubo(bitstrings, bqm),
+        num_occurrences=num_occurrences,
+    )
+
+
+def _unique_bitstrings(bitstrings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns distinct rows of 2-D array of bits and their numbers of occurrences.
+
+    Bitstrings short enough to fit in a machine integer are packed into integers
+    first, as finding unique integers is much faster than finding unique rows.
+    """
+    num_bits = bitstrings.shape[1]
+    if num_bits > 62:
+        return np.unique(bitstrings, axis=0, return_counts=True)
+
+    weights = np.left_shift(1, np.arange(num_bits - 1, -1, -1, dtype=np.int64))
+    packed, counts = np.unique(bitstrings @ weights, return_counts=True)
+    unique_bitstrings = ((packed[:, None] & weights) != 0).astype(np.int8)
+    return unique_bitstrings, counts
@@ -1,17 +1,24 @@
 ################################################################################
 # © Copyright 2021-2022 Zapata Computing Inc.
 ################################################################################
-from typing import Optional, Tuple
+import hashlib
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Tuple, Union
 
 import cvxpy as cp
 import numpy as np
-from scipy.optimize import LinearConstraint
+from scipy import sparse
+from scipy.linalg.lapack import dpstrf
+from scipy.optimize import Bounds, LinearConstraint
+from scipy.sparse.linalg import ArpackNoConvergence, eigsh, splu
 from typing_extensions import Protocol, runtime_checkable
 from zquantum.core.interfaces.optimizer import Optimizer
 
 
 def solve_qp_problem_for_psd_matrix(
-    matrix: np.ndarray, symmetrize: bool = True
+    matrix: Union[np.ndarray, sparse.spmatrix], symmetrize: bool = True
 ) -> Tuple[np.ndarray, float]:
     """
     Solves a quadratic programming (QP) optimization problem. The matrix should
@@ -25,8 +32,8 @@ def solve_qp_problem_for_psd_matrix(
         in case the domain changes in future.
 
     Args:
-        matrix: a matrix representing the problem.
-        symmetrize: a flag indicating whether the matrix should be symmetrized.
+        matrix: a matrix representing the problem, either dense or scipy sparse.
+        symmetrize: a flag indicating whether the matrix should be symmetrized.
 
     Returns:
         np.ndarray: vector representing solution to the problem.
@@ -40,21 +47,177 @@ def solve_qp_problem_for_psd_matrix(
 
     size = matrix.shape[0]
     P = matrix
-    G = np.vstack([np.eye(size), -np.eye(size)])
-    h = np.hstack([np.ones(size), np.zeros(size)])
 
+    # Box constraints are expressed as bounds on the variable rather than as
+    # a (2 * size) x size constraint matrix, which would be dense.
     x = cp.Variable(size)
-    problem = cp.Problem(cp.Minimize((1 / 2) * cp.quad_form(x, P)), [G @ x <= h])
+    problem = cp.Problem(cp.Minimize((1 / 2) * cp.quad_form(x, P)), [x >= 0, x <= 1])
 
     problem.solve()
     return x.value, problem.value
 
 
+class QPSolveTiming(NamedTuple):
+    """Timings (in seconds) of a single solve of `PSDQPSolver`.
+
+    Attributes:
+        size: size of the solved problem.
+        factorization_time: time spent on factorizing the matrix.
+        total_solve_time: time spent in cvxpy, including canonicalization.
+        solver_time: time reported by the underlying solver, if available.
+        compiled: whether the cvxpy problem was built for this solve (True) or
+            reused from the cache (False).
+    """
+
+    size: int
+    factorization_time: float
+    total_solve_time: float
+    solver_time: Optional[float]
+    compiled: bool
+
+
+_ParameterizedQP = Tuple[cp.Problem, cp.Variable, cp.Parameter]
+
+
+class PSDQPSolver:
+    """Solves sequences of QP problems with positive semi-definite matrices.
+
+    Solves the same problem as `solve_qp_problem_for_psd_matrix`, but is meant
+    for solving many problems of the same size. The problem is written in the
+    factorized form 1/2 ||F x||^2, where P = F^T F and F is a cvxpy Parameter,
+    which makes it DPP-compliant. Thanks to that, the cvxpy problem is built
+    and canonicalized once per size and subsequent solves only substitute the
+    value of F. Each solve is warm-started from the previous solution of the
+    same size. F is obtained with pivoted Cholesky decomposition, which also
+    handles singular matrices and is several times cheaper than an
+    eigendecomposition.
+
+    Args:
+        symmetrize: a flag indicating whether matrices should be symmetrized.
+        max_cached_sizes: number of problem sizes for which compiled problems
+            are kept. Least recently used ones are evicted first.
+        solver_kwargs: keyword arguments passed to `cvxpy.Problem.solve`.
+        max_recorded_timings: number of most recent solves whose timings are
+            kept. If 0, timings aren't recorded.
+
+    Attributes:
+        timings: timings of the most recent solves, oldest first.
+    """
+
+    def __init__(
+        self,
+        symmetrize: bool = True,
+        max_cached_sizes: int = 8,
+        solver_kwargs: Optional[Dict[str, Any]] = None,
+        max_recorded_timings: int = 100,
+    ):
+        self.symmetrize = symmetrize
+        self.max_cached_sizes = max_cached_sizes
+        self.solver_kwargs = {} if solver_kwargs is None else solver_kwargs
+        self.timings: Deque[QPSolveTiming] = deque(maxlen=max_recorded_timings)
+        self._problems: "OrderedDict[int, _ParameterizedQP]" = OrderedDict()
+
+    def solve(
+        self, matrix: Union[np.ndarray, sparse.spmatrix]
+    ) -> Tuple[np.ndarray, float]:
+        """Solves QP problem with given matrix.
+
+        Args:
+            matrix: a positive semi-definite matrix representing the problem.
+                Sparse matrices are densified, as the factor of the matrix is
+                dense in general.
+
+        Returns:
+            np.ndarray: vector representing solution to the problem.
+            float: optimal value of the solution.
+        """
+        if self.symmetrize:
+            matrix = (matrix + matrix.T) / 2
+
+        if not is_matrix_positive_semidefinite(matrix):
+            raise ValueError("Input matrix should be positive semi-definite.")
+        if sparse.issparse(matrix):
+            matrix = matrix.toarray()
+
+        size = matrix.shape[0]
+        start_time = time.perf_counter()
+        factor = _psd_factor(matrix)
+        factorization_time = time.perf_counter() - start_time
+
+        compiled = size not in self._problems
+        problem, x, factor_parameter = self._get_problem(size)
+        factor_parameter.value = factor
+
+        start_time = time.perf_counter()
+        problem.solve(warm_start=True, **self.solver_kwargs)
+        total_solve_time = time.perf_counter() - start_time
+
+        self.timings.append(
+            QPSolveTiming(
+                size=size,
+                factorization_time=factorization_time,
+                total_solve_time=total_solve_time,
+                solver_time=problem.solver_stats.solve_time,
+                compiled=compiled,
+            )
+        )
+        return x.value, problem.value
+
+    def _get_problem(self, size: int) -> _ParameterizedQP:
+        if size in self._problems:
+            self._problems.move_to_end(size)
+        else:
+            x = cp.Variable(size)
+            factor_parameter = cp.Parameter((size, size))
+            problem = cp.Problem(
+                cp.Minimize((1 / 2) * cp.sum_squares(factor_parameter @ x)),
+                [x >= 0, x <= 1],
+            )
+            self._problems[size] = (problem, x, factor_parameter)
+            while len(self._problems) > self.max_cached_sizes:
+                self._problems.popitem(last=False)
+        return self._problems[size]
+
+
+def _psd_factor(matrix: np.ndarray) -> np.ndarray:
+    """Returns square F such that matrix = F^T F, for a dense PSD matrix."""
+    size = matrix.shape[0]
+    factor = np.zeros((size, size))
+    if size == 0:
+        return factor
+    # Decomposition of the matrix with rows and columns permuted by `pivots`
+    # (1-based), which stops after `rank` steps for singular matrices.
+    upper, pivots, rank, _ = dpstrf(np.asarray(matrix, dtype=float), lower=0)
+    factor[:rank, pivots - 1] = np.triu(upper)[:rank]
+    return factor
+
+
+class QPTrialsResult(NamedTuple):
+    """Result of solving QP problem with multiple random restarts.
+
+    Attributes:
+        solution: vector representing the best solution found.
+        optimal_value: value of the best solution found.
+        trial_values: values of solutions found in consecutive trials.
+        trial_nfevs: numbers of function evaluations used in consecutive trials,
+            None for trials in which the optimizer didn't report it.
+        best_trial: index of the trial in which the best solution was found.
+    """
+
+    solution: np.ndarray
+    optimal_value: float
+    trial_values: np.ndarray
+    trial_nfevs: List[Optional[int]]
+    best_trial: int
+
+
 def solve_qp_problem_with_optimizer(
-    matrix: np.ndarray,
+    matrix: Union[np.ndarray, sparse.spmatrix],
     optimizer: Optimizer,
     number_of_trials: int = 1,
     symmetrize: bool = True,
+    number_of_workers: int = 1,
+    seed: Optional[int] = None,
 ) -> Tuple[np.ndarray, float]:
     """
     Solves a quadratic programming (QP) optimization problem.
@@ -62,17 +225,72 @@ def solve_qp_problem_with_optimizer(
     between 0 and 1.
 
     Args:
-        matrix: a matrix representing the problem.
+        matrix: a matrix representing the problem, either dense or scipy sparse.
         optimizer: an optimizer to be used to solve the problem. Optimizer should
             support constraints.
         number_of_trials: specifies the number of times problem will be solved.
             Only the best solution will be returned.
         symmetrize: a flag indicating whether the matrix should be symmetrized.
+        number_of_workers: number of processes the trials are distributed over.
+            See `run_qp_trials_with_optimizer` for details.
+        seed: seed from which initial points of all the trials are derived.
 
     Returns:
         np.ndarray: vector representing solution to the problem
         float: optimal value of the solution
     """
+    result = run_qp_trials_with_optimizer(
+        matrix, optimizer, number_of_trials, symmetrize, number_of_workers, seed
+    )
+    return result.solution, result.optimal_value
+
+
+def run_qp_trials_with_optimizer(
+    matrix: Union[np.ndarray, sparse.spmatrix],
+    optimizer: Optimizer,
+    number_of_trials: int = 1,
+    symmetrize: bool = True,
+    number_of_workers: int = 1,
+    seed: Optional[int] = None,
+) -> QPTrialsResult:
+    """
+    Solves a quadratic programming (QP) optimization problem starting from
+    multiple random initial points, and reports statistics of all the trials.
+    This implementation assumes that the domain of the solution are variables
+    between 0 and 1.
+
+    Notes:
+        If the seed is given, initial point of every trial is drawn from its own
+        generator, seeded with a seed derived from the master seed. Hence the
+        initial points don't depend on the number of workers. Otherwise, they
+        are drawn from numpy's global random generator. Randomness used
+        internally by the optimizer is not controlled by the seed.
+
+    Args:
+        matrix: a matrix representing the problem, either dense or scipy sparse.
+        optimizer: an optimizer to be used to solve the problem. Optimizer should
+            support constraints. If it also has a `bounds` attribute (like
+            scipy-based optimizers), the domain is set as bounds, which doesn't
+            need any matrix. Otherwise it is set as a linear constraint with
+            identity matrix, which is sparse for sparse `matrix` if the optimizer
+            uses scipy's "trust-constr" method, the only one supporting sparse
+            constraints. Other optimizers get a dense identity, which for sparse
+            matrices is only allowed up to a limited size. If more than one
+            worker is used, the optimizer has to be picklable.
+        number_of_trials: specifies the number of times problem will be solved.
+        symmetrize: a flag indicating whether the matrix should be symmetrized.
+        number_of_workers: number of processes the trials are distributed over.
+            If 1, trials are run sequentially in the current process.
+        seed: seed from which initial points of all the trials are derived.
+
+    Returns:
+        QPTrialsResult with the best solution and statistics of all trials.
+
+    Raises:
+        ValueError: if the optimizer doesn't support constraints, or if the
+            matrix is sparse and too large for a dense constraint matrix, which
+            the optimizer would need.
+    """
     if symmetrize:
         matrix = (matrix + matrix.T) / 2
 
@@ -80,45 +298,253 @@ def solve_qp_problem_with_optimizer(
     if not isinstance(optimizer, _WithConstraints):
         raise ValueError("Optimizer needs to support constraints.")
     size = matrix.shape[0]
-    A = np.eye(size)
+    _set_box_constraints(optimizer, matrix)
+
+    if seed is None:
+        initial_points = list(
+            np.random.uniform(0.0, 1.0, size=(number_of_trials, size))
+        )
+    else:
+        initial_points = [
+            np.random.default_rng(trial_seed).uniform(0.0, 1.0, size=size)
+            for trial_seed in np.random.SeedSequence(seed).spawn(number_of_trials)
+        ]
+
+    if number_of_workers == 1:
+        cost_function = _QuadraticCostFunction(matrix)
+        trial_results = [
+            _run_qp_trial(cost_function, optimizer, initial_params)
+            for initial_params in initial_points
+        ]
+    else:
+        with ProcessPoolExecutor(
+            number_of_workers,
+            initializer=_initialize_qp_trial_worker,
+            initargs=(matrix, optimizer),
+        ) as executor:
+            trial_results = list(
+                executor.map(
+                    _run_qp_trial_in_worker,
+                    initial_points,
+                    chunksize=max(1, number_of_trials // (4 * number_of_workers)),
+                )
+            )
+
+    trial_values = np.array([value for _, value, _ in trial_results])
+    best_trial = int(np.argmin(trial_values))
+    # We round the values to avoid having values like 1.0000000002 or -1e-14
+    # in the output
+    return QPTrialsResult(
+        solution=np.around(trial_results[best_trial][0], decimals=8),
+        optimal_value=trial_results[best_trial][1],
+        trial_values=trial_values,
+        trial_nfevs=[nfev for _, _, nfev in trial_results],
+        best_trial=best_trial,
+    )
+
+
+_SPARSE_CONSTRAINTS_METHOD = "trust-constr"
+# Largest size of sparse problems for which a dense identity constraint matrix
+# (8 * size^2 bytes, 32 MB for this size) is built for optimizers which support
+# neither bounds nor sparse constraints.
+_MAX_DENSE_CONSTRAINTS_SIZE = 2000
+
+
+def _set_box_constraints(
+    optimizer: Optimizer, matrix: Union[np.ndarray, sparse.spmatrix]
+) -> None:
+    """Restricts the domain of the optimizer to the box [0, 1]^size."""
+    size = matrix.shape[0]
     lower_bound = np.zeros(size)
     upper_bound = np.ones(size)
-    linear_constraint = LinearConstraint(A, lower_bound, upper_bound)
+    if hasattr(optimizer, "bounds"):
+        optimizer.bounds = Bounds(lower_bound, upper_bound)
+        optimizer.constraints = ()
+        return
 
-    optimizer.constraints = linear_constraint
+    if not sparse.issparse(matrix):
+        A = np.eye(size)
+    # Among methods of scipy.optimize.minimize only trust-constr accepts sparse
+    # constraints, others (e.g. COBYLA) fail for them.
+    elif getattr(optimizer, "method", None) == _SPARSE_CONSTRAINTS_METHOD:
+        A = sparse.identity(size, format="csr")
+    elif size <= _MAX_DENSE_CONSTRAINTS_SIZE:
+        A = np.eye(size)
+    else:
+        raise ValueError(
+            f"Optimizer supports neither bounds nor sparse constraints, so it "
+            f"would need a dense {size}x{size} constraint matrix. Use an "
+            f"optimizer with `bounds` attribute or with method "
+            f"{_SPARSE_CONSTRAINTS_METHOD!r}."
+        )
+    optimizer.constraints = LinearConstraint(A, lower_bound, upper_bound)
 
-    def cost_function(x):
-        return x.T @ matrix @ x
 
-    final_value = None
-    final_params = None
+class _QuadraticCostFunction:
+    """Cost function x -> x^T M x of the relaxed problem.
 
-    for _ in range(number_of_trials):
-        initial_params = np.random.uniform(0.0, 1.0, size=size)
-        optimization_results = optimizer.minimize(cost_function, initial_params)
-        if final_value is None or optimization_results.opt_value < final_value:
-            final_value = optimization_results.opt_value
-            final_params = optimization_results.opt_params
-    assert final_value is not None
-    assert final_params is not None
-    # We round the values to avoid having values like 1.0000000002 or -1e-14
-    # in the output
-    return np.around(final_params, decimals=8), final_value
+    Exposes exact gradient (M + M^T) x, so that gradient-based optimizers
+    (e.g. ones checking for `zquantum.core.interfaces.functions.CallableWithGradient`)
+    don't need to fall back to finite differences.
+    """
+
+    def __init__(self, matrix: Union[np.ndarray, sparse.spmatrix]):
+        self.matrix = matrix
+        self._symmetric_sum = matrix + matrix.T
+
+    def __call__(self, x: np.ndarray) -> float:
+        return float(x.T @ self.matrix @ x)
+
+    def gradient(self, x: np.ndarray) -> np.ndarray:
+        return self._symmetric_sum @ x
 
 
-def is_matrix_positive_semidefinite(matrix: np.ndarray) -> bool:
+# State of processes running QP trials, set once per process so that the matrix
+# and the optimizer are not sent again with every trial.
+_qp_trial_state: Dict[str, Any] = {}
+
+
+def _initialize_qp_trial_worker(
+    matrix: Union[np.ndarray, sparse.spmatrix], optimizer: Optimizer
+):
+    _qp_trial_state["cost_function"] = _QuadraticCostFunction(matrix)
+    _qp_trial_state["optimizer"] = optimizer
+
+
+def _run_qp_trial_in_worker(
+    initial_params: np.ndarray,
+) -> Tuple[np.ndarray, float, Optional[int]]:
+    return _run_qp_trial(
+        _qp_trial_state["cost_function"],
+        _qp_trial_state["optimizer"],
+        initial_params,
+    )
+
+
+def _run_qp_trial(
+    cost_function: _QuadraticCostFunction,
+    optimizer: Optimizer,
+    initial_params: np.ndarray,
+) -> Tuple[np.ndarray, float, Optional[int]]:
+    optimization_results = optimizer.minimize(cost_function, initial_params)
+    return (
+        optimization_results.opt_params,
+        optimization_results.opt_value,
+        optimization_results.get("nfev"),
+    )
+
+
+def is_matrix_positive_semidefinite(
+    matrix: Union[np.ndarray, sparse.spmatrix], tolerance: float = 1e-10
+) -> bool:
     """
     Checks whether matrix is positive semi-definite.
 
+    Only the symmetric part of the matrix, (M + M^T) / 2, determines the value of
+    x^T M x, hence it is the symmetric part that is checked. Dense matrices are
+    checked with a Cholesky factorization, sparse ones with a Lanczos estimate of
+    the smallest eigenvalue, or with a sparse symmetric factorization if the
+    estimate doesn't converge. The verdict is cached, so checking the same matrix
+    again doesn't repeat the computation.
+
     Args:
-        matrix: a matrix that should be checked.
+        matrix: a matrix that should be checked, either dense or scipy sparse.
+        tolerance: eigenvalues larger than -tolerance (relative to the largest
+            absolute entry of the matrix, if it is greater than 1) are treated
+            as non-negative.
 
     Returns:
         bool: True if matrix is positive semi-definite, False otherwise.
 
     """
-    eigenvalues, _ = np.linalg.eig(matrix)
-    return np.min(eigenvalues) >= 0
+    key = (_matrix_digest(matrix), tolerance)
+    if key not in _psd_verdicts:
+        _psd_verdicts[key] = _check_positive_semidefinite(matrix, tolerance)
+        while len(_psd_verdicts) > _PSD_VERDICTS_CACHE_SIZE:
+            _psd_verdicts.popitem(last=False)
+    _psd_verdicts.move_to_end(key)
+    return _psd_verdicts[key]
+
+
+_PSD_VERDICTS_CACHE_SIZE = 32
+_psd_verdicts: "OrderedDict[Tuple[str, float], bool]" = OrderedDict()
+
+# Below this size sparse matrices are checked as dense ones.
+_MIN_SPARSE_PSD_CHECK_SIZE = 100
+
+
+def _check_positive_semidefinite(
+    matrix: Union[np.ndarray, sparse.spmatrix], tolerance: float
+) -> bool:
+    symmetric_part = (matrix + matrix.T) / 2
+    if sparse.issparse(symmetric_part):
+        if symmetric_part.shape[0] >= _MIN_SPARSE_PSD_CHECK_SIZE:
+            symmetric_part = symmetric_part.astype(float)
+            scale = max(1.0, abs(symmetric_part).max())
+            try:
+                smallest_eigenvalue = eigsh(
+                    symmetric_part,
+                    k=1,
+                    which="SA",
+                    return_eigenvectors=False,
+                )[0]
+            except ArpackNoConvergence:
+                return _is_sparse_matrix_positive_definite(
+                    symmetric_part
+                    + tolerance * scale * sparse.identity(symmetric_part.shape[0])
+                )
+            return smallest_eigenvalue >= -tolerance * scale
+        symmetric_part = symmetric_part.toarray()
+
+    size = symmetric_part.shape[0]
+    if size == 0:
+        return True
+    scale = max(1.0, np.abs(symmetric_part).max())
+    # Cholesky factorization exists iff the matrix is positive definite, and
+    # shifting the spectrum by the tolerance makes PSD matrices positive definite.
+    try:
+        np.linalg.cholesky(symmetric_part + tolerance * scale * np.eye(size))
+    except np.linalg.LinAlgError:
+        return False
+    return True
+
+
+def _is_sparse_matrix_positive_definite(matrix: sparse.spmatrix) -> bool:
+    """Checks whether sparse symmetric matrix is positive definite.
+
+    The matrix is factorized as P^T M P = L D L^T, with a fill-reducing symmetric
+    permutation P and pivots taken from the diagonal. By Sylvester's law of
+    inertia the matrix is positive definite iff all the pivots are positive. A
+    zero pivot, which forces the factorization to pivot off the diagonal, or
+    a singular matrix also means the matrix isn't positive definite.
+    """
+    try:
+        factorization = splu(
+            sparse.csc_matrix(matrix),
+            permc_spec="MMD_AT_PLUS_A",
+            diag_pivot_thresh=0,
+            options={"SymmetricMode": True},
+        )
+    except RuntimeError:
+        return False
+    return bool(
+        np.array_equal(factorization.perm_r, factorization.perm_c)
+        and np.all(factorization.U.diagonal() > 0)
+    )
+
+
+def _matrix_digest(matrix: Union[np.ndarray, sparse.spmatrix]) -> str:
+    digest = hashlib.blake2b()
+    if sparse.issparse(matrix):
+        matrix = matrix.tocsr()
+        arrays = [matrix.data, matrix.indices, matrix.indptr]
+    else:
+        arrays = [np.asarray(matrix)]
+    digest.update(repr(matrix.shape).encode())
+    for array in arrays:
+        digest.update(array.dtype.str.encode())
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
 
 
 # Temporary solution until constraints added to optimizer.py in z-quantum-core
@@ -0,0 +1,166 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+from typing import Hashable, List
+
+import dimod
+import numpy as np
+from scipy import sparse
+
+from .compiled_qubo import _BATCH_CHUNK_ENTRIES, CompiledQubo, compile_qubo
+from .interfaces.bqm_solver import BQMSolver
+
+
+def connected_components(bqm: dimod.BinaryQuadraticModel) -> List[List[Hashable]]:
+    """Splits variables of a model into groups not interacting with each other.
+
+    Args:
+        bqm: model whose variables should be split.
+
+    Returns:
+        List of connected components of the interaction graph of the model, each
+        being a list of variables. Components are ordered by their first variable
+        and variables in every component are in the same order as in the model.
+    """
+    compiled = compile_qubo(bqm)
+    return [
+        [compiled.variables[i] for i in component]
+        for component in _component_indices(compiled)
+    ]
+
+
+def solve_by_components(
+    bqm: dimod.BinaryQuadraticModel,
+    solver: BQMSolver,
+    number_of_workers: int = 1,
+    max_enumerated_size: int = 8,
+    **parameters,
+) -> dimod.SampleSet:
+    """Solves a model by solving each of its connected components separately.
+
+    As variables from different components don't interact, a combination of
+    optimal states of all the components is an optimal state of the model, while
+    each component is exponentially easier to solve than the whole model.
+
+    Args:
+        bqm: model to be solved.
+        solver: solver used for components with more than `max_enumerated_size`
+            variables.
+        number_of_workers: number of processes the components are distributed
+            over, see `BQMSolver.solve_many`.
+        max_enumerated_size: components with at most that many variables are
+            solved exactly by evaluating all their states, all components of the
+            same size at once.
+        parameters: keyword arguments passed to the `sample` method of the solver.
+
+    Returns:
+        SampleSet with a single sample, combining the lowest energy samples of all
+        the components. Its info holds the number of components.
+    """
+    compiled = compile_qubo(bqm)
+    components = _component_indices(compiled)
+    state = np.empty(compiled.num_variables, dtype=np.int8)
+
+    small_components = [c for c in components if len(c) <= max_enumerated_size]
+    for size in sorted({len(c) for c in small_components}):
+        indices = np.array([c for c in small_components if len(c) == size])
+        state[indices] = _enumerate_components(compiled, indices)
+
+    large_components = [c for c in components if len(c) > max_enumerated_size]
+    sub_bqms = (_induced_bqm(compiled, component) for component in large_components)
+    for index, sampleset in solver.solve_many(
+        sub_bqms, number_of_workers=number_of_workers, **parameters
+    ):
+        best = sampleset.record[np.argmin(sampleset.record.energy)].sample
+        columns = [sampleset.variables.index(v) for v in range(len(best))]
+        state[large_components[index]] = best[columns]
+
+    return dimod.SampleSet.from_samples(
+        ([state], list(compiled.variables)),
+        bqm.vartype,
+        compiled.energies(state[None]),
+        info={"num_components": len(components)},
+    )
+
+
+def _component_indices(compiled: CompiledQubo) -> List[np.ndarray]:
+    """Connected components of the interaction graph, found with union-find."""
+    parents = list(range(compiled.num_variables))
+
+    def find(i):
+        while parents[i] != i:
+            # Path halving keeps the trees shallow.
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    rows = np.repeat(np.arange(compiled.num_variables), np.diff(compiled.indptr))
+    for i, j in zip(rows.tolist(), compiled.indices.tolist()):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parents[max(root_i, root_j)] = min(root_i, root_j)
+
+    roots = np.array([find(i) for i in range(compiled.num_variables)], dtype=np.int64)
+    order = np.argsort(roots, kind="stable")
+    boundaries = np.flatnonzero(np.diff(roots[order])) + 1
+    return np.split(order, boundaries) if compiled.num_variables else []
+
+
+def _enumerate_components(compiled: CompiledQubo, indices: np.ndarray) -> np.ndarray:
+    """Finds ground states of components of the same size by enumeration.
+
+    Args:
+        compiled: model the components come from.
+        indices: array with one row of variable indices per component.
+
+    Returns:
+        Array of the same shape as `indices` with values of the variables in the
+        ground state of every component.
+    """
+    num_components, size = indices.shape
+    bits = (np.arange(2 ** size)[:, None] >> np.arange(size)) & 1
+    states = 2 * bits - 1 if compiled.vartype is dimod.SPIN else bits
+
+    # Position of every variable of the components within its component.
+    component_of = np.full(compiled.num_variables, -1, dtype=np.int64)
+    component_of[indices] = np.arange(num_components)[:, None]
+    position_of = np.zeros(compiled.num_variables, dtype=np.int64)
+    position_of[indices] = np.arange(size)
+    rows = np.repeat(np.arange(compiled.num_variables), np.diff(compiled.indptr))
+    in_components = component_of[rows] >= 0
+    couplings = np.zeros((num_components, size, size))
+    np.add.at(
+        couplings,
+        (
+            component_of[rows[in_components]],
+            position_of[rows[in_components]],
+            position_of[compiled.indices[in_components]],
+        ),
+        compiled.data[in_components],
+    )
+
+    ground_states = np.empty(indices.shape, dtype=np.int8)
+    chunk_size = max(1, _BATCH_CHUNK_ENTRIES // len(states))
+    for start in range(0, num_components, chunk_size):
+        chunk = slice(start, start + chunk_size)
+        energies = compiled.linear[indices[chunk]] @ states.T + np.einsum(
+            "ti,cij,tj->ct", states, couplings[chunk], states
+        )
+        ground_states[chunk] = states[np.argmin(energies, axis=1)]
+    return ground_states
+
+
+def _induced_bqm(
+    compiled: CompiledQubo, indices: np.ndarray
+) -> dimod.BinaryQuadraticModel:
+    """Model restricted to given variables, relabelled with consecutive integers.
+
+    Offset of the model is skipped, as it is shared by all components.
+    """
+    interactions = sparse.triu(compiled.adjacency[indices][:, indices], k=1).tocoo()
+    return dimod.BinaryQuadraticModel.from_numpy_vectors(
+        compiled.linear[indices],
+        (interactions.row, interactions.col, interactions.data),
+        0.0,
+        compiled.vartype,
+    )
@@ -1,6 +1,19 @@
 ################################################################################
-# © Copyright 2021 Zapata Computing Inc.
+# © Copyright 2021-2022 Zapata Computing Inc.
 ################################################################################
+import asyncio
+import functools
+import itertools
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
 import dimod
 
 
@@ -27,3 +40,152 @@ class BQMSolver(dimod.Sampler):
 
         """
         return self.sample(bqm)
+
+    def solve_many(
+        self,
+        bqms: Iterable[dimod.BQM],
+        number_of_workers: int = 1,
+        chunk_size: int = 1,
+        max_pending_chunks: Optional[int] = None,
+        **parameters,
+    ) -> Iterator[Tuple[int, dimod.SampleSet]]:
+        """
+        Solves many problems, yielding results as soon as they are available.
+
+        Problems are taken from `bqms` lazily and at most `max_pending_chunks`
+        chunks of problems are being solved or waiting for a worker at any time,
+        so neither all the problems nor all the results need to be kept in memory.
+
+        Note:
+            Every worker process receives its own copy of the solver once, and
+            uses it for all the problems it solves, so any state kept by the
+            solver (e.g. compiled models or loaded resources) is reused.
+
+        Args:
+            bqms: problems to be solved.
+            number_of_workers: number of processes the problems are distributed
+                over. If 1, problems are solved in the current process, in order.
+                Otherwise, the solver and the problems have to be picklable.
+            chunk_size: number of problems sent to a worker at once.
+            max_pending_chunks: maximal number of chunks submitted to workers at
+                any time. Defaults to twice the number of workers.
+            parameters: keyword arguments passed to `sample`.
+
+        Yields:
+            Pairs of position of the problem in `bqms` and its solution. If more
+            than one worker is used, results are yielded in order of completion.
+        """
+        if number_of_workers == 1:
+            for index, bqm in enumerate(bqms):
+                yield index, self.sample(bqm, **parameters)
+            return
+
+        if max_pending_chunks is None:
+            max_pending_chunks = 2 * number_of_workers
+        chunks = _chunks(enumerate(bqms), chunk_size)
+        with ProcessPoolExecutor(
+            number_of_workers,
+            initializer=_initialize_worker,
+            initargs=(self, parameters),
+        ) as executor:
+            pending: Set[Future] = set()
+            try:
+                for chunk in itertools.islice(chunks, max_pending_chunks):
+                    pending.add(executor.submit(_solve_chunk_in_worker, chunk))
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for chunk in itertools.islice(chunks, len(done)):
+                        pending.add(executor.submit(_solve_chunk_in_worker, chunk))
+                    for future in done:
+                        yield from future.result()
+            finally:
+                # Don't wait for chunks that weren't started if the consumer stopped
+                # early or solving one of the problems failed.
+                for future in pending:
+                    future.cancel()
+
+    async def solve_async(
+        self, bqm: dimod.BQM, executor: Optional[Executor] = None, **parameters
+    ) -> dimod.SampleSet:
+        """
+        Solves the problem without blocking the event loop.
+
+        The default implementation runs `sample` in an executor, which suits
+        solvers waiting for out-of-process or remote services. Solvers able to
+        wait for results natively (e.g. using an asynchronous client) can
+        override it with a coroutine that doesn't occupy a thread.
+
+        Args:
+            bqm: problem to be solved.
+            executor: executor in which `sample` is run. Defaults to the default
+                executor of the running event loop.
+            parameters: keyword arguments passed to `sample`.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, functools.partial(self.sample, bqm, **parameters)
+        )
+
+
+async def solve_concurrently(
+    solver: BQMSolver,
+    bqms: Iterable[dimod.BQM],
+    max_concurrency: int = 16,
+    executor: Optional[Executor] = None,
+    **parameters,
+) -> List[dimod.SampleSet]:
+    """
+    Solves many problems with `solver.solve_async`, keeping at most
+    `max_concurrency` solves in flight.
+
+    Args:
+        solver: solver used for all the problems.
+        bqms: problems to be solved.
+        max_concurrency: maximal number of problems being solved at once.
+        executor: executor passed to `solve_async`. If not provided, a thread
+            pool with `max_concurrency` threads is used for the duration of
+            the call.
+        parameters: keyword arguments passed to `sample`.
+
+    Returns:
+        Solutions of the problems, in the same order as the problems.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def solve(bqm, executor):
+        async with semaphore:
+            return await solver.solve_async(bqm, executor=executor, **parameters)
+
+    if executor is not None:
+        return list(await asyncio.gather(*(solve(bqm, executor) for bqm in bqms)))
+    with ThreadPoolExecutor(max_concurrency) as own_executor:
+        return list(await asyncio.gather(*(solve(bqm, own_executor) for bqm in bqms)))
+
+
+def _chunks(iterable: Iterable, chunk_size: int) -> Iterator[List]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+_worker_solver: Optional[BQMSolver] = None
+_worker_parameters: Dict[str, Any] = {}
+
+
+def _initialize_worker(solver: BQMSolver, parameters: Dict[str, Any]) -> None:
+    global _worker_solver, _worker_parameters
+    _worker_solver = solver
+    _worker_parameters = parameters
+
+
+def _solve_chunk_in_worker(
+    chunk: List[Tuple[int, dimod.BQM]]
+) -> List[Tuple[int, dimod.SampleSet]]:
+    assert _worker_solver is not None
+    return [
+        (index, _worker_solver.sample(bqm, **_worker_parameters))
+        for index, bqm in chunk
+    ]
@@ -1,8 +1,62 @@
 ################################################################################
-# © Copyright 2021 Zapata Computing Inc.
+# © Copyright 2021-2022 Zapata Computing Inc.
 ################################################################################
 import dimod
+import numpy as np
+import pytest
 
 
-class BQMSolverTests(dimod.Sampler):
-    pass
+class BQMSolverTests:
+    """Base class for tests of BQMSolver implementations.
+
+    Test classes inheriting from it need to provide `solver` fixture returning
+    the tested solver and can override `solver_params` fixture with keyword
+    arguments passed to `sample` (e.g. to make runs short and reproducible).
+    The tested problems are small enough for any reasonable solver to find their
+    ground states.
+    """
+
+    @pytest.fixture
+    def solver_params(self):
+        return {}
+
+    @pytest.fixture(params=["BINARY", "SPIN"])
+    def bqm(self, request):
+        return dimod.generators.uniform(6, request.param, low=-1, high=1, seed=7)
+
+    def test_solve_returns_sampleset_with_vartype_and_variables_of_bqm(
+        self, solver, solver_params, bqm
+    ):
+        sampleset = solver.sample(bqm, **solver_params)
+
+        assert isinstance(sampleset, dimod.SampleSet)
+        assert sampleset.vartype is bqm.vartype
+        assert set(sampleset.variables) == set(bqm.variables)
+
+    def test_energies_in_sampleset_match_samples(self, solver, solver_params, bqm):
+        sampleset = solver.sample(bqm, **solver_params)
+
+        np.testing.assert_allclose(sampleset.record.energy, bqm.energies(sampleset))
+
+    def test_finds_ground_state(self, solver, solver_params, bqm):
+        sampleset = solver.sample(bqm, **solver_params)
+        ground_state_energy = dimod.ExactSolver().sample(bqm).first.energy
+
+        assert sampleset.first.energy == pytest.approx(ground_state_energy)
+
+    def test_works_with_non_integer_labels(self, solver, solver_params):
+        bqm = dimod.BinaryQuadraticModel(
+            {"a": 1, "b": -1, "c": 0.5},
+            {("a", "b"): -2, ("b", "c"): 1.5},
+            0.25,
+            "BINARY",
+        )
+        sampleset = solver.sample(bqm, **solver_params)
+
+        assert sampleset.first.sample == {"a": 1, "b": 1, "c": 0}
+        assert sampleset.first.energy == pytest.approx(-1.75)
+
+    def test_solve_gives_same_result_as_sample(self, solver, solver_params, bqm):
+        assert solver.solve(bqm).first.energy == pytest.approx(
+            solver.sample(bqm, **solver_params).first.energy
+        )
@@ -1,17 +1,23 @@
 ################################################################################
 # © Copyright 2020-2022 Zapata Computing Inc.
 ################################################################################
+import codecs
 import json
-from io import TextIOBase
+from contextlib import contextmanager
+from io import BufferedIOBase, BufferedReader, RawIOBase, TextIOBase
 from os import PathLike
-from typing import IO, Any, Dict, Union
+from typing import IO, Any, Dict, Iterator, Optional, Tuple, Union
 
 import dimod
+import numpy as np
+from dimod.serialization.utils import deserialize_ndarrays, serialize_ndarrays
 from sympy import inverse_sine_transform
 from zquantum.core.serialization import ensure_open
 from zquantum.core.typing import DumpTarget, LoadSource, Readable
 from zquantum.core.utils import SCHEMA_VERSION
 
+from .summary import SampleSetSummary
+
 
 def bqm_to_serializable(bqm: dimod.BinaryQuadraticModel) -> Dict[str, Any]:
     """Convert binary quadratic model to a serializable dictionary.
@@ -33,6 +39,9 @@ def bqm_to_serializable(bqm: dimod.BinaryQuadraticModel) -> Dict[str, Any]:
         A list of tuples was chosen instead of dictionary because dictionary
         keyed with tuples is not JSON-serializable.
     """
+    if _are_consecutive_integers(bqm.variables):
+        return _bqm_to_serializable_with_integer_labels(bqm)
+
     return {
         "linear": [(label, coef) for label, coef in bqm.linear.items()],
         "quadratic": [
@@ -55,14 +64,14 @@ def bqm_from_serializable(serializable: Dict[str, Any]) -> dimod.BinaryQuadratic
     Returns:
         Binary quadratic model converted from the input dictionary.
     """
-
-    def ensure_hashable(i):
-        return tuple(i) if isinstance(i, list) else i
+    bqm = _bqm_from_serializable_with_integer_labels(serializable)
+    if bqm is not None:
+        return bqm
 
     return dimod.BinaryQuadraticModel(
-        {ensure_hashable(i): coef for i, coef in serializable["linear"]},
+        {_ensure_hashable(i): coef for i, coef in serializable["linear"]},
         {
-            (ensure_hashable(i), ensure_hashable(j)): coef
+            (_ensure_hashable(i), _ensure_hashable(j)): coef
             for i, j, coef in serializable["quadratic"]
         },
         serializable["offset"],
@@ -70,16 +79,131 @@ def bqm_from_serializable(serializable: Dict[str, Any]) -> dimod.BinaryQuadratic
     )
 
 
-def load_qubo(input_file: LoadSource):
+def _are_consecutive_integers(labels) -> bool:
+    """Checks whether labels are integers 0, 1, ..., n - 1, in any order."""
+    num_labels = len(labels)
+    return (
+        all(type(label) is int and 0 <= label < num_labels for label in labels)
+        and len(set(labels)) == num_labels
+    )
+
 
-    with ensure_open(input_file, "r") as f:
-        qubo_dict = json.load(f)
+def _bqm_to_serializable_with_integer_labels(
+    bqm: dimod.BinaryQuadraticModel,
+) -> Dict[str, Any]:
+    """Fast path of `bqm_to_serializable` using vector representation of the BQM."""
+    num_variables = bqm.num_variables
+    linear, (rows, cols, biases), _ = bqm.to_numpy_vectors(range(num_variables))
+    labels = np.fromiter(bqm.variables, dtype=np.int64, count=num_variables)
+    return {
+        "linear": list(zip(labels.tolist(), linear[labels].tolist())),
+        "quadratic": list(
+            zip(
+                np.minimum(rows, cols).tolist(),
+                np.maximum(rows, cols).tolist(),
+                biases.tolist(),
+            )
+        ),
+        "offset": bqm.offset,
+        "vartype": bqm.vartype.name,
+    }
+
+
+def _bqm_from_serializable_with_integer_labels(
+    serializable: Dict[str, Any]
+) -> Optional[dimod.BinaryQuadraticModel]:
+    """Fast path of `bqm_from_serializable` using vector representation of the BQM.
+
+    Returns None if variables in the dictionary are not integers 0, 1, ..., n - 1,
+    in which case the generic path has to be used.
+    """
+    try:
+        linear = np.asarray(serializable["linear"])
+        quadratic = (
+            np.asarray(serializable["quadratic"])
+            if len(serializable["quadratic"])
+            else np.empty((0, 3))
+        )
+    except ValueError:
+        return None
+    if not (
+        linear.ndim == 2
+        and linear.shape[1] == 2
+        and linear.dtype.kind in "iuf"
+        and quadratic.ndim == 2
+        and quadratic.shape[1] == 3
+        and quadratic.dtype.kind in "iuf"
+    ):
+        return None
+
+    num_variables = len(linear)
+    labels = linear[:, 0].astype(np.int64)
+    quadratic_labels = quadratic[:, :2].astype(np.int64)
+    if (
+        np.any(labels != linear[:, 0])
+        or np.any(quadratic_labels != quadratic[:, :2])
+        or not _are_consecutive_integers(labels.tolist())
+        or np.any((quadratic_labels < 0) | (quadratic_labels >= num_variables))
+    ):
+        return None
+
+    positions = np.empty(num_variables, dtype=np.int64)
+    positions[labels] = np.arange(num_variables)
+    return dimod.BinaryQuadraticModel.from_numpy_vectors(
+        linear[:, 1].astype(float),
+        (
+            positions[quadratic_labels[:, 0]],
+            positions[quadratic_labels[:, 1]],
+            quadratic[:, 2].astype(float),
+        ),
+        serializable["offset"],
+        serializable["vartype"],
+        variable_order=labels.tolist(),
+    )
+
+
+def load_qubo(input_file: LoadSource, streaming: bool = False):
+    """Load QUBO saved by `save_qubo`.
+
+    Both JSON and binary formats are supported, the format is detected
+    automatically. Arrays stored in binary files are memory-mapped when loading
+    from a path, so that they are not read into memory before being copied into
+    the model.
+
+    Args:
+        input_file: path or file-like object to read from.
+        streaming: whether JSON files should be parsed incrementally. This keeps
+            peak memory usage close to the size of the loaded model, at the cost
+            of slower parsing, and is intended for very large files.
+    """
+    with _detecting_format(input_file) as (source, binary):
+        if binary:
+            return _load_qubo_binary(source)
+
+        with ensure_open(source, "r") as f:
+            if streaming:
+                return _load_qubo_json_streaming(f)
+            qubo_dict = json.load(f)
 
     del qubo_dict["schema"]
     return bqm_from_serializable(qubo_dict)
 
 
-def save_qubo(qubo, output_file: DumpTarget):
+def save_qubo(qubo, output_file: DumpTarget, binary: Optional[bool] = None):
+    """Save QUBO to a file.
+
+    Args:
+        qubo: model to be saved.
+        output_file: path or file-like object to write to.
+        binary: whether to use the binary format instead of JSON. If not given,
+            binary format is used only for paths with ".bin" extension.
+    """
+    if binary is None:
+        binary = _has_binary_suffix(output_file)
+    if binary:
+        _save_qubo_binary(qubo, output_file)
+        return
+
     qubo_dict = bqm_to_serializable(qubo)
     qubo_dict["schema"] = SCHEMA_VERSION + "-qubo"
 
@@ -87,7 +211,219 @@ def save_qubo(qubo, output_file: DumpTarget):
         json.dump(qubo_dict, f)
 
 
-def save_sampleset(sampleset, output_file: DumpTarget):
+def _save_qubo_binary(qubo: dimod.BinaryQuadraticModel, output_file: DumpTarget):
+    linear, (rows, cols, biases), offset, labels = qubo.to_numpy_vectors(
+        return_labels=True
+    )
+    header = {
+        "schema": SCHEMA_VERSION + "-qubo",
+        "vartype": qubo.vartype.name,
+        "offset": float(offset),
+        "labels": _serializable_labels(labels),
+    }
+    _write_binary(
+        output_file,
+        header,
+        {"linear": linear, "rows": rows, "cols": cols, "quadratic": biases},
+    )
+
+
+def _load_qubo_binary(input_file: LoadSource) -> dimod.BinaryQuadraticModel:
+    header, arrays = _read_binary(input_file)
+    _check_schema(header, "-qubo")
+    labels = header["labels"]
+    return dimod.BinaryQuadraticModel.from_numpy_vectors(
+        arrays["linear"],
+        (arrays["rows"], arrays["cols"], arrays["quadratic"]),
+        header["offset"],
+        header["vartype"],
+        variable_order=(
+            range(len(arrays["linear"]))
+            if labels is None
+            else [_ensure_hashable(label) for label in labels]
+        ),
+    )
+
+
+def _load_qubo_json_streaming(f: IO) -> dimod.BinaryQuadraticModel:
+    """Load QUBO from JSON file without loading the whole document into memory.
+
+    Coefficients are read one by one and stored in compact arrays, from which
+    the model is built once the vartype (stored after the coefficients) is known.
+    """
+    reader = _JSONStreamReader(f)
+    variable_indices: Dict[Any, int] = {}
+    linear = _ArrayBuilder({"variable": np.int64, "bias": float})
+    quadratic = _ArrayBuilder({"row": np.int64, "col": np.int64, "bias": float})
+    other_fields = {}
+
+    def index_of(label):
+        return variable_indices.setdefault(
+            _ensure_hashable(label), len(variable_indices)
+        )
+
+    for key in reader.iter_object_keys():
+        if key == "linear":
+            for label, bias in reader.iter_array():
+                linear.append(index_of(label), bias)
+        elif key == "quadratic":
+            for label_1, label_2, bias in reader.iter_array():
+                quadratic.append(index_of(label_1), index_of(label_2), bias)
+        else:
+            other_fields[key] = reader.read_value()
+
+    linear_arrays = linear.build()
+    linear_biases = np.zeros(len(variable_indices))
+    linear_biases[linear_arrays["variable"]] = linear_arrays["bias"]
+    del linear_arrays
+    quadratic_arrays = quadratic.build()
+
+    return dimod.BinaryQuadraticModel.from_numpy_vectors(
+        linear_biases,
+        (quadratic_arrays["row"], quadratic_arrays["col"], quadratic_arrays["bias"]),
+        other_fields["offset"],
+        other_fields["vartype"],
+        variable_order=list(variable_indices),
+    )
+
+
+class _ArrayBuilder:
+    """Accumulates rows of values into compact numpy arrays, chunk by chunk."""
+
+    def __init__(self, dtypes: Dict[str, Any], chunk_size: int = 2 ** 16):
+        self._dtypes = dtypes
+        self._chunk_size = chunk_size
+        self._pending: Dict[str, list] = {name: [] for name in dtypes}
+        self._chunks: Dict[str, list] = {name: [] for name in dtypes}
+        self._num_pending = 0
+
+    def append(self, *values):
+        for pending, value in zip(self._pending.values(), values):
+            pending.append(value)
+        self._num_pending += 1
+        if self._num_pending >= self._chunk_size:
+            self._flush()
+
+    def _flush(self):
+        for name, dtype in self._dtypes.items():
+            self._chunks[name].append(np.array(self._pending[name], dtype=dtype))
+            self._pending[name] = []
+        self._num_pending = 0
+
+    def build(self) -> Dict[str, np.ndarray]:
+        self._flush()
+        arrays = {}
+        for name in self._dtypes:
+            arrays[name] = np.concatenate(self._chunks[name])
+            self._chunks[name] = []
+        return arrays
+
+
+class _JSONStreamReader:
+    """Minimal incremental reader of JSON documents.
+
+    Only the structure of the top-level object and arrays being its values is
+    parsed incrementally, all other values are decoded with the standard json
+    module.
+    """
+
+    def __init__(self, f: IO, chunk_size: int = 2 ** 16):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Reads next chunk of the file, returns False if there is nothing left."""
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if isinstance(chunk, bytes):
+            chunk = self._utf8_decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._position :] + chunk
+        self._position = 0
+        return True
+
+    def _peek(self) -> str:
+        """Returns next non-whitespace character without consuming it."""
+        while True:
+            while self._position < len(self._buffer):
+                if not self._buffer[self._position].isspace():
+                    return self._buffer[self._position]
+                self._position += 1
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document.")
+
+    def _expect(self, character: str):
+        if self._peek() != character:
+            raise ValueError(
+                f"Expected {character!r} at position {self._position} of JSON "
+                f"chunk, got {self._buffer[self._position]!r}."
+            )
+        self._position += 1
+
+    def read_value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # Value touching the end of the buffer might be truncated (e.g. a number)
+            if end < len(self._buffer) or not self._fill():
+                break
+        self._position = end
+        return value
+
+    def _iter_items(self, opening: str, closing: str):
+        self._expect(opening)
+        if self._peek() == closing:
+            self._position += 1
+            return
+        while True:
+            yield
+            if self._peek() == closing:
+                self._position += 1
+                return
+            self._expect(",")
+
+    def iter_object_keys(self):
+        """Yields keys of an object, value of each should be read before next key."""
+        for _ in self._iter_items("{", "}"):
+            key = self.read_value()
+            self._expect(":")
+            yield key
+
+    def iter_array(self):
+        """Yields consecutive elements of an array."""
+        for _ in self._iter_items("[", "]"):
+            yield self.read_value()
+
+
+def save_sampleset(sampleset, output_file: DumpTarget, binary: Optional[bool] = None):
+    """Save sampleset to a file.
+
+    Args:
+        sampleset: sampleset to be saved.
+        output_file: path or file-like object to write to.
+        binary: whether to use the binary format, in which samples are packed
+            into bits, instead of JSON. If not given, binary format is used only
+            for paths with ".bin" extension.
+    """
+    if binary is None:
+        binary = _has_binary_suffix(output_file)
+    if binary:
+        _save_sampleset_binary(sampleset, output_file)
+        return
+
     sampleset_dict = sampleset.to_serializable()
     sampleset_dict["schema"] = SCHEMA_VERSION + "-sample-set"
 
@@ -96,9 +432,260 @@ def save_sampleset(sampleset, output_file: DumpTarget):
 
 
 def load_sampleset(input_file: LoadSource):
+    """Load sampleset saved by `save_sampleset`.
 
-    with ensure_open(input_file, "r") as f:
-        sampleset_dict = json.load(f)
+    Both JSON and binary formats are supported, the format is detected
+    automatically.
+    """
+    with _detecting_format(input_file) as (source, binary):
+        if binary:
+            return _load_sampleset_binary(source)
+
+        with ensure_open(source, "r") as f:
+            sampleset_dict = json.load(f)
 
     del sampleset_dict["schema"]
     return dimod.SampleSet.from_serializable(sampleset_dict)
+
+
+def save_sampleset_summary(summary: SampleSetSummary, output_file: DumpTarget):
+    """Save summary of a sampleset returned by `summarize_sampleset` to a file.
+
+    Args:
+        summary: summary to be saved.
+        output_file: path or file-like object to write to.
+    """
+    summary_dict = {
+        "schema": SCHEMA_VERSION + "-sample-set-summary",
+        "lowest": summary.lowest.to_serializable(),
+        "energy_statistics": summary.energy_statistics,
+    }
+
+    with ensure_open(output_file, "w") as f:
+        json.dump(summary_dict, f)
+
+
+def load_sampleset_summary(input_file: LoadSource) -> SampleSetSummary:
+    """Load summary of a sampleset saved by `save_sampleset_summary`."""
+    with ensure_open(input_file, "r") as f:
+        summary_dict = json.load(f)
+
+    _check_schema(summary_dict, "-sample-set-summary")
+    return SampleSetSummary(
+        dimod.SampleSet.from_serializable(summary_dict["lowest"]),
+        summary_dict["energy_statistics"],
+    )
+
+
+def _save_sampleset_binary(sampleset: dimod.SampleSet, output_file: DumpTarget):
+    samples = sampleset.record.sample
+    bits = (samples + 1) // 2 if sampleset.vartype == dimod.SPIN else samples
+    if bits.size and (bits.min() < 0 or bits.max() > 1):
+        raise ValueError(
+            f"Sampleset with vartype {sampleset.vartype.name} contains invalid values."
+        )
+
+    labels = list(sampleset.variables)
+    header = {
+        "schema": SCHEMA_VERSION + "-sample-set",
+        "vartype": sampleset.vartype.name,
+        "labels": _serializable_labels(labels),
+        "num_variables": len(labels),
+        # Serialized like in SampleSet.to_serializable.
+        "info": serialize_ndarrays(sampleset.info),
+    }
+    arrays = {
+        "samples": np.packbits(bits.astype(np.uint8), axis=1, bitorder="little"),
+        "energy": sampleset.record.energy.astype(float),
+        "num_occurrences": sampleset.record.num_occurrences.astype(np.int64),
+    }
+    for name in sampleset.record.dtype.names:
+        if name != "sample" and name not in arrays:
+            arrays[name] = sampleset.record[name]
+    _write_binary(output_file, header, arrays)
+
+
+def _load_sampleset_binary(input_file: LoadSource) -> dimod.SampleSet:
+    header, arrays = _read_binary(input_file)
+    _check_schema(header, "-sample-set")
+    num_variables = header["num_variables"]
+    labels = header["labels"]
+
+    samples = np.unpackbits(
+        arrays.pop("samples"), axis=1, count=num_variables, bitorder="little"
+    ).astype(np.int8)
+    if header["vartype"] == dimod.SPIN.name:
+        samples = 2 * samples - 1
+
+    return dimod.SampleSet.from_samples(
+        (
+            samples,
+            range(num_variables)
+            if labels is None
+            else [_ensure_hashable(label) for label in labels],
+        ),
+        header["vartype"],
+        info=deserialize_ndarrays(header["info"]),
+        sort_labels=False,
+        **{name: np.array(array) for name, array in arrays.items()},
+    )
+
+
+# Binary files consist of:
+# - magic string identifying the format,
+# - length of the header as little-endian 8-byte unsigned integer,
+# - JSON header padded with spaces, so that the data starts at an aligned offset,
+# - raw little-endian arrays, each starting at an aligned offset.
+# Besides format-specific metadata, the header contains the schema and the
+# description (dtype, shape and offset relative to start of the data) of every
+# array, under the "arrays" key.
+_BINARY_MAGIC = b"\x93ZQUANTUM"
+_BINARY_ALIGNMENT = 64
+_BINARY_SUFFIX = ".bin"
+
+
+def _ensure_hashable(label):
+    return (
+        tuple(_ensure_hashable(i) for i in label) if isinstance(label, list) else label
+    )
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _BINARY_ALIGNMENT) * _BINARY_ALIGNMENT
+
+
+def _has_binary_suffix(target: Union[LoadSource, DumpTarget]) -> bool:
+    return isinstance(target, (str, PathLike)) and str(target).endswith(_BINARY_SUFFIX)
+
+
+@contextmanager
+def _detecting_format(
+    input_file: LoadSource,
+) -> Iterator[Tuple[LoadSource, bool]]:
+    """Yields the source to load from and whether it is in the binary format.
+
+    Non-seekable binary streams are peeked at through a buffered reader, which
+    has to be used for loading, as it holds the bytes already read from the
+    stream. The stream is detached from it afterwards, so it is not closed.
+    """
+    magic_length = len(_BINARY_MAGIC)
+    if isinstance(input_file, (str, PathLike)):
+        with open(input_file, "rb") as f:
+            binary = f.read(magic_length) == _BINARY_MAGIC
+        yield input_file, binary
+    elif not isinstance(input_file, (RawIOBase, BufferedIOBase)):
+        yield input_file, False
+    elif input_file.seekable():
+        position = input_file.tell()
+        magic = input_file.read(magic_length)
+        input_file.seek(position)
+        yield input_file, magic == _BINARY_MAGIC
+    elif isinstance(input_file, BufferedReader):
+        yield input_file, input_file.peek(magic_length)[:magic_length] == _BINARY_MAGIC
+    else:
+        reader = BufferedReader(input_file)
+        try:
+            yield reader, reader.peek(magic_length)[:magic_length] == _BINARY_MAGIC
+        finally:
+            reader.detach()
+
+
+def _serializable_labels(labels: list) -> Optional[list]:
+    """Labels stored in the header of binary files, None for 0, 1, ..., n - 1."""
+    if labels == list(range(len(labels))):
+        return None
+    return [_serializable_label(label) for label in labels]
+
+
+def _serializable_label(label):
+    if isinstance(label, np.generic):
+        return label.item()
+    if isinstance(label, tuple):
+        return [_serializable_label(i) for i in label]
+    return label
+
+
+def _check_schema(header: Dict[str, Any], schema_suffix: str):
+    if not header.get("schema", "").endswith(schema_suffix):
+        raise ValueError(
+            f"Expected file with {schema_suffix[1:]} schema, "
+            f"got {header.get('schema')}."
+        )
+
+
+def _write_binary(
+    output_file: DumpTarget, header: Dict[str, Any], arrays: Dict[str, np.ndarray]
+):
+    arrays = {name: np.asarray(array) for name, array in arrays.items()}
+    for name, array in arrays.items():
+        if array.dtype.hasobject:
+            raise TypeError(f"Array {name} can't be stored in binary format.")
+        arrays[name] = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+    data_offset = 0
+    header["arrays"] = {}
+    for name, array in arrays.items():
+        header["arrays"][name] = {
+            "dtype": array.dtype.str,
+            "shape": array.shape,
+            "offset": data_offset,
+        }
+        data_offset = _aligned(data_offset + array.nbytes)
+
+    encoded_header = json.dumps(header).encode()
+    prefix_length = len(_BINARY_MAGIC) + 8
+    encoded_header += b" " * (
+        _aligned(prefix_length + len(encoded_header))
+        - prefix_length
+        - len(encoded_header)
+    )
+
+    with ensure_open(output_file, "wb") as f:
+        f.write(_BINARY_MAGIC)
+        f.write(len(encoded_header).to_bytes(8, "little"))
+        f.write(encoded_header)
+        position = 0
+        for name, array in arrays.items():
+            f.write(b"\0" * (header["arrays"][name]["offset"] - position))
+            f.write(array.data)
+            position = header["arrays"][name]["offset"] + array.nbytes
+
+
+def _read_binary(input_file: LoadSource) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Reads header and arrays from a binary file.
+
+    Arrays are memory-mapped if the file is given by a path, otherwise the whole
+    file is read into memory.
+    """
+    with ensure_open(input_file, "rb") as f:
+        if f.read(len(_BINARY_MAGIC)) != _BINARY_MAGIC:
+            raise ValueError("File is not in the binary format.")
+        header_length = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(header_length))
+        data_start = len(_BINARY_MAGIC) + 8 + header_length
+        if not isinstance(input_file, (str, PathLike)):
+            data = f.read()
+
+    arrays = {}
+    for name, description in header["arrays"].items():
+        dtype = np.dtype(description["dtype"])
+        shape = tuple(description["shape"])
+        if isinstance(input_file, (str, PathLike)):
+            arrays[name] = (
+                np.memmap(
+                    input_file,
+                    dtype=dtype,
+                    mode="r",
+                    offset=data_start + description["offset"],
+                    shape=shape,
+                )
+                if np.prod(shape) > 0
+                else np.empty(shape, dtype=dtype)
+            )
+        else:
+            arrays[name] = np.frombuffer(
+                data,
+                dtype=dtype,
+                count=int(np.prod(shape)),
+                offset=description["offset"],
+            ).reshape(shape)
+    return header, arrays
@@ -0,0 +1,267 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import dimod
+import numpy as np
+
+from .compiled_qubo import _DENSE_COUPLINGS_THRESHOLD, CompiledQubo, compile_qubo
+
+# Number of (sample, variable) entries polished at once. Smaller than
+# _BATCH_CHUNK_ENTRIES, so that the working arrays, which are accessed at random
+# positions, mostly stay in cache.
+_POLISHING_CHUNK_ENTRIES = 2 ** 20
+
+# Flips changing the energy by less than that are not treated as improvements, so
+# that rounding errors of incrementally updated fields can't cause cycles.
+_IMPROVEMENT_TOLERANCE = 1e-12
+
+
+def polish_sampleset(
+    sampleset: dimod.SampleSet,
+    bqm: dimod.BinaryQuadraticModel,
+    max_steps: Optional[int] = None,
+    number_of_workers: int = 1,
+) -> dimod.SampleSet:
+    """Moves every sample to a local minimum with steepest descent.
+
+    In every step, the variable whose flip decreases the energy the most is
+    flipped, until no single flip decreases the energy. All samples are processed
+    at once: energy changes of all the flips are kept in an array with one row per
+    sample, and after each step only the entries affected by the flips are
+    updated. For sparse models, rows are split into blocks with known minima, so
+    finding the best flip doesn't scan all the variables. Samples which reached
+    local minima are left out of further steps. Samples are processed in chunks
+    of bounded size, which can be distributed over processes.
+
+    Args:
+        sampleset: samples to be polished, e.g. converted from measurements. It
+            has to contain all the variables of `bqm`.
+        bqm: model whose energy is minimized.
+        max_steps: maximal number of flips made in every sample. If not provided,
+            descent continues until all samples are local minima.
+        number_of_workers: number of processes the chunks of samples are
+            distributed over. If 1, all chunks are polished in the current
+            process.
+
+    Returns:
+        Aggregated SampleSet with the polished samples, their energies with
+        respect to `bqm` and the total numbers of occurrences of samples they
+        were obtained from.
+    """
+    compiled = compile_qubo(bqm)
+    columns = [sampleset.variables.index(v) for v in compiled.variables]
+    # Equal samples are polished only once.
+    samples, inverse = np.unique(
+        sampleset.record.sample[:, columns], axis=0, return_inverse=True
+    )
+    num_occurrences = np.bincount(
+        inverse.ravel(),
+        weights=sampleset.record.num_occurrences,
+        minlength=len(samples),
+    ).astype(np.int64)
+
+    chunk_size = max(1, _POLISHING_CHUNK_ENTRIES // max(compiled.num_variables, 1))
+    chunks = [
+        samples[start : start + chunk_size]
+        for start in range(0, len(samples), chunk_size)
+    ]
+    if number_of_workers == 1:
+        polished_chunks = [
+            _steepest_descent(compiled, chunk, max_steps) for chunk in chunks
+        ]
+    else:
+        with ProcessPoolExecutor(
+            number_of_workers,
+            initializer=_initialize_worker,
+            initargs=(compiled, max_steps),
+        ) as executor:
+            polished_chunks = list(executor.map(_steepest_descent_in_worker, chunks))
+    polished = np.concatenate(polished_chunks) if polished_chunks else samples
+
+    return dimod.SampleSet.from_samples(
+        (polished, list(compiled.variables)),
+        compiled.vartype,
+        compiled.energies(polished),
+        num_occurrences=num_occurrences,
+    ).aggregate()
+
+
+def _steepest_descent(
+    compiled: CompiledQubo, samples: np.ndarray, max_steps: Optional[int]
+) -> np.ndarray:
+    """Runs steepest descent on samples with values ordered as the variables."""
+    adjacency = compiled.adjacency
+    num_variables = compiled.num_variables
+    dense_adjacency = (
+        adjacency.toarray()
+        if adjacency.nnz > _DENSE_COUPLINGS_THRESHOLD * num_variables ** 2
+        else None
+    )
+    # In the sparse case a flip changes only a few gains, so every row of gains
+    # is split into blocks with known minima, as in `solvers.tabu._GainBlocks`.
+    # Blocks are smaller than sqrt(n), as rescanning blocks touched by flips
+    # costs more than finding the best block.
+    if dense_adjacency is None:
+        block_size = max(1, math.isqrt(num_variables) // 2)
+    else:
+        block_size = max(num_variables, 1)
+    num_blocks = -(-num_variables // block_size)
+    padded_size = num_blocks * block_size
+
+    states = samples.astype(float)
+    fields = compiled.linear + (
+        states @ dense_adjacency
+        if dense_adjacency is not None
+        else (adjacency @ states.T).T
+    )
+    # Changes of values of variables caused by flipping them. A flip negates
+    # them, both for SPIN and BINARY variables. They are small integers, kept
+    # in the narrowest type. Padding entries have zero changes and infinite
+    # gains, so they are never flipped.
+    flip_changes = np.zeros((len(samples), padded_size), dtype=np.int8)
+    flip_changes[:, :num_variables] = (
+        -2 * states if compiled.vartype is dimod.SPIN else 1 - 2 * states
+    )
+    # Energy changes caused by flipping every variable in every sample. Flipping
+    # j changes the energy change of flipping its neighbour i by the product of
+    # the changes of both variables and their coupling.
+    gains = np.full((len(samples), padded_size), np.inf)
+    gains[:, :num_variables] = flip_changes[:, :num_variables] * fields
+    del states, fields
+    minima = gains.reshape(len(samples), num_blocks, block_size).min(axis=2)
+
+    # Rows of the working arrays which may still improve, and positions of all
+    # the rows in `samples`. Finished rows are left out of every step, and are
+    # dropped from the working arrays once they make up a quarter of them, so
+    # the arrays are copied only a few times.
+    rows = np.arange(len(samples))
+    positions = np.arange(len(samples))
+    final_flip_changes = np.empty_like(flip_changes)
+
+    step = 0
+    while num_variables and len(rows) and (max_steps is None or step < max_steps):
+        if len(rows) <= 3 * len(gains) // 4:
+            finished = np.ones(len(gains), dtype=bool)
+            finished[rows] = False
+            final_flip_changes[positions[finished]] = flip_changes[finished]
+            gains, flip_changes, minima = gains[rows], flip_changes[rows], minima[rows]
+            positions = positions[rows]
+            rows = np.arange(len(rows))
+        # Rows are sorted, so all of them are active if there are that many.
+        all_rows_active = len(rows) == len(gains)
+
+        if dense_adjacency is not None:
+            active_gains = gains if all_rows_active else gains[rows]
+            flipped = np.argmin(active_gains, axis=1)
+            best_gains = active_gains[np.arange(len(rows)), flipped]
+        else:
+            best_blocks = np.argmin(minima if all_rows_active else minima[rows], axis=1)
+            candidates = _block_entries(
+                gains, block_size, rows * num_blocks + best_blocks
+            )
+            best_positions = np.argmin(candidates, axis=0)
+            flipped = best_blocks * block_size + best_positions
+            best_gains = candidates[best_positions, np.arange(len(rows))]
+        improving = best_gains < -_IMPROVEMENT_TOLERANCE
+        if not improving.all():
+            rows, flipped = rows[improving], flipped[improving]
+            all_rows_active = False
+
+        changes = flip_changes[rows, flipped]
+        if dense_adjacency is not None:
+            updates = dense_adjacency[flipped]
+            # Products of small integers are computed on narrow integers, which
+            # is much cheaper than another pass over the floats.
+            if all_rows_active:
+                updates *= flip_changes * changes[:, None]
+                gains += updates
+            else:
+                updates *= flip_changes[rows] * changes[:, None]
+                gains[rows] += updates
+            flip_changes[rows, flipped] *= -1
+            gains[rows, flipped] *= -1
+        else:
+            starts = adjacency.indptr[flipped]
+            counts = adjacency.indptr[flipped + 1] - starts
+            entries = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            entries += np.arange(len(entries))
+            neighbour_rows = np.repeat(rows, counts)
+            neighbour_columns = adjacency.indices[entries]
+            # Indices into flattened arrays are much faster than pairs of indices.
+            # Every neighbour appears at most once per row, so no update is lost.
+            neighbour_entries = neighbour_rows * padded_size + neighbour_columns
+            flipped_entries = rows * padded_size + flipped
+            flat_gains, flat_flip_changes = gains.ravel(), flip_changes.ravel()
+            old_gains = flat_gains[neighbour_entries]
+            new_gains = old_gains + (
+                np.repeat(changes, counts)
+                * adjacency.data[entries]
+                * flat_flip_changes[neighbour_entries]
+            )
+            flat_gains[neighbour_entries] = new_gains
+            flat_flip_changes[flipped_entries] *= -1
+            flat_gains[flipped_entries] *= -1
+
+            # Decreased gains can only lower minima of their blocks. Blocks
+            # whose minimum increased, including blocks of flipped variables,
+            # are rescanned.
+            flat_minima = minima.ravel()
+            neighbour_blocks = neighbour_rows * num_blocks + (
+                neighbour_columns // block_size
+            )
+            old_minima = flat_minima[neighbour_blocks]
+            flat_minima[neighbour_blocks] = np.minimum(old_minima, new_gains)
+            # Neighbours sharing a block could overwrite each other's minima.
+            overwritten = flat_minima[neighbour_blocks] > new_gains
+            if overwritten.any():
+                np.minimum.at(
+                    flat_minima, neighbour_blocks[overwritten], new_gains[overwritten]
+                )
+            increased = (old_gains == old_minima) & (new_gains > old_gains)
+            rescanned_blocks = np.concatenate(
+                [
+                    neighbour_blocks[increased],
+                    rows * num_blocks + flipped // block_size,
+                ]
+            )
+            flat_minima[rescanned_blocks] = np.minimum.reduce(
+                _block_entries(gains, block_size, rescanned_blocks), axis=0
+            )
+        step += 1
+
+    final_flip_changes[positions] = flip_changes
+    final_flip_changes = final_flip_changes[:, :num_variables]
+    if compiled.vartype is dimod.SPIN:
+        return (-final_flip_changes / 2).astype(samples.dtype)
+    return ((1 - final_flip_changes) / 2).astype(samples.dtype)
+
+
+def _block_entries(
+    gains: np.ndarray, block_size: int, blocks: np.ndarray
+) -> np.ndarray:
+    """Gathers blocks of gains, numbered across all rows, as columns of an array.
+
+    Having blocks in columns makes reductions over them elementwise operations
+    on whole rows, which is much faster than reducing many short rows.
+    """
+    entries = np.take(gains.reshape(-1, block_size), blocks, axis=0)
+    return np.ascontiguousarray(entries.T)
+
+
+_worker_compiled: Optional[CompiledQubo] = None
+_worker_max_steps: Optional[int] = None
+
+
+def _initialize_worker(compiled: CompiledQubo, max_steps: Optional[int]) -> None:
+    global _worker_compiled, _worker_max_steps
+    _worker_compiled = compiled
+    _worker_max_steps = max_steps
+
+
+def _steepest_descent_in_worker(samples: np.ndarray) -> np.ndarray:
+    assert _worker_compiled is not None
+    return _steepest_descent(_worker_compiled, samples, _worker_max_steps)
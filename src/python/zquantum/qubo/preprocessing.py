@@ -0,0 +1,228 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+from typing import Dict, Hashable, NamedTuple, Tuple
+
+import dimod
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog
+
+from .compiled_qubo import CompiledQubo, compile_qubo
+
+# Tolerance used when deciding whether values of the LP solution are integral.
+_INTEGRALITY_TOLERANCE = 1e-6
+
+
+class PreprocessedBQM(NamedTuple):
+    """Result of `preprocess_bqm`.
+
+    Attributes:
+        bqm: model with fixed variables removed.
+        fixed_variables: values of the fixed variables, in the vartype of the
+            original model.
+    """
+
+    bqm: dimod.BinaryQuadraticModel
+    fixed_variables: Dict[Hashable, int]
+
+
+def preprocess_bqm(
+    bqm: dimod.BinaryQuadraticModel, use_roof_duality: bool = True
+) -> PreprocessedBQM:
+    """Fixes variables whose values in some optimal solution can be found cheaply.
+
+    Two kinds of rules are applied repeatedly until no more variables can be
+    fixed:
+    - dominance: if flipping a variable from 1 to 0 (or from 0 to 1) never
+        increases the energy, whatever the values of other variables, it is
+        fixed to 0 (respectively 1),
+    - roof duality: the standard LP relaxation of the problem is solved with the
+        simplex method, giving a half-integral solution. By the persistency
+        theorem, variables with integral values can be fixed to them.
+
+    Each rule preserves at least one optimal solution, so combining an optimal
+    solution of the reduced model with the fixed values gives an optimal solution
+    of the original model.
+
+    Args:
+        bqm: model to be preprocessed. It is not modified.
+        use_roof_duality: whether to use roof duality, which requires solving
+            an LP with one variable per variable and interaction of the model.
+
+    Returns:
+        PreprocessedBQM with the reduced model and values of fixed variables.
+    """
+    compiled = CompiledQubo.from_bqm(bqm.change_vartype(dimod.BINARY, inplace=False))
+    adjacency = compiled.adjacency
+    positive_couplings = adjacency.maximum(0).tocsr()
+    negative_couplings = adjacency.minimum(0).tocsr()
+
+    # Value of every variable in the BINARY model, -1 for variables not fixed yet.
+    values = np.full(compiled.num_variables, -1, dtype=np.int8)
+    while True:
+        free = values < 0
+        if not free.any():
+            break
+        # Linear biases of the model with fixed variables substituted.
+        linear = compiled.linear + adjacency @ (values == 1)
+        indices, new_values = _fixes_by_dominance(
+            linear, positive_couplings, negative_couplings, free
+        )
+        if len(indices) == 0 and use_roof_duality:
+            free_indices = np.flatnonzero(free)
+            indices, new_values = _fixes_by_roof_duality(
+                linear[free_indices], adjacency[free_indices][:, free_indices]
+            )
+            indices = free_indices[indices]
+        if len(indices) == 0:
+            break
+        values[indices] = new_values
+
+    if bqm.vartype is dimod.SPIN:
+        values = np.where(values >= 0, 2 * values - 1, 0).astype(np.int8)
+    fixed = np.flatnonzero(values != -1 if bqm.vartype is dimod.BINARY else values)
+    return PreprocessedBQM(
+        _fix_variables(compile_qubo(bqm), fixed, values[fixed]),
+        {compiled.variables[i]: int(values[i]) for i in fixed},
+    )
+
+
+def expand_sampleset(
+    sampleset: dimod.SampleSet,
+    fixed_variables: Dict[Hashable, int],
+    bqm: dimod.BinaryQuadraticModel,
+) -> dimod.SampleSet:
+    """Extends samples of a reduced model with values of fixed variables.
+
+    Args:
+        sampleset: samples of the model returned by `preprocess_bqm`.
+        fixed_variables: values of the fixed variables returned by
+            `preprocess_bqm`.
+        bqm: original model, used to compute energies of the full samples.
+
+    Returns:
+        SampleSet with samples of all the variables of `bqm`, with energies with
+        respect to `bqm` and the same numbers of occurrences as `sampleset`.
+    """
+    compiled = compile_qubo(bqm)
+    num_samples = len(sampleset.record)
+    samples = np.empty((num_samples, compiled.num_variables), dtype=np.int8)
+    reduced_columns = [compiled.variable_index[v] for v in sampleset.variables]
+    samples[:, reduced_columns] = sampleset.record.sample
+    for variable, value in fixed_variables.items():
+        samples[:, compiled.variable_index[variable]] = value
+
+    return dimod.SampleSet.from_samples(
+        (samples, list(compiled.variables)),
+        bqm.vartype,
+        compiled.energies(samples),
+        num_occurrences=sampleset.record.num_occurrences,
+    )
+
+
+def _fix_variables(
+    compiled: CompiledQubo, fixed: np.ndarray, values: np.ndarray
+) -> dimod.BinaryQuadraticModel:
+    """Returns the model with variables of given indices fixed to given values.
+
+    Unlike `BinaryQuadraticModel.fix_variables`, the cost doesn't grow with the
+    product of the numbers of fixed and all variables.
+    """
+    free = np.setdiff1d(np.arange(compiled.num_variables), fixed)
+    adjacency = compiled.adjacency
+    fixed_adjacency = adjacency[fixed][:, fixed]
+    interactions = sparse.triu(adjacency[free][:, free], k=1).tocoo()
+    return dimod.BinaryQuadraticModel.from_numpy_vectors(
+        compiled.linear[free] + adjacency[free][:, fixed] @ values,
+        (interactions.row, interactions.col, interactions.data),
+        compiled.offset
+        + compiled.linear[fixed] @ values
+        + 0.5 * values @ (fixed_adjacency @ values),
+        compiled.vartype,
+        variable_order=[compiled.variables[i] for i in free],
+    )
+
+
+def _fixes_by_dominance(
+    linear: np.ndarray,
+    positive_couplings: sparse.csr_matrix,
+    negative_couplings: sparse.csr_matrix,
+    free: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Every rule holds for all values of other variables, so all of them can
+    # be applied at once.
+    fix_to_zero = free & (linear + negative_couplings @ free >= 0)
+    fix_to_one = free & ~fix_to_zero & (linear + positive_couplings @ free <= 0)
+    indices = np.flatnonzero(fix_to_zero | fix_to_one)
+    return indices, fix_to_one[indices].astype(np.int8)
+
+
+def _fixes_by_roof_duality(
+    linear: np.ndarray, adjacency: sparse.csr_matrix
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Fixes variables integral in a half-integral solution of the roof dual LP.
+
+    The LP has variables x_i in [0, 1] for the variables of the model and y_ij in
+    [0, 1] for their interactions with coefficients q_ij, and minimizes
+    sum_i h_i x_i + sum_ij q_ij y_ij subject to y_ij >= x_i + x_j - 1 for
+    q_ij > 0, and y_ij <= x_i, y_ij <= x_j for q_ij < 0.
+
+    Returns:
+        Indices of variables which can be fixed and their values.
+    """
+    num_variables = len(linear)
+    interactions = sparse.triu(adjacency, k=1).tocoo()
+    rows, cols, biases = interactions.row, interactions.col, interactions.data
+    num_interactions = len(biases)
+    positive = np.flatnonzero(biases > 0)
+    negative = np.flatnonzero(biases < 0)
+
+    # x_i + x_j - y_ij <= 1 for positive biases.
+    positive_constraints = sparse.coo_matrix(
+        (
+            np.repeat([1.0, 1.0, -1.0], len(positive)),
+            (
+                np.tile(np.arange(len(positive)), 3),
+                np.concatenate(
+                    [rows[positive], cols[positive], num_variables + positive]
+                ),
+            ),
+        ),
+        shape=(len(positive), num_variables + num_interactions),
+    )
+    # y_ij - x_i <= 0 and y_ij - x_j <= 0 for negative biases.
+    negative_constraints = sparse.coo_matrix(
+        (
+            np.repeat([1.0, -1.0, 1.0, -1.0], len(negative)),
+            (
+                np.tile(np.arange(2 * len(negative)).reshape(2, -1), 2).ravel(),
+                np.concatenate(
+                    [
+                        num_variables + negative,
+                        rows[negative],
+                        num_variables + negative,
+                        cols[negative],
+                    ]
+                ),
+            ),
+        ),
+        shape=(2 * len(negative), num_variables + num_interactions),
+    )
+    constraints = sparse.vstack([positive_constraints, negative_constraints]).tocsr()
+    upper_bounds = np.concatenate([np.ones(len(positive)), np.zeros(2 * len(negative))])
+
+    result = linprog(
+        np.concatenate([linear, biases]),
+        A_ub=constraints if constraints.shape[0] else None,
+        b_ub=upper_bounds if constraints.shape[0] else None,
+        bounds=(0, 1),
+        # Simplex returns a vertex of the polytope, which is half-integral.
+        method="highs-ds",
+    )
+    if not result.success:
+        return np.arange(0), np.arange(0)
+
+    values = result.x[:num_variables]
+    indices = np.flatnonzero(np.abs(values - np.round(values)) < _INTEGRALITY_TOLERANCE)
+    return indices, np.round(values[indices]).astype(np.int8)
@@ -0,0 +1,8 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+from .exact import GrayCodeExactSolver
+from .large_neighbourhood import LargeNeighbourhoodSolver
+from .parallel_tempering import ParallelTemperingSolver
+from .simulated_annealing import SimulatedAnnealingSolver
+from .tabu import TabuSolver
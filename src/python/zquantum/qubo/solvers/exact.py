@@ -0,0 +1,248 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import dimod
+import numpy as np
+
+from ..compiled_qubo import CompiledQubo, compile_qubo
+from ..interfaces.bqm_solver import BQMSolver
+from .simulated_annealing import samples_to_sampleset
+
+# Block energies are updated incrementally, so they are recomputed from scratch
+# every that many Gray code steps to keep rounding errors from accumulating.
+_RESYNC_INTERVAL = 1024
+
+# (energy, index of the state of outer variables, index of the inner state)
+_State = Tuple[float, int, int]
+
+
+class GrayCodeExactSolver(BQMSolver):
+    """Exact solver returning the lowest energy states of a model.
+
+    Unlike `dimod.ExactSolver`, it never keeps all the states in memory. The
+    variables are split into a block of inner variables, whose states are all
+    evaluated at once as an array, and outer variables, whose states are
+    enumerated in Gray code order. Consecutive outer states differ by one
+    variable, so energies of the whole inner block are updated with a single
+    vector operation per step. Only the `num_states` lowest energy states are
+    kept, in a bounded heap.
+
+    The space of states can be split between processes by fixing the values of
+    some outer variables in every task.
+    """
+
+    @property
+    def parameters(self) -> Dict[str, List[str]]:
+        return {
+            "num_states": [],
+            "block_size": [],
+            "number_of_workers": [],
+        }
+
+    @property
+    def properties(self) -> Dict[str, List[str]]:
+        return {}
+
+    def sample(
+        self,
+        bqm: dimod.BinaryQuadraticModel,
+        num_states: int = 1,
+        block_size: int = 16,
+        number_of_workers: int = 1,
+    ) -> dimod.SampleSet:
+        """Finds the lowest energy states of given model.
+
+        Args:
+            bqm: model to be solved.
+            num_states: number of the lowest energy states to return.
+            block_size: number of inner variables, whose states are evaluated
+                together. Memory usage grows as 2 ** block_size.
+            number_of_workers: number of processes the enumeration is split
+                between. If 1, states are enumerated in the current process.
+
+        Returns:
+            SampleSet with `num_states` lowest energy states (or all the states,
+            if there are fewer of them), sorted by energy.
+
+        Raises:
+            ValueError: if `num_states` is smaller than 1.
+        """
+        if num_states < 1:
+            raise ValueError(f"num_states has to be at least 1, got {num_states}.")
+
+        compiled = compile_qubo(bqm)
+        enumerator = _GrayCodeEnumerator(compiled_binary(compiled), block_size)
+
+        num_outer = enumerator.num_outer
+        num_prefix_bits = (
+            0
+            if number_of_workers == 1
+            else min(num_outer, int(np.ceil(np.log2(4 * number_of_workers))))
+        )
+        prefixes = range(2 ** num_prefix_bits)
+        arguments = (num_prefix_bits, num_states)
+        if number_of_workers == 1:
+            results = [
+                enumerator.lowest_states(prefix, *arguments) for prefix in prefixes
+            ]
+        else:
+            with ProcessPoolExecutor(
+                number_of_workers,
+                initializer=_initialize_worker,
+                initargs=(enumerator,),
+            ) as executor:
+                results = list(
+                    executor.map(
+                        _lowest_states_in_worker,
+                        prefixes,
+                        *[[argument] * len(prefixes) for argument in arguments],
+                    )
+                )
+
+        lowest = heapq.nsmallest(num_states, (state for r in results for state in r))
+        bits = enumerator.bits(
+            [outer for _, outer, _ in lowest], [inner for _, _, inner in lowest]
+        )
+        values = 2 * bits - 1 if compiled.vartype is dimod.SPIN else bits
+        return samples_to_sampleset(compiled, values)
+
+
+def compiled_binary(compiled: CompiledQubo) -> CompiledQubo:
+    """Returns equivalent model with BINARY vartype, with the same variables."""
+    if compiled.vartype is dimod.BINARY:
+        return compiled
+    # Substituting s = 2x - 1 into the spin model.
+    adjacency = compiled.adjacency
+    couplings_sums = np.asarray(adjacency.sum(axis=1)).ravel()
+    return CompiledQubo(
+        compiled.variables,
+        2 * compiled.linear - 2 * couplings_sums,
+        compiled.indptr,
+        compiled.indices,
+        4 * compiled.data,
+        compiled.offset - compiled.linear.sum() + compiled.data.sum(),
+        dimod.BINARY,
+    )
+
+
+class _GrayCodeEnumerator:
+    """Enumerates states of a BINARY model, as described in GrayCodeExactSolver.
+
+    Inner variables are the first `block_size` variables of the model, outer ones
+    are the remaining variables. Outer states are identified by integers whose
+    i-th bit is the value of the i-th outer variable, and inner states by indices
+    of rows of `inner_states`.
+    """
+
+    def __init__(self, compiled: CompiledQubo, block_size: int):
+        num_variables = compiled.num_variables
+        num_inner = min(block_size, num_variables)
+        self.num_inner = num_inner
+        self.num_outer = num_variables - num_inner
+
+        adjacency = compiled.adjacency.toarray()
+        linear = compiled.linear
+        self.inner_states = (
+            (np.arange(2 ** num_inner)[:, None] >> np.arange(num_inner)) & 1
+        ).astype(float)
+        inner_adjacency = adjacency[:num_inner, :num_inner]
+        self.inner_energies = self.inner_states @ linear[:num_inner] + 0.5 * np.einsum(
+            "ij,ij->i", self.inner_states @ inner_adjacency, self.inner_states
+        )
+        self.inner_outer_adjacency = adjacency[:num_inner, num_inner:]
+        # Column j holds changes of energies of inner states caused by switching
+        # the j-th outer variable from 0 to 1.
+        self.outer_updates = self.inner_states @ self.inner_outer_adjacency
+        self.outer_linear = linear[num_inner:]
+        self.outer_adjacency = adjacency[num_inner:, num_inner:]
+        self.offset = compiled.offset
+
+    def block_energies(self, outer_state: np.ndarray) -> np.ndarray:
+        """Energies of all inner states combined with given outer state."""
+        outer_energy = (
+            self.offset
+            + self.outer_linear @ outer_state
+            + 0.5 * outer_state @ self.outer_adjacency @ outer_state
+        )
+        return outer_energy + self.inner_energies + self.outer_updates @ outer_state
+
+    def lowest_states(
+        self, prefix: int, num_prefix_bits: int, num_states: int
+    ) -> List[_State]:
+        """Enumerates outer states with given values of the last outer variables.
+
+        Args:
+            prefix: values of the last `num_prefix_bits` outer variables, encoded
+                as an integer.
+            num_prefix_bits: number of outer variables with fixed values.
+            num_states: number of the lowest energy states to return.
+        """
+        num_free = self.num_outer - num_prefix_bits
+        outer = prefix << num_free
+        outer_state = ((outer >> np.arange(self.num_outer)) & 1).astype(float)
+        outer_fields = self.outer_linear + self.outer_adjacency @ outer_state
+        energies = self.block_energies(outer_state)
+
+        heap: List[_State] = []
+        self._push_lowest(heap, energies, outer, num_states)
+        for step in range(1, 2 ** num_free):
+            variable = (step & -step).bit_length() - 1
+            change = 1 - 2 * outer_state[variable]
+            outer ^= 1 << variable
+            outer_state[variable] += change
+            if step % _RESYNC_INTERVAL == 0:
+                outer_fields = self.outer_linear + self.outer_adjacency @ outer_state
+                energies = self.block_energies(outer_state)
+            else:
+                energies += change * (
+                    outer_fields[variable] + self.outer_updates[:, variable]
+                )
+                outer_fields += change * self.outer_adjacency[:, variable]
+            self._push_lowest(heap, energies, outer, num_states)
+
+        return [
+            (-negative_energy, outer, inner) for negative_energy, outer, inner in heap
+        ]
+
+    @staticmethod
+    def _push_lowest(heap, energies: np.ndarray, outer: int, num_states: int):
+        # The heap holds negated energies, so that its root is the highest one.
+        if len(heap) == num_states:
+            candidates = np.flatnonzero(energies < -heap[0][0])
+        else:
+            candidates = np.arange(len(energies))
+        if len(candidates) > num_states:
+            candidates = candidates[
+                np.argpartition(energies[candidates], num_states - 1)[:num_states]
+            ]
+        for inner in candidates.tolist():
+            item = (-energies[inner], outer, inner)
+            if len(heap) < num_states:
+                heapq.heappush(heap, item)
+            else:
+                heapq.heappushpop(heap, item)
+
+    def bits(self, outers: List[int], inners: List[int]) -> np.ndarray:
+        """Values of all variables in states with given outer and inner indices."""
+        outer_bits = (
+            np.array(outers, dtype=np.int64)[:, None] >> np.arange(self.num_outer)
+        ) & 1
+        inner_bits = self.inner_states[np.array(inners, dtype=np.int64)]
+        return np.hstack([inner_bits, outer_bits]).astype(np.int8)
+
+
+_worker_enumerator: Optional[_GrayCodeEnumerator] = None
+
+
+def _initialize_worker(enumerator: _GrayCodeEnumerator) -> None:
+    global _worker_enumerator
+    _worker_enumerator = enumerator
+
+
+def _lowest_states_in_worker(*args) -> List[_State]:
+    assert _worker_enumerator is not None
+    return _worker_enumerator.lowest_states(*args)
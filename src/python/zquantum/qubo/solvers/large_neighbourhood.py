@@ -0,0 +1,174 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+from typing import Any, Dict, List, Optional
+
+import dimod
+import numpy as np
+from scipy import sparse
+
+from ..compiled_qubo import CompiledQubo, compile_qubo
+from ..interfaces.bqm_solver import BQMSolver
+from .simulated_annealing import samples_to_sampleset
+from .tabu import TabuSolver
+
+
+class LargeNeighbourhoodSolver(BQMSolver):
+    """Solves large models by repeatedly solving small subproblems.
+
+    Starting from a random state (the incumbent), in every iteration a subset of
+    variables is selected, all other variables are clamped to their values in the
+    incumbent and the resulting small model is solved with the inner solver. If
+    the solution improves the incumbent, it is accepted.
+
+    Variables are ranked by the energy change caused by flipping them in the
+    incumbent, and subproblems are formed from consecutive windows of this
+    ranking: the highest impact variables first, and after every iteration without
+    improvement the next window. The energy and local fields of the incumbent are
+    updated incrementally, so the full model is never evaluated from scratch.
+
+    Args:
+        inner_solver: solver used for the subproblems. Defaults to TabuSolver.
+    """
+
+    def __init__(self, inner_solver: Optional[BQMSolver] = None):
+        self.inner_solver = TabuSolver() if inner_solver is None else inner_solver
+
+    @property
+    def parameters(self) -> Dict[str, List[str]]:
+        return {
+            "subproblem_size": [],
+            "max_iterations": [],
+            "max_stalled_iterations": [],
+            "inner_parameters": [],
+            "seed": [],
+        }
+
+    @property
+    def properties(self) -> Dict[str, Any]:
+        return {"inner_solver": self.inner_solver}
+
+    def sample(
+        self,
+        bqm: dimod.BinaryQuadraticModel,
+        subproblem_size: int = 50,
+        max_iterations: int = 100,
+        max_stalled_iterations: Optional[int] = None,
+        inner_parameters: Optional[Dict[str, Any]] = None,
+        seed: Optional[int] = None,
+    ) -> dimod.SampleSet:
+        """Searches for a low energy state of given model.
+
+        Args:
+            bqm: model to be solved.
+            subproblem_size: number of variables in every subproblem.
+            max_iterations: maximal number of solved subproblems.
+            max_stalled_iterations: the search stops after that many consecutive
+                iterations without improvement. Defaults to the number of windows
+                needed to cover all variables.
+            inner_parameters: keyword arguments passed to `sample` of the inner
+                solver.
+            seed: seed used for the initial state.
+
+        Returns:
+            SampleSet with the final incumbent. Its info holds the number of
+            performed iterations and the energy of the incumbent after each one.
+        """
+        compiled = compile_qubo(bqm)
+        num_variables = compiled.num_variables
+        subproblem_size = min(subproblem_size, num_variables)
+        if max_stalled_iterations is None:
+            max_stalled_iterations = -(-num_variables // max(subproblem_size, 1))
+        inner_parameters = {} if inner_parameters is None else inner_parameters
+
+        rng = np.random.default_rng(seed)
+        initial_state = rng.integers(0, 2, size=num_variables)
+        if compiled.vartype is dimod.SPIN:
+            initial_state = 2 * initial_state - 1
+        tracker = EnergyTracker(compiled, initial_state)
+
+        energies = []
+        window = stalled_iterations = 0
+        for _ in range(max_iterations if num_variables else 0):
+            if stalled_iterations >= max_stalled_iterations:
+                break
+            ranking = np.argsort(tracker.flip_gains(), kind="stable")
+            start = (window * subproblem_size) % num_variables
+            subproblem = np.sort(
+                np.take(ranking, range(start, start + subproblem_size), mode="wrap")
+            )
+
+            sampleset = self.inner_solver.sample(
+                tracker.clamped_bqm(subproblem), **inner_parameters
+            )
+            best = sampleset.record[np.argmin(sampleset.record.energy)].sample
+            values = best[[sampleset.variables.index(i) for i in range(len(best))]]
+
+            if tracker.energy_change(subproblem, values) < 0:
+                tracker.update(subproblem, values)
+                window = stalled_iterations = 0
+            else:
+                window += 1
+                stalled_iterations += 1
+            energies.append(tracker.energy)
+
+        return samples_to_sampleset(
+            compiled,
+            tracker.state[None],
+            info={"num_iterations": len(energies), "energies": energies},
+        )
+
+
+class EnergyTracker:
+    """Keeps energy and local fields of a state while its variables change.
+
+    Local field of a variable is its linear bias plus the sum of its couplings
+    weighted by values of its neighbours, so changing the value of a single
+    variable by d changes the energy by d times its local field.
+
+    Args:
+        compiled: model whose state is tracked.
+        state: initial state, with values ordered as `compiled.variables`.
+    """
+
+    def __init__(self, compiled: CompiledQubo, state: np.ndarray):
+        self.compiled = compiled
+        self.state = np.asarray(state, dtype=float).copy()
+        self.fields = compiled.linear + compiled.adjacency @ self.state
+        self.energy = float(compiled.energies(self.state[None])[0])
+
+    def flip_gains(self) -> np.ndarray:
+        """Energy changes caused by flipping every single variable."""
+        if self.compiled.vartype is dimod.SPIN:
+            return -2 * self.state * self.fields
+        return (1 - 2 * self.state) * self.fields
+
+    def energy_change(self, indices: np.ndarray, values: np.ndarray) -> float:
+        """Energy change caused by setting variables at given indices to values."""
+        changes = values - self.state[indices]
+        couplings = self.compiled.adjacency[indices][:, indices]
+        return float(
+            changes @ self.fields[indices] + 0.5 * changes @ (couplings @ changes)
+        )
+
+    def update(self, indices: np.ndarray, values: np.ndarray) -> None:
+        """Sets variables at given indices to given values."""
+        self.energy += self.energy_change(indices, values)
+        changes = values - self.state[indices]
+        self.fields += self.compiled.adjacency[indices].T @ changes
+        self.state[indices] = values
+
+    def clamped_bqm(self, indices: np.ndarray) -> dimod.BinaryQuadraticModel:
+        """Model of variables at given indices, with all others clamped.
+
+        Variables of the returned model are labelled with positions in `indices`.
+        Its energies differ from the energies of the full model by a constant.
+        """
+        couplings = self.compiled.adjacency[indices][:, indices]
+        interactions = sparse.triu(couplings, k=1).tocoo()
+        return dimod.BinaryQuadraticModel.from_numpy_vectors(
+            self.fields[indices] - couplings @ self.state[indices],
+            (interactions.row, interactions.col, interactions.data),
+            0.0,
+            self.compiled.vartype,
+        )
@@ -0,0 +1,210 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import dimod
+import numpy as np
+
+from ..compiled_qubo import compile_qubo
+from ..interfaces.bqm_solver import BQMSolver
+from .simulated_annealing import (
+    MetropolisSweeper,
+    default_beta_range,
+    samples_to_sampleset,
+)
+
+
+class ParallelTemperingSolver(BQMSolver):
+    """Parallel tempering (replica exchange Monte Carlo) solver.
+
+    Every chain consists of replicas kept at fixed inverse temperatures forming
+    a geometric ladder. All replicas of all chains are swept at once with the
+    vectorized Metropolis kernel of `SimulatedAnnealingSolver`. Periodically,
+    replicas at neighbouring temperatures of the same chain exchange their
+    temperatures with the usual replica exchange acceptance probability,
+    alternating between even and odd pairs of neighbours. The lowest energy
+    state visited by any replica of a chain is the sample returned for the chain.
+    """
+
+    @property
+    def parameters(self) -> Dict[str, List[str]]:
+        return {
+            "num_reads": [],
+            "num_sweeps": [],
+            "num_temperatures": [],
+            "beta_range": [],
+            "swap_interval": [],
+            "number_of_workers": [],
+            "seed": [],
+        }
+
+    @property
+    def properties(self) -> Dict[str, Tuple[str, ...]]:
+        return {}
+
+    def sample(
+        self,
+        bqm: dimod.BinaryQuadraticModel,
+        num_reads: int = 10,
+        num_sweeps: int = 1000,
+        num_temperatures: int = 16,
+        beta_range: Optional[Tuple[float, float]] = None,
+        swap_interval: int = 1,
+        number_of_workers: int = 1,
+        seed: Optional[int] = None,
+    ) -> dimod.SampleSet:
+        """Samples low energy states of given model.
+
+        Args:
+            bqm: model to be sampled.
+            num_reads: number of independent chains, each giving one sample.
+            num_sweeps: number of sweeps performed by every replica.
+            num_temperatures: number of replicas in every chain.
+            beta_range: lowest and highest inverse temperature of the ladder. If
+                not provided, the same range as in simulated annealing is used.
+            swap_interval: number of sweeps between consecutive attempts to
+                exchange temperatures.
+            number_of_workers: number of processes the chains are distributed
+                over. If 1, all chains are run in the current process.
+            seed: seed used for RNG. Results are reproducible for given seed and
+                number of workers.
+
+        Returns:
+            SampleSet with the best state found by every chain. Its info holds
+            the used range of inverse temperatures and the fraction of accepted
+            exchanges between every pair of neighbouring temperatures.
+
+        Raises:
+            ValueError: if `swap_interval` is smaller than 1.
+        """
+        if swap_interval < 1:
+            raise ValueError(
+                f"swap_interval has to be at least 1 sweep, got {swap_interval}."
+            )
+
+        compiled = compile_qubo(bqm)
+        if beta_range is None:
+            beta_range = default_beta_range(compiled)
+        ladder = np.geomspace(*beta_range, num_temperatures)
+        sweeper = MetropolisSweeper(compiled)
+
+        chunks = [
+            (len(chunk), chunk_seed)
+            for chunk, chunk_seed in zip(
+                np.array_split(np.arange(num_reads), number_of_workers),
+                np.random.SeedSequence(seed).spawn(number_of_workers),
+            )
+            if len(chunk) > 0
+        ]
+        arguments = (ladder, num_sweeps, swap_interval)
+        if number_of_workers == 1:
+            results = [
+                _run_chains(sweeper, num_chains, *arguments, chunk_seed)
+                for num_chains, chunk_seed in chunks
+            ]
+        else:
+            with ProcessPoolExecutor(
+                number_of_workers,
+                initializer=_initialize_worker,
+                initargs=(sweeper,),
+            ) as executor:
+                results = list(
+                    executor.map(
+                        _run_chains_in_worker,
+                        *zip(
+                            *[
+                                (num_chains, *arguments, chunk_seed)
+                                for num_chains, chunk_seed in chunks
+                            ]
+                        ),
+                    )
+                )
+
+        best_states = np.concatenate([states for states, _, _ in results])
+        swaps_accepted = sum(accepted for _, accepted, _ in results)
+        swaps_attempted = sum(attempted for _, _, attempted in results)
+        return samples_to_sampleset(
+            sweeper.compiled,
+            best_states,
+            info={
+                "beta_range": tuple(map(float, beta_range)),
+                "swap_acceptance_rates": (
+                    swaps_accepted / np.maximum(swaps_attempted, 1)
+                ).tolist(),
+            },
+        )
+
+
+def _run_chains(
+    sweeper: MetropolisSweeper,
+    num_chains: int,
+    ladder: np.ndarray,
+    num_sweeps: int,
+    swap_interval: int,
+    seed: np.random.SeedSequence,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Runs given number of chains.
+
+    Returns:
+        Best states found by the chains, and numbers of accepted and attempted
+        exchanges between every pair of neighbouring temperatures.
+    """
+    rng = np.random.default_rng(seed)
+    num_temperatures = len(ladder)
+    states = sweeper.random_states(num_chains * num_temperatures, rng)
+    fields = sweeper.local_fields(states)
+
+    # replicas[c, t] is the row of the replica of chain c at temperature t.
+    replicas = np.arange(num_chains * num_temperatures).reshape(
+        num_chains, num_temperatures
+    )
+    betas = np.empty(num_chains * num_temperatures)
+    betas[replicas] = ladder
+    chain_rows = np.arange(num_chains) * num_temperatures
+
+    best_energies = np.full(num_chains, np.inf)
+    best_states = np.zeros((num_chains, states.shape[1]))
+    swaps_accepted = np.zeros(max(num_temperatures - 1, 0))
+    swaps_attempted = np.zeros(max(num_temperatures - 1, 0))
+
+    for sweep in range(num_sweeps):
+        sweeper.sweep(states, fields, betas, rng)
+        energies = sweeper.energies(states, fields)
+
+        chain_energies = energies.reshape(num_chains, num_temperatures)
+        lowest = chain_energies.argmin(axis=1)
+        lowest_energies = chain_energies[np.arange(num_chains), lowest]
+        improved = lowest_energies < best_energies
+        best_energies[improved] = lowest_energies[improved]
+        best_states[improved] = states[chain_rows[improved] + lowest[improved]]
+
+        if (sweep + 1) % swap_interval == 0:
+            # Pairs of neighbouring temperatures (t, t + 1) with even or odd t.
+            pairs = np.arange((sweep // swap_interval) % 2, num_temperatures - 1, 2)
+            hotter, colder = replicas[:, pairs], replicas[:, pairs + 1]
+            log_acceptance = (ladder[pairs] - ladder[pairs + 1]) * (
+                energies[hotter] - energies[colder]
+            )
+            accepted = np.log(rng.random(log_acceptance.shape)) < log_acceptance
+            replicas[:, pairs] = np.where(accepted, colder, hotter)
+            replicas[:, pairs + 1] = np.where(accepted, hotter, colder)
+            betas[replicas] = ladder
+            swaps_accepted[pairs] += accepted.sum(axis=0)
+            swaps_attempted[pairs] += num_chains
+
+    return best_states, swaps_accepted, swaps_attempted
+
+
+_worker_sweeper: Optional[MetropolisSweeper] = None
+
+
+def _initialize_worker(sweeper: MetropolisSweeper) -> None:
+    global _worker_sweeper
+    _worker_sweeper = sweeper
+
+
+def _run_chains_in_worker(*args) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    assert _worker_sweeper is not None
+    return _run_chains(_worker_sweeper, *args)
@@ -0,0 +1,245 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import dimod
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from ..compiled_qubo import _DENSE_COUPLINGS_THRESHOLD, CompiledQubo, compile_qubo
+from ..interfaces.bqm_solver import BQMSolver
+
+_BETA_SCHEDULE_TYPES = ("linear", "geometric")
+
+
+class SimulatedAnnealingSolver(BQMSolver):
+    """Simulated annealing solver running many replicas at once.
+
+    All replicas are stored as rows of a single NumPy array and are updated
+    together. Variables are partitioned into classes of pairwise non-interacting
+    variables (via greedy graph coloring), and all variables of one class are
+    updated at once with the Metropolis criterion. Since variables in a class
+    don't interact, this is equivalent to a sequential sweep over variables
+    ordered by their class. Local fields of all replicas are updated
+    incrementally from the CSR coupling structure after every class update.
+    """
+
+    @property
+    def parameters(self) -> Dict[str, List[str]]:
+        return {
+            "num_reads": [],
+            "num_sweeps": [],
+            "beta_range": [],
+            "beta_schedule_type": ["beta_schedule_options"],
+            "seed": [],
+        }
+
+    @property
+    def properties(self) -> Dict[str, Tuple[str, ...]]:
+        return {"beta_schedule_options": _BETA_SCHEDULE_TYPES}
+
+    def sample(
+        self,
+        bqm: dimod.BinaryQuadraticModel,
+        num_reads: int = 10,
+        num_sweeps: int = 1000,
+        beta_range: Optional[Tuple[float, float]] = None,
+        beta_schedule_type: str = "geometric",
+        seed: Optional[int] = None,
+    ) -> dimod.SampleSet:
+        """Samples low energy states of given model.
+
+        Args:
+            bqm: model to be sampled.
+            num_reads: number of independent replicas, each giving one sample.
+            num_sweeps: number of sweeps over all variables, one per value of
+                inverse temperature in the schedule.
+            beta_range: initial and final inverse temperature. If not provided,
+                the range is chosen so that initially flipping any variable is
+                likely and in the end flipping any variable is unlikely.
+            beta_schedule_type: "geometric" or "linear" interpolation between the
+                initial and final inverse temperature.
+            seed: seed used for RNG.
+
+        Returns:
+            SampleSet with one sample per replica.
+        """
+        if beta_schedule_type not in _BETA_SCHEDULE_TYPES:
+            raise ValueError(
+                f"Unknown beta schedule type {beta_schedule_type}, expected one of "
+                f"{_BETA_SCHEDULE_TYPES}."
+            )
+        compiled = compile_qubo(bqm)
+        if beta_range is None:
+            beta_range = default_beta_range(compiled)
+        beta_schedule = (
+            np.geomspace(*beta_range, num_sweeps)
+            if beta_schedule_type == "geometric"
+            else np.linspace(*beta_range, num_sweeps)
+        )
+
+        rng = np.random.default_rng(seed)
+        sweeper = MetropolisSweeper(compiled)
+        states = sweeper.random_states(num_reads, rng)
+        fields = sweeper.local_fields(states)
+        betas = np.empty(num_reads)
+        for beta in beta_schedule:
+            betas.fill(beta)
+            sweeper.sweep(states, fields, betas, rng)
+
+        return samples_to_sampleset(
+            sweeper.compiled, states, info={"beta_range": tuple(map(float, beta_range))}
+        )
+
+
+class MetropolisSweeper:
+    """Vectorized Metropolis sweeps over replicas of a compiled model.
+
+    Variables are reordered so that every class of pairwise non-interacting
+    variables occupies a contiguous range of columns; `compiled` holds the
+    reordered model. States of the replicas are float arrays with one replica
+    per row and one variable per column, following the order of
+    `compiled.variables`. Local fields hold, for each replica and variable, the
+    linear bias of the variable plus the sum of its couplings weighted by the
+    values of its neighbours, so that changing the value of a variable by d
+    changes the energy by d times its local field.
+
+    Args:
+        compiled: model whose states are sampled.
+    """
+
+    def __init__(self, compiled: CompiledQubo):
+        classes = _color_classes(compiled.adjacency)
+        self.compiled = compiled.permuted(
+            np.concatenate(classes) if classes else np.arange(0)
+        )
+        self._is_spin = compiled.vartype is dimod.SPIN
+
+        adjacency = self.compiled.adjacency
+        num_variables = self.compiled.num_variables
+        dense = adjacency.nnz > _DENSE_COUPLINGS_THRESHOLD * num_variables ** 2
+        self._adjacency: Union[np.ndarray, csr_matrix] = (
+            adjacency.toarray() if dense else adjacency
+        )
+
+        self._blocks: List[Tuple[slice, Union[slice, np.ndarray], Any]] = []
+        start = 0
+        for color_class in classes:
+            columns = slice(start, start + len(color_class))
+            start += len(color_class)
+            if dense:
+                self._blocks.append((columns, slice(None), self._adjacency[columns]))
+            else:
+                rows = adjacency[columns]
+                neighbours = np.unique(rows.indices)
+                self._blocks.append((columns, neighbours, rows[:, neighbours]))
+
+    def random_states(self, num_replicas: int, rng: np.random.Generator) -> np.ndarray:
+        """Returns uniformly random states of given number of replicas."""
+        states = rng.integers(
+            0, 2, size=(num_replicas, self.compiled.num_variables)
+        ).astype(float)
+        if self._is_spin:
+            states = 2 * states - 1
+        return np.asfortranarray(states)
+
+    def local_fields(self, states: np.ndarray) -> np.ndarray:
+        """Computes local fields of all variables for given states from scratch."""
+        return np.asfortranarray(self.compiled.linear + states @ self._adjacency)
+
+    def energies(self, states: np.ndarray, fields: np.ndarray) -> np.ndarray:
+        """Computes energies of given states using their local fields."""
+        return self.compiled.offset + 0.5 * np.einsum(
+            "ij,ij->i", states, fields + self.compiled.linear
+        )
+
+    def flip_changes(self, values: np.ndarray) -> np.ndarray:
+        """Changes of values caused by flipping variables with given values."""
+        return -2 * values if self._is_spin else 1 - 2 * values
+
+    def sweep(
+        self,
+        states: np.ndarray,
+        fields: np.ndarray,
+        betas: np.ndarray,
+        rng: np.random.Generator,
+    ) -> None:
+        """Performs a single Metropolis sweep over all variables, in place.
+
+        Args:
+            states: states of the replicas, updated in place. Column-major
+                (Fortran-ordered) arrays are processed fastest.
+            fields: local fields matching `states`, updated in place.
+            betas: inverse temperature of every replica.
+            rng: generator of random numbers used for acceptance.
+        """
+        num_replicas, num_variables = states.shape
+        thresholds = np.log(rng.random((num_variables, num_replicas))).T
+        thresholds /= -betas[:, None]
+        for columns, neighbours, block in self._blocks:
+            changes = self.flip_changes(states[:, columns])
+            accepted = changes * fields[:, columns] < thresholds[:, columns]
+            # At low temperatures few replicas change, so only those are updated.
+            replicas = np.flatnonzero(accepted.any(axis=1))
+            if len(replicas) == 0:
+                continue
+            changes = changes[replicas] * accepted[replicas]
+            states[replicas, columns] += changes
+            if isinstance(neighbours, slice):
+                fields[replicas] += changes @ block
+            else:
+                fields[np.ix_(replicas, neighbours)] += changes @ block
+
+
+def default_beta_range(compiled: CompiledQubo) -> Tuple[float, float]:
+    """Default range of inverse temperatures used for annealing given model.
+
+    At the initial temperature flipping a variable increasing the energy the most
+    is accepted with probability of 50%, while at the final temperature flipping
+    a variable with the smallest bias is accepted with probability of 1%.
+    """
+    scale = 2.0 if compiled.vartype is dimod.SPIN else 1.0
+    absolute_couplings = abs(compiled.adjacency)
+    max_energy_changes = scale * (
+        np.abs(compiled.linear) + np.asarray(absolute_couplings.sum(axis=1)).ravel()
+    )
+    biases = np.concatenate([np.abs(compiled.linear), np.abs(compiled.data)])
+    biases = biases[biases > 0]
+    if len(biases) == 0:
+        return 0.1, 1.0
+    hot_beta = np.log(2) / max_energy_changes.max()
+    cold_beta = np.log(100) / (scale * biases.min())
+    return float(hot_beta), float(max(cold_beta, hot_beta))
+
+
+def samples_to_sampleset(
+    compiled: CompiledQubo, states: np.ndarray, info: Optional[dict] = None, **vectors
+) -> dimod.SampleSet:
+    """Creates SampleSet of given states, computing their energies from scratch."""
+    return dimod.SampleSet.from_samples(
+        (states.astype(np.int8), list(compiled.variables)),
+        compiled.vartype,
+        compiled.energies(states),
+        info=info,
+        **vectors,
+    )
+
+
+def _color_classes(adjacency: csr_matrix) -> Sequence[np.ndarray]:
+    """Partitions variables into classes of pairwise non-adjacent variables.
+
+    Uses greedy coloring, visiting variables in order of decreasing degree.
+    """
+    num_variables = adjacency.shape[0]
+    indptr, indices = adjacency.indptr, adjacency.indices
+    degrees = np.diff(indptr)
+    colors = np.full(num_variables, -1, dtype=np.int64)
+    for variable in np.argsort(-degrees, kind="stable"):
+        used = set(colors[indices[indptr[variable] : indptr[variable + 1]]].tolist())
+        color = 0
+        while color in used:
+            color += 1
+        colors[variable] = color
+    order = np.argsort(colors, kind="stable")
+    return np.split(order, np.cumsum(np.bincount(colors))[:-1]) if num_variables else []
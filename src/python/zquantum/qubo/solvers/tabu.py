@@ -0,0 +1,254 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import dimod
+import numpy as np
+
+from ..compiled_qubo import CompiledQubo, compile_qubo
+from ..interfaces.bqm_solver import BQMSolver
+from .simulated_annealing import samples_to_sampleset
+
+# Reading the clock costs about as much as a whole move on sparse models, so the
+# time limit is checked only once per that many iterations.
+_DEADLINE_CHECK_INTERVAL = 64
+
+
+class TabuSolver(BQMSolver):
+    """Tabu search over single variable flips.
+
+    In every step the variable whose flip decreases the energy the most (or
+    increases it the least) is flipped, unless it was flipped during the last
+    `tenure` steps. Tabu variables are still flipped if that gives a state better
+    than the best found so far (aspiration criterion).
+
+    Flip gains (energy changes caused by flipping every variable) are kept for the
+    current state and only the gains of the flipped variable and its neighbours
+    are updated after a flip, using the CSR adjacency of the model. Gains are
+    grouped in blocks with known minima, and tabu flags expire in the order the
+    variables were flipped, so no step scans all the variables.
+    """
+
+    @property
+    def parameters(self) -> Dict[str, List[str]]:
+        return {
+            "num_reads": [],
+            "tenure": [],
+            "max_stalled_iterations": [],
+            "time_limit": [],
+            "target_energy": [],
+            "seed": [],
+        }
+
+    @property
+    def properties(self) -> Dict[str, List[str]]:
+        return {}
+
+    def sample(
+        self,
+        bqm: dimod.BinaryQuadraticModel,
+        num_reads: int = 10,
+        tenure: Optional[int] = None,
+        max_stalled_iterations: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        target_energy: Optional[float] = None,
+        seed: Optional[int] = None,
+    ) -> dimod.SampleSet:
+        """Searches for low energy states of given model.
+
+        Args:
+            bqm: model to be solved.
+            num_reads: number of restarts from random states. Every restart gives
+                one sample, the best state it found.
+            tenure: number of steps for which a flipped variable can't be flipped
+                again. Defaults to 10% of the number of variables, but at least
+                20 and at most 25% of the number of variables.
+            max_stalled_iterations: a restart is finished after this many steps
+                without improving its best state. Defaults to
+                max(100, 10 * number of variables).
+            time_limit: if provided, the search stops after this many seconds.
+                Restarts which didn't start yet are skipped.
+            target_energy: if provided, the search stops as soon as a state with
+                energy not greater than it is found.
+            seed: seed used for RNG.
+
+        Returns:
+            SampleSet with one sample per performed restart. Its info holds the
+            number of performed restarts and whether the search was stopped
+            because of the time limit or reaching target energy.
+        """
+        compiled = compile_qubo(bqm)
+        num_variables = compiled.num_variables
+        if tenure is None:
+            tenure = min(num_variables // 4, max(20, num_variables // 10))
+        if max_stalled_iterations is None:
+            max_stalled_iterations = max(100, 10 * num_variables)
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        rng = np.random.default_rng(seed)
+
+        search = _TabuSearch(compiled, tenure)
+        best_states = []
+        stop_reason = None
+        for _ in range(num_reads):
+            state, stop_reason = search.run(
+                rng, max_stalled_iterations, deadline, target_energy
+            )
+            best_states.append(state)
+            if stop_reason is not None:
+                break
+
+        return samples_to_sampleset(
+            compiled,
+            np.array(best_states).reshape(len(best_states), num_variables),
+            info={"num_restarts": len(best_states), "stop_reason": stop_reason},
+        )
+
+
+class _TabuSearch:
+    def __init__(self, compiled: CompiledQubo, tenure: int):
+        self.compiled = compiled
+        self.tenure = tenure
+        self._is_spin = compiled.vartype is dimod.SPIN
+        adjacency = compiled.adjacency
+        self._indptr = adjacency.indptr
+        self._indices = adjacency.indices
+        self._data = adjacency.data
+
+    def _flip_changes(self, values):
+        return -2 * values if self._is_spin else 1 - 2 * values
+
+    def run(
+        self,
+        rng: np.random.Generator,
+        max_stalled_iterations: int,
+        deadline: Optional[float],
+        target_energy: Optional[float],
+    ):
+        """Runs single restart, returning its best state and reason for stopping
+        the whole search (None if the search should continue)."""
+        compiled = self.compiled
+        num_variables = compiled.num_variables
+        state = rng.integers(0, 2, size=num_variables).astype(float)
+        if self._is_spin:
+            state = 2 * state - 1
+        fields = compiled.linear + compiled.adjacency @ state
+        flip_gains = self._flip_changes(state) * fields
+        gains = _GainBlocks(flip_gains)
+        energy = float(compiled.energies(state[None])[0])
+        best_state, best_energy = state.copy(), energy
+        tabu_until = np.zeros(num_variables, dtype=np.int64)
+        # Flipped variables with iterations at which they stop being tabu, in
+        # the order of flips, so the expiring ones are always at the front.
+        expirations: Deque[Tuple[int, int]] = deque()
+
+        def stop_reason(check_deadline=True):
+            if target_energy is not None and best_energy <= target_energy:
+                return "target_energy"
+            if (
+                check_deadline
+                and deadline is not None
+                and time.perf_counter() > deadline
+            ):
+                return "time_limit"
+            return None
+
+        if num_variables == 0:
+            return best_state, stop_reason()
+
+        iteration = last_improvement = 0
+        while iteration - last_improvement < max_stalled_iterations:
+            reason = stop_reason(iteration % _DEADLINE_CHECK_INTERVAL == 0)
+            if reason is not None:
+                return best_state, reason
+
+            variable, gain = gains.argmin(tabu=False)
+            tabu_gain = gains.min(tabu=True)
+            if tabu_gain < gain and energy + tabu_gain < best_energy:
+                variable, gain = gains.argmin(tabu=True)
+            if gain == np.inf:
+                # All variables are tabu, so just wait for the tenure to pass.
+                changed_parts = []
+            else:
+                change = self._flip_changes(state[variable])
+                energy += gain
+                state[variable] += change
+                start, stop = self._indptr[variable], self._indptr[variable + 1]
+                neighbours = self._indices[start:stop]
+                fields[neighbours] += change * self._data[start:stop]
+                flip_gains[neighbours] = (
+                    self._flip_changes(state[neighbours]) * fields[neighbours]
+                )
+                flip_gains[variable] = -gain
+                tabu_until[variable] = iteration + self.tenure + 1
+                expirations.append((iteration + self.tenure + 1, variable))
+                changed_parts = [neighbours, [variable]]
+
+            iteration += 1
+            # Tabu flags of changed variables are taken from `tabu_until`, so
+            # expired variables flipped again thanks to aspiration stay tabu.
+            while expirations and expirations[0][0] <= iteration:
+                changed_parts.append([expirations.popleft()[1]])
+            if changed_parts:
+                changed = np.concatenate(changed_parts)
+                gains.update(
+                    changed, flip_gains[changed], tabu_until[changed] > iteration
+                )
+
+            # Flipping a variable back and forth can decrease the tracked energy
+            # due to rounding errors, which mustn't count as an improvement.
+            if energy < best_energy and not math.isclose(
+                energy, best_energy, abs_tol=1e-12
+            ):
+                best_state[:] = state
+                best_energy = energy
+                last_improvement = iteration
+
+        return best_state, stop_reason()
+
+
+class _GainBlocks:
+    """Flip gains split into blocks of about sqrt(n) variables.
+
+    Gains of non-tabu and tabu variables are kept in two rows of an array, with
+    infinities in place of variables of the other kind, and every block of each
+    row keeps its minimum. After changing gains or tabu flags of some variables
+    only their blocks are refreshed, so finding the best move costs O(sqrt(n))
+    and updating the gains after a flip O(degree * sqrt(n)), instead of scanning
+    all the variables.
+    """
+
+    def __init__(self, gains: np.ndarray):
+        num_variables = len(gains)
+        self.block_size = max(1, math.isqrt(num_variables))
+        num_blocks = -(-num_variables // self.block_size)
+        # Padding entries have infinite gains, so they are never selected.
+        self._gains = np.full((2, num_blocks * self.block_size), np.inf)
+        self._gains[0, :num_variables] = gains
+        self._blocks = self._gains.reshape(2, num_blocks, self.block_size)
+        self._minima = self._blocks.min(axis=2)
+
+    def update(self, variables: np.ndarray, gains: np.ndarray, tabu: np.ndarray):
+        """Sets gains and tabu flags of given variables."""
+        self._gains[:, variables] = np.inf
+        self._gains[tabu.astype(np.intp), variables] = gains
+        if len(variables) >= self._minima.shape[1]:
+            # Most blocks changed, e.g. in dense models.
+            np.min(self._blocks, axis=2, out=self._minima)
+        else:
+            blocks = variables // self.block_size
+            self._minima[:, blocks] = self._blocks[:, blocks].min(axis=2)
+
+    def min(self, tabu: bool) -> float:
+        """Returns the lowest gain of a (non-)tabu variable."""
+        return self._minima[int(tabu)].min()
+
+    def argmin(self, tabu: bool) -> Tuple[int, float]:
+        """Returns the (non-)tabu variable with the lowest gain and its gain."""
+        block = int(self._minima[int(tabu)].argmin())
+        gains = self._blocks[int(tabu), block]
+        position = int(gains.argmin())
+        return block * self.block_size + position, float(gains[position])
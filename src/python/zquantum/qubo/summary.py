@@ -0,0 +1,192 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import heapq
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import dimod
+import numpy as np
+
+from .compiled_qubo import _BATCH_CHUNK_ENTRIES
+
+DEFAULT_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+class SampleSetSummary(NamedTuple):
+    """Result of `summarize_sampleset`.
+
+    Attributes:
+        lowest: distinct samples with the lowest energies, sorted by energy, with
+            total numbers of their occurrences.
+        energy_statistics: statistics of energies of all the samples, weighted by
+            their numbers of occurrences, with the following keys:
+            - num_reads: total number of occurrences of the samples,
+            - min, max, mean: minimal, maximal and mean energy,
+            - quantiles: list of pairs of a probability q and the lowest energy
+              which at least a fraction q of the samples doesn't exceed,
+            - histogram: dictionary with numbers of samples ("counts") with
+              energies in consecutive intervals with given boundaries
+              ("bin_edges").
+    """
+
+    lowest: dimod.SampleSet
+    energy_statistics: Dict[str, Any]
+
+
+def summarize_sampleset(
+    sampleset: Union[dimod.SampleSet, Iterable[dimod.SampleSet]],
+    num_lowest: int,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    num_bins: int = 20,
+) -> SampleSetSummary:
+    """Reduces samples to the lowest energy ones and energy statistics.
+
+    Samples are scanned in chunks and only the `num_lowest` distinct samples
+    with the lowest energies seen so far are kept, in a bounded heap. Samples
+    can be given as an iterable of samplesets, e.g. results of consecutive
+    calls of a solver, which is consumed lazily, so that only one of them has to
+    be kept in memory. Apart from the kept samples, only energies and numbers of
+    occurrences of all the samples are kept, for computing the statistics.
+
+    Args:
+        sampleset: a sampleset or an iterable of samplesets of the same model,
+            with the same variables and vartype. Samples don't need to be
+            aggregated.
+        num_lowest: number of distinct samples to keep.
+        quantiles: probabilities for which quantiles of energies are computed.
+        num_bins: number of bins of the histogram of energies.
+
+    Returns:
+        SampleSetSummary with the lowest energy samples and energy statistics.
+
+    Raises:
+        ValueError: if `num_lowest` is smaller than 1, no sampleset is given,
+            samplesets have different variables or vartypes, or any sample has
+            NaN energy.
+    """
+    if num_lowest < 1:
+        raise ValueError(f"num_lowest has to be at least 1, got {num_lowest}.")
+    samplesets = [sampleset] if isinstance(sampleset, dimod.SampleSet) else sampleset
+
+    variables: Optional[List[Hashable]] = None
+    vartype = None
+    # Negated energy, the sample as bytes and the position of the sample among
+    # all the samples, so that the root of the heap is the highest energy kept.
+    heap: List[Tuple[float, bytes, int]] = []
+    occurrences: Dict[bytes, int] = {}
+    energies, num_occurrences = [], []
+    num_samples = 0
+    for current in samplesets:
+        if variables is None:
+            variables, vartype = list(current.variables), current.vartype
+        elif current.vartype is not vartype or set(current.variables) != set(variables):
+            raise ValueError("Samplesets need to have the same variables and vartype.")
+        columns = [current.variables.index(v) for v in variables]
+        record = current.record
+        if np.isnan(record.energy).any():
+            raise ValueError("Energies of samples can't be NaN.")
+        energies.append(record.energy)
+        num_occurrences.append(record.num_occurrences)
+
+        chunk_size = max(1, _BATCH_CHUNK_ENTRIES // max(len(variables), 1))
+        for start in range(0, len(record), chunk_size):
+            chunk = record[start : start + chunk_size]
+            candidates = np.arange(len(chunk))
+            if len(heap) == num_lowest:
+                candidates = np.flatnonzero(chunk.energy <= -heap[0][0])
+            candidates = candidates[np.argsort(chunk.energy[candidates], kind="stable")]
+            # Values of samples are -1, 0 or 1, so they are stored as bytes.
+            candidate_samples = np.ascontiguousarray(
+                chunk.sample[candidates][:, columns], dtype=np.int8
+            )
+            for index, sample in zip(candidates.tolist(), candidate_samples):
+                energy = float(chunk.energy[index])
+                key = sample.tobytes()
+                if key in occurrences:
+                    occurrences[key] += int(chunk.num_occurrences[index])
+                    continue
+                if len(heap) == num_lowest:
+                    if energy > -heap[0][0]:
+                        # Candidates are sorted, so no further one can be kept.
+                        break
+                    if energy == -heap[0][0]:
+                        # Ties are resolved in favour of samples seen first, but
+                        # further candidates may be occurrences of kept samples.
+                        continue
+                    del occurrences[heapq.heappop(heap)[1]]
+                heapq.heappush(heap, (-energy, key, num_samples + start + index))
+                occurrences[key] = int(chunk.num_occurrences[index])
+        num_samples += len(record)
+
+    if variables is None:
+        raise ValueError("At least one sampleset has to be given.")
+
+    kept = sorted(heap, key=lambda item: (-item[0], item[2]))
+    lowest = dimod.SampleSet.from_samples(
+        (
+            np.array(
+                [np.frombuffer(key, dtype=np.int8) for _, key, _ in kept],
+                dtype=np.int8,
+            ).reshape(len(kept), len(variables)),
+            variables,
+        ),
+        vartype,
+        [-negative_energy for negative_energy, _, _ in kept],
+        num_occurrences=np.array(
+            [occurrences[key] for _, key, _ in kept], dtype=np.int64
+        ),
+    )
+    return SampleSetSummary(
+        lowest,
+        _energy_statistics(
+            np.concatenate(energies),
+            np.concatenate(num_occurrences),
+            quantiles,
+            num_bins,
+        ),
+    )
+
+
+def _energy_statistics(
+    energies: np.ndarray,
+    num_occurrences: np.ndarray,
+    quantiles: Sequence[float],
+    num_bins: int,
+) -> Dict[str, Any]:
+    num_reads = int(num_occurrences.sum())
+    if num_reads == 0:
+        return {"num_reads": 0}
+
+    order = np.argsort(energies, kind="stable")
+    sorted_energies = energies[order]
+    cumulative_occurrences = np.cumsum(num_occurrences[order])
+    quantile_positions = np.searchsorted(
+        cumulative_occurrences,
+        np.ceil(np.asarray(quantiles, dtype=float) * num_reads),
+    ).clip(0, len(energies) - 1)
+    counts, bin_edges = np.histogram(energies, bins=num_bins, weights=num_occurrences)
+    return {
+        "num_reads": num_reads,
+        "min": float(sorted_energies[0]),
+        "max": float(sorted_energies[-1]),
+        "mean": float(energies @ num_occurrences / num_reads),
+        "quantiles": [
+            [float(q), float(sorted_energies[position])]
+            for q, position in zip(quantiles, quantile_positions.tolist())
+        ],
+        "histogram": {
+            "counts": counts.astype(np.int64).tolist(),
+            "bin_edges": bin_edges.tolist(),
+        },
+    }
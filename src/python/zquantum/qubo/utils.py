@@ -1,10 +1,13 @@
 ################################################################################
-# © Copyright 2020-2021 Zapata Computing Inc.
+# © Copyright 2020-2022 Zapata Computing Inc.
 ################################################################################
-from typing import Tuple, Union
+from typing import Sequence, Tuple, Union
 
 import numpy as np
 from dimod import BinaryQuadraticModel
+from zquantum.core.measurement import Measurements
+
+from .compiled_qubo import compile_qubo
 
 
 def evaluate_bitstring_for_qubo(
@@ -20,3 +23,35 @@ def evaluate_bitstring_for_qubo(
         float: energy associated with a bistring
     """
     return qubo.energy({i: bit for i, bit in enumerate(map(int, bitstring))})
+
+
+def evaluate_bitstrings_for_qubo(
+    bitstrings: Union[np.ndarray, Sequence[Tuple[int, ...]], Measurements],
+    qubo: BinaryQuadraticModel,
+) -> np.ndarray:
+    """Returns energies associated with many bitstrings for a specific qubo.
+
+    This is a vectorized counterpart of `evaluate_bitstring_for_qubo`. As there,
+    the i-th bit of every bitstring is assigned to the variable labelled i, hence
+    the qubo has to be labelled with integers smaller than the bitstrings' length.
+
+    Args:
+        bitstrings: 2-D array of zeros and ones (e.g. of dtype uint8 or bool) with
+            one bitstring per row, sequence of such bitstrings or Measurements
+            object whose bitstrings should be evaluated.
+        qubo: qubo that we want to evaluate for.
+
+    Returns:
+        np.ndarray: 1-D array of energies, one for each bitstring.
+    """
+    if isinstance(bitstrings, Measurements):
+        bitstrings = bitstrings.bitstrings
+
+    samples = np.asarray(bitstrings)
+    if samples.ndim != 2:
+        raise ValueError(
+            f"Bitstrings should form a 2-D array, got array of shape {samples.shape}."
+        )
+
+    compiled = compile_qubo(qubo)
+    return compiled.energies(samples, compiled.bit_positions(samples.shape[1]))
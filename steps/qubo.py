@@ -53,6 +53,6 @@ def convert_measurements_to_sampleset(
     qubo = load_qubo(qubo)
     measurements = Measurements.load_from_file(measurements)
     sampleset = _convert_measurements_to_sampleset(
-        measurements, qubo, change_bitstring_convention
+        measurements, qubo, change_bitstring_convention, aggregate=True
     )
-    save_sampleset(sampleset.aggregate(), "sampleset.json")
+    save_sampleset(sampleset, "sampleset.json")
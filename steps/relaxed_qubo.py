@@ -8,7 +8,7 @@ from zquantum.core.utils import (
     save_list,
     save_value_estimate,
 )
-from zquantum.qubo import load_qubo
+from zquantum.qubo import convert_qubo_to_sparse_matrix, load_qubo
 from zquantum.qubo.convex_opt import (
     is_matrix_positive_semidefinite,
     solve_qp_problem_for_psd_matrix,
@@ -21,10 +21,12 @@ def solve_relaxed_qubo(
     optimizer_specs=None,
     number_of_trials=10,
     symmetrize_matrix=True,
+    number_of_workers=1,
+    seed=None,
 ):
     qubo = load_qubo(qubo)
 
-    qubo_matrix = qubo.to_numpy_matrix().astype(float)
+    qubo_matrix = convert_qubo_to_sparse_matrix(qubo).tocsr()
     if symmetrize_matrix:
         qubo_matrix = (qubo_matrix + qubo_matrix.T) / 2
 
@@ -40,7 +42,12 @@ def solve_relaxed_qubo(
             )
         optimizer = create_object(optimizer_specs)
         solution, optimal_value = solve_qp_problem_with_optimizer(
-            qubo_matrix, optimizer, number_of_trials, symmetrize_matrix
+            qubo_matrix,
+            optimizer,
+            number_of_trials,
+            symmetrize_matrix,
+            number_of_workers,
+            seed,
         )
 
     save_list(solution.tolist(), "solution.json")
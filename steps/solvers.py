@@ -3,21 +3,59 @@
 ################################################################################
 import json
 
+from dimod import SampleSet
 from zquantum.core.measurement import Measurements
 from zquantum.core.utils import ValueEstimate, create_object, save_value_estimate
-from zquantum.qubo import load_qubo, save_sampleset
+from zquantum.qubo import (
+    expand_sampleset,
+    load_qubo,
+    preprocess_bqm,
+    save_sampleset,
+    save_sampleset_summary,
+    summarize_sampleset,
+)
 from zquantum.qubo.utils import evaluate_bitstring_for_qubo
 
 
-def solve_qubo(qubo, solver_specs, solver_params=None):
+def solve_qubo(
+    qubo, solver_specs, solver_params=None, preprocess=False, num_lowest_states=None
+):
     """Solves qubo using any sampler implementing either dimod.Sampler
-    or zquantum.qubo.BQMSolver"""
+    or zquantum.qubo.BQMSolver
+
+    If preprocess is True, variables whose optimal values can be found by
+    zquantum.qubo.preprocess_bqm are fixed before sampling.
+
+    If num_lowest_states is given, instead of the whole sampleset only that many
+    distinct lowest energy samples are saved in sampleset.json, and they are also
+    saved, together with statistics of energies of all the samples, in
+    sampleset-summary.json, as computed by zquantum.qubo.summarize_sampleset.
+    This reduces the size of the outputs, but not the peak memory of the step,
+    as the solver still returns the whole sampleset at once."""
+    if num_lowest_states is not None and num_lowest_states < 1:
+        raise ValueError(
+            f"num_lowest_states has to be at least 1, got {num_lowest_states}."
+        )
     if solver_params is None:
         solver_params = {}
     solver = create_object(solver_specs)
     qubo = load_qubo(qubo)
 
-    sampleset = solver.sample(qubo, **solver_params)
+    if preprocess:
+        reduced_qubo, fixed_variables = preprocess_bqm(qubo)
+        if reduced_qubo.num_variables > 0:
+            reduced_sampleset = solver.sample(reduced_qubo, **solver_params)
+        else:
+            reduced_sampleset = SampleSet.from_samples(
+                [{}], reduced_qubo.vartype, reduced_qubo.offset
+            )
+        sampleset = expand_sampleset(reduced_sampleset, fixed_variables, qubo)
+    else:
+        sampleset = solver.sample(qubo, **solver_params)
+
+    if num_lowest_states is not None:
+        summary = summarize_sampleset(sampleset, num_lowest_states)
+        sampleset = summary.lowest
     best_sample_dict = sampleset.first.sample
     solution_bitstring = tuple(best_sample_dict[i] for i in sorted(best_sample_dict))
     lowest_energy = evaluate_bitstring_for_qubo(solution_bitstring, qubo)
@@ -25,3 +63,5 @@ def solve_qubo(qubo, solver_specs, solver_params=None):
     save_value_estimate(ValueEstimate(lowest_energy), "lowest-energy.json")
     Measurements([solution_bitstring]).save("solution.json")
     save_sampleset(sampleset, "sampleset.json")
+    if num_lowest_states is not None:
+        save_sampleset_summary(summary, "sampleset-summary.json")
@@ -0,0 +1,154 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import asyncio
+import itertools
+import os
+import threading
+import time
+from collections import defaultdict
+
+import dimod
+import pytest
+from zquantum.qubo.interfaces.bqm_solver import BQMSolver, solve_concurrently
+
+
+class CountingSolver(BQMSolver):
+    """Exact solver recording how many problems its instance solved."""
+
+    def __init__(self):
+        self.num_solved = 0
+
+    @property
+    def parameters(self):
+        return {"num_states": []}
+
+    @property
+    def properties(self):
+        return {}
+
+    def sample(self, bqm, num_states=1):
+        self.num_solved += 1
+        sampleset = dimod.ExactSolver().sample(bqm).truncate(num_states)
+        sampleset.info.update(num_solved=self.num_solved, pid=os.getpid())
+        return sampleset
+
+
+def bqms(count):
+    for seed in range(count):
+        yield dimod.generators.uniform(4, "SPIN", seed=seed)
+
+
+class TestSolveMany:
+    @pytest.mark.parametrize(
+        "number_of_workers,chunk_size", [(1, 1), (2, 1), (2, 3), (3, 10)]
+    )
+    def test_solves_all_problems(self, number_of_workers, chunk_size):
+        results = dict(
+            CountingSolver().solve_many(
+                bqms(10), number_of_workers=number_of_workers, chunk_size=chunk_size
+            )
+        )
+
+        assert sorted(results) == list(range(10))
+        for index, bqm in enumerate(bqms(10)):
+            assert results[index].first.energy == pytest.approx(
+                dimod.ExactSolver().sample(bqm).first.energy
+            )
+
+    def test_yields_results_in_order_when_using_single_worker(self):
+        indices = [index for index, _ in CountingSolver().solve_many(bqms(5))]
+
+        assert indices == list(range(5))
+
+    @pytest.mark.parametrize("number_of_workers", [1, 2])
+    def test_passes_parameters_to_sample(self, number_of_workers):
+        for _, sampleset in CountingSolver().solve_many(
+            bqms(3), number_of_workers=number_of_workers, num_states=3
+        ):
+            assert len(sampleset) == 3
+
+    def test_reuses_solver_within_worker(self):
+        solved_by_process = defaultdict(list)
+        for _, sampleset in CountingSolver().solve_many(
+            bqms(12), number_of_workers=2, chunk_size=2
+        ):
+            solved_by_process[sampleset.info["pid"]].append(
+                sampleset.info["num_solved"]
+            )
+
+        for counts in solved_by_process.values():
+            assert sorted(counts) == list(range(1, len(counts) + 1))
+
+    def test_consumes_problems_lazily(self):
+        results = CountingSolver().solve_many(
+            bqms(10 ** 9), number_of_workers=2, max_pending_chunks=2
+        )
+
+        assert len(list(itertools.islice(results, 5))) == 5
+        results.close()
+
+
+class SlowSolver(CountingSolver):
+    """Stand-in for a solver waiting for a remote service."""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def sample(self, bqm, num_states=1):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        return super().sample(bqm, num_states)
+
+
+class NativeAsyncSolver(CountingSolver):
+    async def solve_async(self, bqm, executor=None, **parameters):
+        await asyncio.sleep(0.01)
+        return self.sample(bqm, **parameters)
+
+
+class TestSolvingAsynchronously:
+    def test_solve_async_gives_same_result_as_sample(self):
+        bqm = dimod.generators.uniform(5, "BINARY", seed=1)
+        sampleset = asyncio.run(CountingSolver().solve_async(bqm, num_states=2))
+
+        assert sampleset.record.energy.tolist() == pytest.approx(
+            dimod.ExactSolver().sample(bqm).truncate(2).record.energy.tolist()
+        )
+
+    def test_solve_concurrently_returns_results_in_order(self):
+        problems = list(bqms(8))
+        samplesets = asyncio.run(solve_concurrently(CountingSolver(), problems))
+
+        assert [sampleset.first.energy for sampleset in samplesets] == [
+            dimod.ExactSolver().sample(bqm).first.energy for bqm in problems
+        ]
+
+    @pytest.mark.parametrize("max_concurrency", [1, 4])
+    def test_solve_concurrently_respects_concurrency_limit(self, max_concurrency):
+        solver = SlowSolver(delay=0.02)
+        asyncio.run(solve_concurrently(solver, bqms(8), max_concurrency))
+
+        assert solver.max_running == max_concurrency
+
+    def test_solve_concurrently_overlaps_waiting(self):
+        solver = SlowSolver(delay=0.2)
+        start_time = time.perf_counter()
+        asyncio.run(solve_concurrently(solver, bqms(10), max_concurrency=10))
+
+        assert time.perf_counter() - start_time < 1.0
+
+    def test_solve_concurrently_uses_overridden_solve_async(self):
+        samplesets = asyncio.run(
+            solve_concurrently(NativeAsyncSolver(), bqms(3), num_states=2)
+        )
+
+        assert [len(sampleset) for sampleset in samplesets] == [2, 2, 2]
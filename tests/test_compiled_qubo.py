@@ -0,0 +1,186 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import itertools
+
+import dimod
+import numpy as np
+import pytest
+from zquantum.qubo.compiled_qubo import (
+    CompiledQubo,
+    clear_compiled_qubo_cache,
+    compile_qubo,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_compiled_qubo_cache()
+    yield
+    clear_compiled_qubo_cache()
+
+
+def qubo():
+    return dimod.BinaryQuadraticModel(
+        {0: 1, 1: 2, 2: 3},
+        {(1, 2): 0.5, (1, 0): -0.25, (0, 2): 2.125},
+        -1,
+        vartype=dimod.BINARY,
+    )
+
+
+class TestCompiledQubo:
+    def test_couplings_are_stored_as_upper_triangular_csr_matrix(self):
+        compiled = CompiledQubo.from_bqm(qubo())
+
+        np.testing.assert_array_equal(compiled.indptr, [0, 2, 3, 3])
+        np.testing.assert_array_equal(compiled.indices, [1, 2, 2])
+        np.testing.assert_array_equal(compiled.data, [-0.25, 2.125, 0.5])
+
+    def test_linear_biases_offset_and_vartype_are_stored(self):
+        compiled = CompiledQubo.from_bqm(qubo())
+
+        np.testing.assert_array_equal(compiled.linear, [1, 2, 3])
+        assert compiled.offset == -1
+        assert compiled.vartype == dimod.BINARY
+
+    def test_variable_index_maps_labels_to_positions(self):
+        bqm = dimod.BinaryQuadraticModel({"b": 1, "a": 2}, {("a", "b"): 1}, 0, "SPIN")
+
+        compiled = CompiledQubo.from_bqm(bqm)
+
+        assert compiled.variable_index == {
+            label: i for i, label in enumerate(compiled.variables)
+        }
+        assert set(compiled.variables) == {"a", "b"}
+
+    @pytest.mark.parametrize("vartype", [dimod.BINARY, dimod.SPIN])
+    @pytest.mark.parametrize("density", [0.05, 1.0])
+    def test_energies_match_dimod_energies(self, vartype, density):
+        bqm = dimod.generators.gnp_random_bqm(30, density, vartype, random_state=7)
+        samples = np.random.default_rng(7).integers(0, 2, size=(50, 30))
+        if vartype == dimod.SPIN:
+            samples = 2 * samples - 1
+        compiled = CompiledQubo.from_bqm(bqm)
+
+        np.testing.assert_allclose(
+            compiled.energies(samples),
+            bqm.energies((samples, compiled.variables)),
+        )
+
+    def test_energies_can_be_computed_for_selected_columns(self):
+        compiled = CompiledQubo.from_bqm(qubo())
+        samples = np.array([[1, 0, 0, 1, 1], [0, 1, 1, 0, 0]])
+
+        energies = compiled.energies(samples, np.array([0, 3, 4]))
+
+        np.testing.assert_array_equal(
+            energies, [qubo().energy([1, 1, 1]), qubo().energy([0, 0, 0])]
+        )
+
+    def test_bit_positions_fail_for_non_integer_labels(self):
+        bqm = dimod.BinaryQuadraticModel({"a": 1}, {}, 0, "BINARY")
+
+        with pytest.raises(ValueError):
+            CompiledQubo.from_bqm(bqm).bit_positions(1)
+
+
+class TestCompilingQubo:
+    def test_compiling_the_same_qubo_twice_returns_cached_object(self):
+        bqm = qubo()
+
+        assert compile_qubo(bqm) is compile_qubo(bqm)
+
+    def test_equal_qubos_share_compiled_object(self):
+        assert compile_qubo(qubo()) is compile_qubo(qubo())
+
+    def test_modified_qubo_is_recompiled(self):
+        bqm = qubo()
+        compiled = compile_qubo(bqm)
+
+        bqm.add_linear(0, 1.0)
+
+        assert compile_qubo(bqm) is not compiled
+        assert compile_qubo(bqm).linear[0] == 2.0
+
+    def test_qubos_with_different_vartypes_are_compiled_separately(self):
+        bqm = qubo()
+
+        assert compile_qubo(bqm) is not compile_qubo(
+            dimod.BinaryQuadraticModel(bqm.linear, bqm.quadratic, bqm.offset, "SPIN")
+        )
+
+    @pytest.mark.parametrize(
+        "modify",
+        [
+            lambda bqm: bqm.set_quadratic(0, 1, 5.0),
+            lambda bqm: bqm.set_linear(2, 3.5),
+            lambda bqm: setattr(bqm, "offset", 4.0),
+            lambda bqm: bqm.relabel_variables({0: "a"}),
+            lambda bqm: bqm.change_vartype("SPIN"),
+        ],
+    )
+    def test_qubo_modified_in_place_is_recompiled(self, modify):
+        bqm = qubo()
+        compiled = compile_qubo(bqm)
+
+        modify(bqm)
+
+        assert compile_qubo(bqm) is not compiled
+        assert compile_qubo(bqm).energies(
+            np.ones((1, 3), dtype=np.int8)
+        ) == pytest.approx([bqm.energy(dict.fromkeys(bqm.variables, 1))])
+
+    @pytest.mark.parametrize(
+        "modify",
+        [
+            # Leave the energy of many states, e.g. of all ones, unchanged.
+            lambda bqm: (bqm.add_linear(0, 1.0), bqm.add_linear(1, -1.0)),
+            lambda bqm: (bqm.add_quadratic(0, 1, 1.0), bqm.add_linear(2, -1.0)),
+        ],
+    )
+    def test_modifications_cancelling_out_for_some_states_are_detected(self, modify):
+        bqm = qubo()
+        compile_qubo(bqm)
+
+        modify(bqm)
+
+        samples = np.array(list(itertools.product([0, 1], repeat=3)), dtype=np.int8)
+        np.testing.assert_allclose(
+            compile_qubo(bqm).energies(samples), bqm.energies((samples, range(3)))
+        )
+
+    def test_least_recently_used_qubos_are_evicted(self, monkeypatch):
+        monkeypatch.setattr("zquantum.qubo.compiled_qubo._CACHE_SIZE", 2)
+        first, second, third = (
+            dimod.BinaryQuadraticModel({0: i}, {}, 0, "BINARY") for i in range(3)
+        )
+        compiled_first = compile_qubo(first)
+        compile_qubo(second)
+        compile_qubo(third)
+
+        assert compile_qubo(first) is not compiled_first
+
+
+def test_adjacency_is_symmetric_coupling_matrix():
+    bqm = dimod.BinaryQuadraticModel(
+        {0: 1, 1: -1, 2: 0.5}, {(0, 1): 2, (2, 1): -3}, 0, "BINARY"
+    )
+    adjacency = CompiledQubo.from_bqm(bqm).adjacency
+
+    np.testing.assert_array_equal(
+        adjacency.toarray(), [[0, 2, 0], [2, 0, -3], [0, -3, 0]]
+    )
+
+
+def test_permuted_model_gives_same_energies():
+    bqm = dimod.generators.uniform(6, "SPIN", seed=11)
+    compiled = CompiledQubo.from_bqm(bqm)
+    order = [3, 0, 5, 1, 4, 2]
+    permuted = compiled.permuted(order)
+    samples = np.random.default_rng(11).choice([-1, 1], size=(10, 6))
+
+    assert permuted.variables == tuple(compiled.variables[i] for i in order)
+    np.testing.assert_allclose(
+        permuted.energies(samples[:, order]), compiled.energies(samples)
+    )
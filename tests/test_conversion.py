@@ -6,9 +6,11 @@ import numpy as np
 import pytest
 from zquantum.core.openfermion.ops.operators.ising_operator import IsingOperator
 from zquantum.qubo.conversions import (
+    convert_counts_to_sampleset,
     convert_measurements_to_sampleset,
     convert_openfermion_ising_to_qubo,
     convert_qubo_to_openfermion_ising,
+    convert_qubo_to_sparse_matrix,
     convert_sampleset_to_measurements,
 )
 
@@ -50,6 +52,20 @@ def test_qubo_conversion_with_non_binary_fractions():
         assert np.isclose(qubo.quadratic[key], new_qubo.quadratic[key])
 
 
+def test_qubo_conversion_gives_the_same_coefficients_as_parsing_ising_string():
+    qubo = dimod.generators.gnp_random_bqm(20, 0.5, "BINARY", random_state=5)
+    linear_coeffs, quadratic_coeffs, offset = qubo.to_ising()
+    ising_string = " + ".join(
+        [f"{offset}[]"]
+        + [f"{-value}[Z{i}]" for i, value in linear_coeffs.items()]
+        + [f"{value}[Z{i} Z{j}]" for (i, j), value in quadratic_coeffs.items()]
+    )
+
+    ising = convert_qubo_to_openfermion_ising(qubo)
+
+    assert ising.terms == IsingOperator(ising_string).terms
+
+
 def test_converted_ising_evaluates_to_the_same_energy_as_original_qubo():
     qubo = dimod.BinaryQuadraticModel(
         {0: 1, 1: 2, 2: 3},
@@ -288,3 +304,125 @@ def test_convert_measurements_to_sampleset_with_qubo():
     target_sampleset = dimod.SampleSet.from_samples(bitstrings, dimod.BINARY, energies)
     converted_sampleset = convert_measurements_to_sampleset(measurements, qubo)
     assert target_sampleset == converted_sampleset
+
+
+@pytest.mark.parametrize("change_bitstring_convention", [False, True])
+def test_converting_measurements_to_sampleset_and_back_preserves_bitstrings(
+    change_bitstring_convention,
+):
+    bitstrings = [
+        tuple(bitstring)
+        for bitstring in np.random.default_rng(3).integers(0, 2, size=(1000, 12))
+    ]
+    measurements = Measurements(bitstrings)
+
+    sampleset = convert_measurements_to_sampleset(
+        measurements, change_bitstring_convention=change_bitstring_convention
+    )
+    converted_measurements = convert_sampleset_to_measurements(
+        sampleset, change_bitstring_convention=change_bitstring_convention
+    )
+
+    assert converted_measurements.bitstrings == bitstrings
+
+
+def _assert_samplesets_equal_up_to_order(sampleset, target_sampleset):
+    def sorted_record(sampleset):
+        record = sampleset.record
+        order = np.lexsort(record.sample.T[::-1])
+        return record.sample[order], record.energy[order], record.num_occurrences[order]
+
+    samples, energies, num_occurrences = sorted_record(sampleset)
+    target_samples, target_energies, target_num_occurrences = sorted_record(
+        target_sampleset
+    )
+
+    assert sampleset.vartype == target_sampleset.vartype
+    np.testing.assert_array_equal(samples, target_samples)
+    np.testing.assert_allclose(energies, target_energies)
+    np.testing.assert_array_equal(num_occurrences, target_num_occurrences)
+
+
+@pytest.mark.parametrize("num_bits", [3, 70])
+@pytest.mark.parametrize("change_bitstring_convention", [False, True])
+def test_aggregated_measurements_conversion_matches_aggregated_sampleset(
+    num_bits, change_bitstring_convention
+):
+    bitstrings = [
+        tuple(bitstring)
+        for bitstring in np.random.default_rng(11).integers(0, 2, size=(200, num_bits))
+    ]
+    bitstrings += bitstrings[:50]
+    qubo = dimod.generators.gnp_random_bqm(num_bits, 0.5, "BINARY", random_state=11)
+    measurements = Measurements(bitstrings)
+
+    sampleset = convert_measurements_to_sampleset(
+        measurements, qubo, change_bitstring_convention, aggregate=True
+    )
+    target_sampleset = convert_measurements_to_sampleset(
+        measurements, qubo, change_bitstring_convention
+    ).aggregate()
+
+    assert len(sampleset) == len(target_sampleset)
+    _assert_samplesets_equal_up_to_order(sampleset, target_sampleset)
+
+
+@pytest.mark.parametrize("change_bitstring_convention", [False, True])
+def test_convert_counts_to_sampleset_with_qubo(change_bitstring_convention):
+    counts = {"000": 3, "011": 1, "110": 5}
+    qubo = dimod.BinaryQuadraticModel(
+        {0: 1, 1: 2, 2: 3},
+        {(1, 2): 0.5, (1, 0): -0.25, (0, 2): 2.125},
+        0,
+        vartype=dimod.BINARY,
+    )
+    measurements = Measurements(
+        [
+            tuple(int(bit) for bit in bitstring)
+            for bitstring, count in counts.items()
+            for _ in range(count)
+        ]
+    )
+
+    sampleset = convert_counts_to_sampleset(counts, qubo, change_bitstring_convention)
+    target_sampleset = convert_measurements_to_sampleset(
+        measurements, qubo, change_bitstring_convention
+    ).aggregate()
+
+    _assert_samplesets_equal_up_to_order(sampleset, target_sampleset)
+
+
+def test_convert_counts_to_sampleset_without_qubo():
+    counts = {"01": 2, "10": 7}
+
+    sampleset = convert_counts_to_sampleset(counts)
+
+    assert sampleset.vartype == dimod.BINARY
+    np.testing.assert_array_equal(sampleset.record.sample, [[0, 1], [1, 0]])
+    np.testing.assert_array_equal(sampleset.record.num_occurrences, [2, 7])
+    assert np.isnan(sampleset.record.energy).all()
+
+
+@pytest.mark.parametrize(
+    "qubo",
+    [
+        dimod.BinaryQuadraticModel(
+            {0: 1, 1: 2, 2: 3},
+            {(1, 2): 0.5, (1, 0): -0.25, (0, 2): 2.125},
+            -1,
+            vartype=dimod.BINARY,
+        ),
+        dimod.BinaryQuadraticModel(
+            {2: 1.5, 0: -2, 1: 0}, {(2, 0): 0.5}, 3, vartype=dimod.BINARY
+        ),
+        dimod.generators.gnp_random_bqm(30, 0.2, "BINARY", random_state=1),
+    ],
+)
+def test_convert_qubo_to_sparse_matrix_matches_dense_matrix(qubo):
+    linear, (rows, cols, biases), _ = qubo.to_numpy_vectors(sorted(qubo.variables))
+    dense_matrix = np.diag(linear)
+    dense_matrix[np.minimum(rows, cols), np.maximum(rows, cols)] = biases
+
+    matrix = convert_qubo_to_sparse_matrix(qubo)
+
+    np.testing.assert_array_equal(matrix.toarray(), dense_matrix)
@@ -3,10 +3,18 @@
 ################################################################################
 import numpy as np
 import pytest
+from scipy import sparse
+from scipy.optimize import OptimizeResult
+from scipy.sparse.csgraph import laplacian
+from scipy.sparse.linalg import ArpackNoConvergence, eigsh
+from zquantum.core.interfaces.functions import CallableWithGradient
 from zquantum.core.interfaces.mock_objects import MockOptimizer
+from zquantum.qubo import convex_opt
 from zquantum.qubo.convex_opt import (
+    _QuadraticCostFunction,
     _WithConstraints,
     is_matrix_positive_semidefinite,
+    run_qp_trials_with_optimizer,
     solve_qp_problem_for_psd_matrix,
     solve_qp_problem_with_optimizer,
 )
@@ -16,6 +24,34 @@ class MockConstrainedOptimizer(MockOptimizer):
     constraints = None
 
 
+class InitialPointConstrainedOptimizer(MockOptimizer):
+    """Deterministic optimizer returning the initial point as the solution."""
+
+    constraints = None
+
+    def _minimize(self, cost_function, initial_params, keep_history=False):
+        return OptimizeResult(
+            opt_value=cost_function(initial_params),
+            opt_params=initial_params,
+            nfev=1,
+        )
+
+
+class GradientDescentConstrainedOptimizer(MockOptimizer):
+    """Projected gradient descent requiring cost function with gradient."""
+
+    constraints = None
+
+    def _minimize(self, cost_function, initial_params, keep_history=False):
+        assert isinstance(cost_function, CallableWithGradient)
+        params = initial_params
+        for _ in range(100):
+            params = np.clip(params - 0.01 * cost_function.gradient(params), 0, 1)
+        return OptimizeResult(
+            opt_value=cost_function(params), opt_params=params, nfev=100
+        )
+
+
 @pytest.fixture
 def optimizer():
     optimizer = MockConstrainedOptimizer()
@@ -30,6 +66,12 @@ def non_psd_matrix():
     return np.array([[-10, 1, 2], [0, -12, 2], [0, 0, -14]])
 
 
+def path_laplacian(size):
+    """Singular PSD matrix with eigenvalues clustered around zero."""
+    path = sparse.diags([np.ones(size - 1)], [1], shape=(size, size))
+    return laplacian(path + path.T)
+
+
 @pytest.mark.parametrize("matrix", [psd_matrix()])
 def test_solve_qp_problem_for_psd_matrix(matrix):
     target_solution = np.array([0, 0, 0])
@@ -67,3 +109,306 @@ def test_solve_qp_problem_with_optimizer_throws_error_when_optimizer_does_not_su
 )
 def test_is_matrix_positive_semidefinite(matrix, expected):
     assert is_matrix_positive_semidefinite(matrix) == expected
+
+
+class TestRunningQPTrialsWithOptimizer:
+    @pytest.mark.parametrize("matrix", [psd_matrix(), non_psd_matrix()])
+    def test_best_trial_is_returned(self, matrix):
+        result = run_qp_trials_with_optimizer(
+            matrix, InitialPointConstrainedOptimizer(), number_of_trials=20, seed=5
+        )
+
+        assert len(result.trial_values) == 20
+        assert result.optimal_value == min(result.trial_values)
+        assert result.optimal_value == result.trial_values[result.best_trial]
+        assert result.trial_nfevs == [1] * 20
+
+    def test_trials_are_reproducible_with_seed(self):
+        first_result, second_result = (
+            run_qp_trials_with_optimizer(
+                non_psd_matrix(),
+                InitialPointConstrainedOptimizer(),
+                number_of_trials=5,
+                seed=42,
+            )
+            for _ in range(2)
+        )
+
+        np.testing.assert_array_equal(
+            first_result.trial_values, second_result.trial_values
+        )
+
+    def test_results_do_not_depend_on_number_of_workers(self):
+        sequential_result, parallel_result = (
+            run_qp_trials_with_optimizer(
+                non_psd_matrix(),
+                InitialPointConstrainedOptimizer(),
+                number_of_trials=8,
+                number_of_workers=number_of_workers,
+                seed=42,
+            )
+            for number_of_workers in (1, 2)
+        )
+
+        np.testing.assert_array_equal(
+            sequential_result.trial_values, parallel_result.trial_values
+        )
+        np.testing.assert_array_equal(
+            sequential_result.solution, parallel_result.solution
+        )
+
+    def test_solve_qp_problem_with_optimizer_returns_best_trial(self):
+        result = run_qp_trials_with_optimizer(
+            non_psd_matrix(),
+            InitialPointConstrainedOptimizer(),
+            number_of_trials=5,
+            seed=3,
+        )
+
+        solution, optimal_value = solve_qp_problem_with_optimizer(
+            non_psd_matrix(),
+            InitialPointConstrainedOptimizer(),
+            number_of_trials=5,
+            seed=3,
+        )
+
+        np.testing.assert_array_equal(solution, result.solution)
+        assert optimal_value == result.optimal_value
+
+
+class TestQuadraticCostFunction:
+    @pytest.mark.parametrize("matrix", [psd_matrix(), non_psd_matrix()])
+    def test_gradient_matches_finite_differences(self, matrix):
+        cost_function = _QuadraticCostFunction(matrix)
+        x = np.array([0.2, 0.7, 0.4])
+        epsilon = 1e-6
+
+        finite_differences = [
+            (cost_function(x + epsilon * e) - cost_function(x - epsilon * e))
+            / (2 * epsilon)
+            for e in np.eye(3)
+        ]
+
+        np.testing.assert_allclose(cost_function.gradient(x), finite_differences)
+
+    def test_gradient_is_available_to_optimizer(self):
+        solution, optimal_value = solve_qp_problem_with_optimizer(
+            non_psd_matrix(), GradientDescentConstrainedOptimizer(), seed=1
+        )
+
+        np.testing.assert_allclose(solution, [1, 1, 1])
+        assert optimal_value == pytest.approx(non_psd_matrix().sum())
+
+
+class TestCheckingPositiveSemidefiniteness:
+    def test_matrix_with_zero_eigenvalue_is_positive_semidefinite(self):
+        vector = np.array([[1.0, 2.0, 3.0]]) / 7
+        matrix = vector.T @ vector
+
+        assert is_matrix_positive_semidefinite(matrix)
+
+    def test_only_symmetric_part_of_matrix_is_checked(self):
+        # Eigenvalues of this matrix are 1 and 1, but x^T M x < 0 for x = (1, -1)
+        matrix = np.array([[1.0, 4.0], [0.0, 1.0]])
+
+        assert not is_matrix_positive_semidefinite(matrix)
+
+    @pytest.mark.parametrize("shift,expected", [(0.1, True), (-0.1, False)])
+    def test_sparse_matrices_can_be_checked(self, shift, expected):
+        factor = sparse.random(300, 300, density=0.01, random_state=2)
+        graph_laplacian = laplacian(factor + factor.T)
+
+        assert (
+            is_matrix_positive_semidefinite(
+                graph_laplacian + shift * sparse.identity(300, format="csr")
+            )
+            == expected
+        )
+
+    @pytest.mark.parametrize(
+        "matrix,expected",
+        [
+            (path_laplacian(300), True),
+            (path_laplacian(300) - 0.1 * sparse.identity(300), False),
+            # Indefinite, even though its diagonal is non-negative.
+            (path_laplacian(300) - sparse.diags([1.0], [0], shape=(300, 300)), False),
+        ],
+    )
+    def test_sparse_matrix_is_factorized_if_eigenvalue_estimate_does_not_converge(
+        self, monkeypatch, matrix, expected
+    ):
+        failures = []
+
+        def eigsh_with_too_few_iterations(*args, **kwargs):
+            try:
+                return eigsh(*args, **kwargs, maxiter=1)
+            except ArpackNoConvergence:
+                failures.append(args)
+                raise
+
+        monkeypatch.setattr(convex_opt, "eigsh", eigsh_with_too_few_iterations)
+
+        assert is_matrix_positive_semidefinite(matrix.tocsr()) == expected
+        assert len(failures) == 1
+
+    def test_verdict_for_the_same_matrix_is_computed_once(self, monkeypatch):
+        calls = []
+        check = convex_opt._check_positive_semidefinite
+        monkeypatch.setattr(
+            convex_opt,
+            "_check_positive_semidefinite",
+            lambda *args: calls.append(args) or check(*args),
+        )
+        matrix = np.random.default_rng(8).normal(size=(10, 10))
+
+        first_verdict = is_matrix_positive_semidefinite(matrix)
+        second_verdict = is_matrix_positive_semidefinite(matrix.copy())
+
+        assert first_verdict == second_verdict
+        assert len(calls) == 1
+
+
+class TestSolvingQPProblemsWithSparseMatrices:
+    @pytest.mark.parametrize("matrix", [psd_matrix()])
+    def test_solve_qp_problem_for_sparse_psd_matrix(self, matrix):
+        solution, optimal_value = solve_qp_problem_for_psd_matrix(
+            sparse.csr_matrix(matrix)
+        )
+
+        assert pytest.approx(optimal_value) == 0
+        assert np.allclose(solution, [0, 0, 0])
+
+    def test_sparse_matrix_gives_the_same_result_as_dense_one(self):
+        dense_result, sparse_result = (
+            run_qp_trials_with_optimizer(
+                matrix,
+                InitialPointConstrainedOptimizer(),
+                number_of_trials=5,
+                seed=9,
+            )
+            for matrix in (non_psd_matrix(), sparse.csr_matrix(non_psd_matrix()))
+        )
+
+        np.testing.assert_allclose(
+            dense_result.trial_values, sparse_result.trial_values
+        )
+        np.testing.assert_array_equal(dense_result.solution, sparse_result.solution)
+
+    @pytest.mark.parametrize(
+        "method, expected_sparse", [("trust-constr", True), ("COBYLA", False)]
+    )
+    def test_constraints_are_sparse_only_for_methods_supporting_them(
+        self, method, expected_sparse
+    ):
+        optimizer = InitialPointConstrainedOptimizer()
+        optimizer.method = method
+
+        solve_qp_problem_with_optimizer(sparse.csr_matrix(non_psd_matrix()), optimizer)
+
+        assert sparse.issparse(optimizer.constraints.A) == expected_sparse
+
+    def test_bounds_are_used_for_large_sparse_matrix(self, monkeypatch):
+        def fail_to_build_dense_identity(*args, **kwargs):
+            raise AssertionError("Dense identity should not be built.")
+
+        monkeypatch.setattr(convex_opt.np, "eye", fail_to_build_dense_identity)
+        size = 20000
+        optimizer = InitialPointConstrainedOptimizer()
+        optimizer.bounds = None
+
+        run_qp_trials_with_optimizer(
+            -sparse.identity(size, format="csr"), optimizer, seed=1
+        )
+
+        assert optimizer.constraints == ()
+        np.testing.assert_array_equal(optimizer.bounds.lb, np.zeros(size))
+        np.testing.assert_array_equal(optimizer.bounds.ub, np.ones(size))
+
+    def test_raises_error_if_large_sparse_matrix_needs_dense_constraints(self):
+        optimizer = InitialPointConstrainedOptimizer()
+        optimizer.method = "COBYLA"
+
+        with pytest.raises(ValueError, match="dense 20000x20000"):
+            run_qp_trials_with_optimizer(
+                -sparse.identity(20000, format="csr"), optimizer
+            )
+
+
+class TestPSDQPSolver:
+    def test_matches_solve_qp_problem_for_psd_matrix(self):
+        solver = convex_opt.PSDQPSolver()
+        for matrix in [
+            np.array([[2, 1], [1, 2]]),
+            np.array([[1, -1], [-1, 1]]),
+            np.array([[3, 0, 1], [0, 2, 0], [1, 0, 1]]),
+        ]:
+            expected_solution, expected_value = solve_qp_problem_for_psd_matrix(matrix)
+            solution, value = solver.solve(matrix)
+            np.testing.assert_allclose(solution, expected_solution, atol=1e-6)
+            assert value == pytest.approx(expected_value, abs=1e-6)
+
+    def test_reuses_problem_compiled_for_given_size(self):
+        solver = convex_opt.PSDQPSolver()
+        solver.solve(np.array([[2, 1], [1, 2]]))
+        solver.solve(np.array([[1, 0], [0, 1]]))
+        solver.solve(np.eye(3))
+
+        assert [timing.compiled for timing in solver.timings] == [True, False, True]
+        assert [timing.size for timing in solver.timings] == [2, 2, 3]
+
+    def test_evicts_least_recently_used_sizes(self):
+        solver = convex_opt.PSDQPSolver(max_cached_sizes=1)
+        solver.solve(np.eye(2))
+        solver.solve(np.eye(3))
+        solver.solve(np.eye(2))
+
+        assert [timing.compiled for timing in solver.timings] == [True, True, True]
+
+    def test_warm_starts_from_problem_of_nearby_matrix(self):
+        solver = convex_opt.PSDQPSolver()
+        matrix = np.array([[3, 0, 1], [0, 2, 0], [1, 0, 1]], dtype=float)
+        solver.solve(matrix)
+        problem = solver._problems[3][0]
+
+        nearby_matrix = matrix + 0.01 * np.eye(3)
+        expected_solution, expected_value = solve_qp_problem_for_psd_matrix(
+            nearby_matrix
+        )
+        solution, value = solver.solve(nearby_matrix)
+
+        assert solver._problems[3][0] is problem
+        assert not solver.timings[-1].compiled
+        np.testing.assert_allclose(solution, expected_solution, atol=1e-6)
+        assert value == pytest.approx(expected_value, abs=1e-6)
+
+    def test_keeps_timings_of_most_recent_solves(self):
+        solver = convex_opt.PSDQPSolver(max_recorded_timings=2)
+        for size in [2, 3, 4]:
+            solver.solve(np.eye(size))
+
+        assert [timing.size for timing in solver.timings] == [3, 4]
+
+    @pytest.mark.parametrize(
+        "matrix",
+        [
+            np.array([[2, 1], [1, 2]]),
+            laplacian(np.ones((4, 4)) - np.eye(4)),
+            np.outer([1, 2, 3], [1, 2, 3]),
+            np.zeros((0, 0)),
+        ],
+    )
+    def test_factor_reproduces_definite_and_singular_matrices(self, matrix):
+        factor = convex_opt._psd_factor(matrix)
+
+        assert factor.shape == matrix.shape
+        np.testing.assert_allclose(factor.T @ factor, matrix, atol=1e-10)
+
+    def test_accepts_sparse_matrices(self):
+        solution, value = convex_opt.PSDQPSolver().solve(
+            sparse.csr_matrix(np.array([[2, 1], [1, 2]]))
+        )
+        np.testing.assert_allclose(solution, [0, 0], atol=1e-6)
+
+    def test_raises_error_for_non_psd_matrix(self):
+        with pytest.raises(ValueError):
+            convex_opt.PSDQPSolver().solve(np.array([[1, 2], [2, 1]]))
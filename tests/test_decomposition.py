@@ -0,0 +1,105 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import dimod
+import pytest
+from zquantum.qubo.decomposition import connected_components, solve_by_components
+from zquantum.qubo.interfaces.bqm_solver import BQMSolver
+from zquantum.qubo.solvers import GrayCodeExactSolver
+
+
+def block_bqm(vartype):
+    """Model with components {a, b, c}, {d, e}, {f} and {g}."""
+    return dimod.BinaryQuadraticModel(
+        {"a": 1.5, "b": -2, "c": 0.5, "d": 1.5, "e": -1, "f": -0.5, "g": 2},
+        {("a", "b"): -1, ("c", "b"): 2, ("d", "e"): -3},
+        0.25,
+        vartype,
+    )
+
+
+class RecordingSolver(BQMSolver):
+    """Exact solver recording parameters of every call to `sample`."""
+
+    def __init__(self):
+        self.calls = []
+
+    @property
+    def parameters(self):
+        return {"num_states": []}
+
+    @property
+    def properties(self):
+        return {}
+
+    def sample(self, bqm, **parameters):
+        self.calls.append(parameters)
+        return dimod.ExactSolver().sample(bqm).truncate(parameters["num_states"])
+
+
+def test_connected_components_of_block_model():
+    assert connected_components(block_bqm("BINARY")) == [
+        ["a", "b", "c"],
+        ["d", "e"],
+        ["f"],
+        ["g"],
+    ]
+
+
+def test_connected_components_of_chain_in_reversed_order():
+    bqm = dimod.BinaryQuadraticModel(
+        {}, {(i, i + 1): 1.0 for i in reversed(range(10))}, 0, "SPIN"
+    )
+
+    assert [sorted(component) for component in connected_components(bqm)] == [
+        list(range(11))
+    ]
+
+
+def test_connected_components_of_model_without_variables():
+    assert connected_components(dimod.BinaryQuadraticModel("SPIN")) == []
+
+
+class TestSolvingByComponents:
+    @pytest.mark.parametrize("vartype", ["BINARY", "SPIN"])
+    @pytest.mark.parametrize("number_of_workers", [1, 2])
+    def test_finds_ground_state_of_block_model(self, vartype, number_of_workers):
+        bqm = block_bqm(vartype)
+        sampleset = solve_by_components(
+            bqm, GrayCodeExactSolver(), number_of_workers=number_of_workers
+        )
+        expected = dimod.ExactSolver().sample(bqm).first
+
+        assert sampleset.first.sample == expected.sample
+        assert sampleset.first.energy == pytest.approx(expected.energy)
+        assert sampleset.info["num_components"] == 4
+
+    def test_finds_ground_state_of_random_block_model(self):
+        bqm = dimod.BinaryQuadraticModel("SPIN")
+        for block in range(4):
+            block_bqm = dimod.generators.uniform(4, "SPIN", seed=block)
+            bqm.update(
+                block_bqm.relabel_variables({v: (block, v) for v in range(4)}, False)
+            )
+        sampleset = solve_by_components(bqm, GrayCodeExactSolver())
+
+        assert sampleset.first.energy == pytest.approx(
+            dimod.ExactSolver().sample(bqm).first.energy
+        )
+
+    def test_passes_parameters_to_solver(self):
+        solver = RecordingSolver()
+        solve_by_components(
+            block_bqm("BINARY"), solver, max_enumerated_size=0, num_states=3
+        )
+
+        assert solver.calls == [{"num_states": 3}] * 4
+
+    @pytest.mark.parametrize("max_enumerated_size", [0, 3, 8])
+    def test_gives_same_result_regardless_of_enumerated_size(self, max_enumerated_size):
+        bqm = block_bqm("SPIN")
+        sampleset = solve_by_components(
+            bqm, GrayCodeExactSolver(), max_enumerated_size=max_enumerated_size
+        )
+
+        assert sampleset.first.sample == dimod.ExactSolver().sample(bqm).first.sample
@@ -0,0 +1,67 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import dimod
+import numpy as np
+import pytest
+from zquantum.qubo.compiled_qubo import compile_qubo
+from zquantum.qubo.interfaces.bqm_solver_test import BQMSolverTests
+from zquantum.qubo.solvers import GrayCodeExactSolver
+from zquantum.qubo.solvers.exact import compiled_binary
+
+
+class TestGrayCodeExactSolver(BQMSolverTests):
+    @pytest.fixture
+    def solver(self):
+        return GrayCodeExactSolver()
+
+    @pytest.mark.parametrize("vartype", ["BINARY", "SPIN"])
+    @pytest.mark.parametrize(
+        "num_variables,block_size", [(3, 16), (8, 3), (16, 4), (9, 9)]
+    )
+    def test_finds_lowest_energy_states(
+        self, solver, vartype, num_variables, block_size
+    ):
+        bqm = dimod.generators.gnp_random_bqm(
+            num_variables, 0.6, vartype, random_state=num_variables
+        )
+        sampleset = solver.sample(bqm, num_states=7, block_size=block_size)
+        expected_energies = np.sort(dimod.ExactSolver().sample(bqm).record.energy)
+
+        np.testing.assert_allclose(sampleset.record.energy, expected_energies[:7])
+        assert len({tuple(sample) for sample in sampleset.record.sample}) == 7
+
+    def test_returns_all_states_if_there_are_fewer_than_requested(self, solver):
+        bqm = dimod.generators.uniform(3, "SPIN", seed=3)
+
+        assert len(solver.sample(bqm, num_states=100)) == 8
+
+    def test_gives_same_result_when_split_between_processes(self, solver):
+        bqm = dimod.generators.uniform(10, "BINARY", seed=3)
+        expected = solver.sample(bqm, num_states=4, block_size=4)
+        actual = solver.sample(bqm, num_states=4, block_size=4, number_of_workers=2)
+
+        np.testing.assert_array_equal(actual.record.sample, expected.record.sample)
+        np.testing.assert_allclose(actual.record.energy, expected.record.energy)
+
+    def test_handles_bqm_without_variables(self, solver):
+        bqm = dimod.BinaryQuadraticModel({}, {}, 1.5, "SPIN")
+
+        np.testing.assert_array_equal(solver.sample(bqm).record.energy, [1.5])
+
+    @pytest.mark.parametrize("num_states", [0, -1])
+    def test_raises_error_for_non_positive_num_states(self, solver, num_states):
+        bqm = dimod.generators.uniform(3, "SPIN", seed=1)
+
+        with pytest.raises(ValueError):
+            solver.sample(bqm, num_states=num_states)
+
+
+def test_compiled_binary_model_has_the_same_energies_as_spin_model():
+    bqm = dimod.generators.uniform(6, "SPIN", seed=13)
+    compiled = compile_qubo(bqm)
+    spins = np.random.default_rng(13).choice([-1, 1], size=(20, 6))
+
+    np.testing.assert_allclose(
+        compiled_binary(compiled).energies((spins + 1) // 2), compiled.energies(spins)
+    )
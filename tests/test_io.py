@@ -1,7 +1,9 @@
 ################################################################################
 # © Copyright 2021 Zapata Computing Inc.
 ################################################################################
-from io import StringIO
+import json
+import os
+from io import BytesIO, StringIO
 
 import dimod
 import numpy as np
@@ -11,9 +13,12 @@ from zquantum.qubo.io import (
     bqm_to_serializable,
     load_qubo,
     load_sampleset,
+    load_sampleset_summary,
     save_qubo,
     save_sampleset,
+    save_sampleset_summary,
 )
+from zquantum.qubo.summary import summarize_sampleset
 
 
 class TestConvertingBQMToSerializable:
@@ -133,6 +138,81 @@ class TestConstructingBQMFromSerializable:
         assert bqm.vartype == expected_bqm_vartype
 
 
+class TestSerializationOfQubosWithIntegerLabels:
+    @pytest.mark.parametrize(
+        "bqm",
+        [
+            dimod.generators.gnp_random_bqm(50, 0.3, "BINARY", random_state=4),
+            dimod.BinaryQuadraticModel(
+                {2: 0.5, 0: -2.0, 1: 3}, {(2, 1): 0.5, (1, 0): 0.4}, 1, "SPIN"
+            ),
+            dimod.BinaryQuadraticModel({0: 1.0, 1: 2.0}, {}, 0, "BINARY"),
+        ],
+    )
+    def test_serialized_bqm_can_be_restored(self, bqm):
+        serializable = json.loads(json.dumps(bqm_to_serializable(bqm)))
+
+        assert bqm_from_serializable(serializable) == bqm
+
+    def test_quadratic_coefficients_are_stored_with_sorted_labels(self):
+        bqm = dimod.BinaryQuadraticModel(
+            {0: 1, 1: 2, 2: 3}, {(2, 1): 0.5, (1, 0): 0.7, (2, 0): 0.9}, 0, "BINARY"
+        )
+
+        serializable = bqm_to_serializable(bqm)
+
+        assert set(serializable["quadratic"]) == {
+            (1, 2, 0.5),
+            (0, 1, 0.7),
+            (0, 2, 0.9),
+        }
+
+    def test_order_of_variables_is_preserved_when_loading(self):
+        bqm_dict = {
+            "linear": [(2, 2.0), (0, 0.5), (1, -1.0)],
+            "quadratic": [(0, 2, 1.2)],
+            "offset": 0.5,
+            "vartype": "SPIN",
+        }
+
+        bqm = bqm_from_serializable(bqm_dict)
+
+        assert list(bqm.variables) == [2, 0, 1]
+
+    def test_order_of_variables_is_preserved_in_round_trip(self):
+        bqm = dimod.BinaryQuadraticModel("SPIN")
+        for variable, bias in [(2, 0.5), (0, -2.0), (1, 3.0)]:
+            bqm.add_variable(variable, bias)
+        bqm.add_quadratic(2, 1, 0.5)
+
+        serializable = json.loads(json.dumps(bqm_to_serializable(bqm)))
+        loaded = bqm_from_serializable(serializable)
+
+        assert serializable["linear"] == [[2, 0.5], [0, -2.0], [1, 3.0]]
+        assert list(loaded.variables) == [2, 0, 1]
+
+    @pytest.mark.parametrize(
+        "labels",
+        [["0", "1"], [(0, 1), (1, 1)], [0, 0.5], [1, 2]],
+    )
+    def test_other_labels_are_loaded_with_generic_path(self, labels):
+        bqm_dict = {
+            "linear": [(label, 1.0) for label in labels],
+            "quadratic": [(*labels, 2.0)],
+            "offset": 0,
+            "vartype": "BINARY",
+        }
+
+        bqm = bqm_from_serializable(json.loads(json.dumps(bqm_dict)))
+
+        assert bqm == dimod.BinaryQuadraticModel(
+            {label: 1.0 for label in labels},
+            {tuple(labels): 2.0},
+            0,
+            "BINARY",
+        )
+
+
 def test_loading_saved_qubo_gives_the_same_qubo():
     qubo = dimod.BinaryQuadraticModel(
         {0: 0.5, 2: -2.0, 3: 3},
@@ -180,3 +260,240 @@ def test_loading_saved_sampleset_gives_the_same_sampleset():
     new_sampleset = load_sampleset(output_file)
 
     assert sampleset == new_sampleset
+
+
+def test_loading_saved_sampleset_summary_gives_the_same_summary():
+    bqm = dimod.generators.uniform(6, "SPIN", seed=2)
+    samples = np.random.default_rng(0).choice([-1, 1], size=(50, 6))
+    summary = summarize_sampleset(dimod.SampleSet.from_samples_bqm(samples, bqm), 3)
+
+    output_file = StringIO()
+
+    save_sampleset_summary(summary, output_file)
+    output_file.seek(0)
+    new_summary = load_sampleset_summary(output_file)
+
+    assert new_summary.lowest == summary.lowest
+    assert new_summary.energy_statistics == summary.energy_statistics
+
+
+class TestStreamingQuboLoading:
+    @pytest.mark.parametrize(
+        "qubo",
+        [
+            dimod.BinaryQuadraticModel(
+                {0: 0.5, 2: -2.0, 3: 3},
+                {(2, 1): 0.5, (1, 0): 0.4, (0, 3): -0.1},
+                -5,
+                vartype="BINARY",
+            ),
+            dimod.BinaryQuadraticModel(
+                {(0, 0): 1, (1, 0): -1, (2, 0): 0.5},
+                {((0, 0), (1, 0)): 0.5, ((1, 0), (2, 0)): 1.5},
+                42,
+                vartype="SPIN",
+            ),
+            dimod.BinaryQuadraticModel({}, {}, 1.5, vartype="BINARY"),
+            dimod.generators.gnp_random_bqm(300, 0.5, "SPIN", random_state=3),
+        ],
+    )
+    def test_streaming_gives_the_same_qubo_as_regular_loading(self, qubo):
+        output_file = StringIO()
+        save_qubo(qubo, output_file)
+        output_file.seek(0)
+
+        new_qubo = load_qubo(output_file, streaming=True)
+
+        assert qubo == new_qubo
+
+    def test_streaming_works_with_binary_file_objects(self):
+        qubo = dimod.generators.gnp_random_bqm(100, 0.5, "BINARY", random_state=3)
+        output_file = StringIO()
+        save_qubo(qubo, output_file)
+
+        new_qubo = load_qubo(BytesIO(output_file.getvalue().encode()), streaming=True)
+
+        assert qubo == new_qubo
+
+    def test_streaming_accepts_arbitrary_whitespace_and_field_order(self):
+        input_file = StringIO(
+            '{ "vartype" : "SPIN",\n "quadratic": [ [0, 1, 2.5] , [1,2,-1e-3] ],'
+            '\n\t"linear" :[[0, 1.0],[2,-0.5]], "offset": 3, "schema": "v1"}'
+        )
+
+        qubo = load_qubo(input_file, streaming=True)
+
+        assert qubo == dimod.BinaryQuadraticModel(
+            {0: 1.0, 2: -0.5}, {(0, 1): 2.5, (1, 2): -1e-3}, 3, "SPIN"
+        )
+
+    def test_streaming_fails_for_truncated_file(self):
+        input_file = StringIO('{"linear": [[0, 1.0], [1, 2')
+
+        with pytest.raises(ValueError):
+            load_qubo(input_file, streaming=True)
+
+
+class TestBinaryQuboFormat:
+    @pytest.mark.parametrize(
+        "qubo",
+        [
+            dimod.BinaryQuadraticModel(
+                {0: 0.5, 2: -2.0, 3: 3},
+                {(2, 1): 0.5, (1, 0): 0.4, (0, 3): -0.1},
+                -5,
+                vartype="BINARY",
+            ),
+            dimod.BinaryQuadraticModel(
+                {(0, 0): 1, (1, 0): -1, "a": 0.5},
+                {((0, 0), (1, 0)): 0.5, ((1, 0), "a"): 1.5},
+                42,
+                vartype="SPIN",
+            ),
+            dimod.BinaryQuadraticModel({0: 1.0, 1: 2.0}, {}, 0, vartype="BINARY"),
+        ],
+    )
+    def test_loading_saved_qubo_gives_the_same_qubo(self, qubo):
+        output_file = BytesIO()
+
+        save_qubo(qubo, output_file, binary=True)
+        output_file.seek(0)
+        new_qubo = load_qubo(output_file)
+
+        assert qubo == new_qubo
+
+    def test_binary_format_is_used_for_paths_with_bin_extension(self, tmp_path):
+        qubo = dimod.generators.gnp_random_bqm(50, 0.3, "BINARY", random_state=1)
+        path = tmp_path / "qubo.bin"
+
+        save_qubo(qubo, path)
+
+        with pytest.raises(ValueError):
+            json.loads(path.read_bytes())
+        assert load_qubo(path) == qubo
+        assert load_qubo(str(path)) == qubo
+
+    def test_json_format_is_detected_when_loading_from_path(self, tmp_path):
+        qubo = dimod.generators.gnp_random_bqm(10, 0.3, "SPIN", random_state=1)
+        path = tmp_path / "qubo.json"
+
+        save_qubo(qubo, path)
+
+        assert load_qubo(path) == qubo
+
+    def test_loading_fails_for_binary_file_with_different_schema(self):
+        sampleset = dimod.SampleSet.from_samples(np.ones(5, dtype="int8"), "BINARY", 0)
+        output_file = BytesIO()
+        save_sampleset(sampleset, output_file, binary=True)
+        output_file.seek(0)
+
+        with pytest.raises(ValueError):
+            load_qubo(output_file)
+
+    @pytest.mark.parametrize("binary", [True, False])
+    @pytest.mark.parametrize("buffering", [0, -1])
+    def test_format_is_detected_when_loading_from_non_seekable_stream(
+        self, binary, buffering
+    ):
+        qubo = dimod.generators.gnp_random_bqm(10, 0.3, "SPIN", random_state=1)
+        output_file = BytesIO() if binary else StringIO()
+        save_qubo(qubo, output_file, binary=binary)
+        content = output_file.getvalue()
+        read_fd, write_fd = os.pipe()
+        with open(write_fd, "wb") as pipe:
+            pipe.write(content if binary else content.encode())
+
+        with open(read_fd, "rb", buffering=buffering) as pipe:
+            assert not pipe.seekable()
+            assert load_qubo(pipe) == qubo
+            assert not pipe.closed
+
+    def test_qubo_with_numpy_integer_labels_can_be_saved(self):
+        qubo = dimod.BinaryQuadraticModel(
+            {np.int64(3): 1.0, np.int64(5): -1.0},
+            {(np.int64(3), np.int64(5)): 0.5},
+            0.0,
+            "BINARY",
+        )
+        output_file = BytesIO()
+
+        save_qubo(qubo, output_file, binary=True)
+        output_file.seek(0)
+
+        assert load_qubo(output_file) == qubo
+
+
+class TestBinarySampleSetFormat:
+    @pytest.mark.parametrize("vartype", ["BINARY", "SPIN"])
+    @pytest.mark.parametrize("num_variables", [1, 8, 13])
+    def test_loading_saved_sampleset_gives_the_same_sampleset(
+        self, vartype, num_variables
+    ):
+        samples = np.random.default_rng(num_variables).integers(
+            0, 2, size=(20, num_variables), dtype="int8"
+        )
+        if vartype == "SPIN":
+            samples = 2 * samples - 1
+        sampleset = dimod.SampleSet.from_samples(
+            samples,
+            vartype,
+            np.arange(20) / 4,
+            num_occurrences=np.arange(1, 21),
+            info={"solver": "test"},
+        )
+        output_file = BytesIO()
+
+        save_sampleset(sampleset, output_file, binary=True)
+        output_file.seek(0)
+        new_sampleset = load_sampleset(output_file)
+
+        assert sampleset == new_sampleset
+        np.testing.assert_array_equal(
+            sampleset.record.num_occurrences, new_sampleset.record.num_occurrences
+        )
+        assert new_sampleset.info == {"solver": "test"}
+
+    def test_info_with_numpy_values_is_preserved(self):
+        sampleset = dimod.SampleSet.from_samples(
+            np.ones((2, 3), dtype="int8"),
+            "BINARY",
+            [0.0, 1.0],
+            info={
+                "num_sweeps": np.int64(10),
+                "beta_range": np.array([0.1, 4.2]),
+                "timing": {"total": np.float64(0.5)},
+            },
+        )
+        output_file = BytesIO()
+
+        save_sampleset(sampleset, output_file, binary=True)
+        output_file.seek(0)
+        info = load_sampleset(output_file).info
+
+        assert info["num_sweeps"] == 10
+        np.testing.assert_array_equal(info["beta_range"], [0.1, 4.2])
+        assert info["timing"] == {"total": 0.5}
+
+    def test_variable_labels_and_additional_vectors_are_preserved(self, tmp_path):
+        sampleset = dimod.SampleSet.from_samples(
+            ([[0, 1, 1], [1, 0, 1]], ["c", (0, 1), "a"]),
+            "BINARY",
+            [0.5, -1.0],
+            is_feasible=[True, False],
+        )
+        path = tmp_path / "sampleset.bin"
+
+        save_sampleset(sampleset, path)
+        new_sampleset = load_sampleset(path)
+
+        assert list(new_sampleset.variables) == ["c", (0, 1), "a"]
+        assert sampleset == new_sampleset
+        np.testing.assert_array_equal(new_sampleset.record.is_feasible, [True, False])
+
+    def test_json_format_is_detected_when_loading_from_path(self, tmp_path):
+        sampleset = dimod.SampleSet.from_samples(np.ones(5, dtype="int8"), "BINARY", 0)
+        path = tmp_path / "sampleset.json"
+
+        save_sampleset(sampleset, path)
+
+        assert load_sampleset(path) == sampleset
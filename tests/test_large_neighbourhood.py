@@ -0,0 +1,102 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import dimod
+import numpy as np
+import pytest
+from zquantum.qubo.compiled_qubo import compile_qubo
+from zquantum.qubo.interfaces.bqm_solver_test import BQMSolverTests
+from zquantum.qubo.solvers import GrayCodeExactSolver, LargeNeighbourhoodSolver
+from zquantum.qubo.solvers.large_neighbourhood import EnergyTracker
+
+
+class TestLargeNeighbourhoodSolver(BQMSolverTests):
+    @pytest.fixture
+    def solver(self):
+        return LargeNeighbourhoodSolver(GrayCodeExactSolver())
+
+    @pytest.fixture
+    def solver_params(self):
+        return {"subproblem_size": 4, "max_stalled_iterations": 10, "seed": 42}
+
+    @pytest.mark.parametrize("vartype", ["SPIN", "BINARY"])
+    def test_tracked_energies_match_returned_sample(self, solver, vartype):
+        bqm = dimod.generators.uniform(30, vartype, seed=3)
+        sampleset = solver.sample(bqm, subproblem_size=5, seed=1)
+
+        energies = sampleset.info["energies"]
+        assert len(energies) == sampleset.info["num_iterations"]
+        assert np.all(np.diff(energies) <= 0)
+        assert energies[-1] == pytest.approx(sampleset.first.energy)
+        assert sampleset.first.energy == pytest.approx(
+            bqm.energy(sampleset.first.sample)
+        )
+
+    def test_stops_after_max_iterations(self, solver):
+        bqm = dimod.generators.uniform(30, "SPIN", seed=3)
+        sampleset = solver.sample(bqm, subproblem_size=5, max_iterations=3, seed=1)
+
+        assert sampleset.info["num_iterations"] == 3
+
+    def test_uses_tabu_as_default_inner_solver(self):
+        bqm = dimod.generators.uniform(40, "BINARY", seed=3)
+        sampleset = LargeNeighbourhoodSolver().sample(
+            bqm, subproblem_size=10, inner_parameters={"num_reads": 2}, seed=1
+        )
+
+        assert sampleset.first.energy == pytest.approx(
+            bqm.energy(sampleset.first.sample)
+        )
+
+
+class TestEnergyTracker:
+    @pytest.mark.parametrize("vartype", ["SPIN", "BINARY"])
+    def test_updates_match_energies_computed_from_scratch(self, vartype):
+        bqm = dimod.generators.uniform(12, vartype, seed=5)
+        compiled = compile_qubo(bqm)
+        rng = np.random.default_rng(0)
+        low = -1 if compiled.vartype is dimod.SPIN else 0
+
+        tracker = EnergyTracker(compiled, rng.choice([low, 1], size=12))
+        for _ in range(5):
+            indices = np.sort(rng.choice(12, size=4, replace=False))
+            tracker.update(indices, rng.choice([low, 1], size=4))
+
+            assert tracker.energy == pytest.approx(
+                compiled.energies(tracker.state[None])[0]
+            )
+            np.testing.assert_allclose(
+                tracker.fields,
+                compiled.linear + compiled.adjacency @ tracker.state,
+            )
+
+    @pytest.mark.parametrize("vartype", ["SPIN", "BINARY"])
+    def test_clamped_bqm_differs_from_model_by_constant(self, vartype):
+        bqm = dimod.generators.uniform(8, vartype, seed=5)
+        compiled = compile_qubo(bqm)
+        low = -1 if compiled.vartype is dimod.SPIN else 0
+        state = np.array([low, 1] * 4)
+        tracker = EnergyTracker(compiled, state)
+        indices = np.array([1, 4, 6])
+
+        clamped = tracker.clamped_bqm(indices)
+        differences = []
+        for values in [(low, low, low), (1, low, 1), (low, 1, 1), (1, 1, 1)]:
+            full_state = state.copy()
+            full_state[indices] = values
+            differences.append(
+                compiled.energies(full_state[None])[0]
+                - clamped.energy(dict(enumerate(values)))
+            )
+
+        np.testing.assert_allclose(differences, differences[0])
+
+    def test_flip_gains_are_energy_changes_of_single_flips(self):
+        bqm = dimod.generators.uniform(6, "SPIN", seed=5)
+        compiled = compile_qubo(bqm)
+        state = np.array([1, -1, -1, 1, 1, -1])
+        tracker = EnergyTracker(compiled, state)
+
+        expected = [tracker.energy_change(np.array([i]), -state[[i]]) for i in range(6)]
+
+        np.testing.assert_allclose(tracker.flip_gains(), expected)
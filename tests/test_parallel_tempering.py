@@ -0,0 +1,62 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import dimod
+import numpy as np
+import pytest
+from zquantum.qubo.interfaces.bqm_solver_test import BQMSolverTests
+from zquantum.qubo.solvers import ParallelTemperingSolver
+
+
+class TestParallelTemperingSolver(BQMSolverTests):
+    @pytest.fixture
+    def solver(self):
+        return ParallelTemperingSolver()
+
+    @pytest.fixture
+    def solver_params(self):
+        return {"num_reads": 4, "num_sweeps": 100, "num_temperatures": 8, "seed": 42}
+
+    @pytest.mark.parametrize("number_of_workers", [1, 2])
+    def test_returns_one_sample_per_chain(self, solver, number_of_workers):
+        bqm = dimod.generators.uniform(10, "SPIN", seed=3)
+        sampleset = solver.sample(
+            bqm, num_reads=5, num_sweeps=10, number_of_workers=number_of_workers
+        )
+
+        assert len(sampleset) == 5
+
+    def test_is_reproducible_with_seed(self, solver):
+        bqm = dimod.generators.uniform(10, "BINARY", seed=3)
+        first = solver.sample(bqm, num_reads=3, num_sweeps=10, seed=1)
+        second = solver.sample(bqm, num_reads=3, num_sweeps=10, seed=1)
+
+        np.testing.assert_array_equal(first.record.sample, second.record.sample)
+
+    @pytest.mark.parametrize("num_temperatures", [1, 2, 5])
+    def test_reports_swap_acceptance_rate_for_every_pair_of_temperatures(
+        self, solver, num_temperatures
+    ):
+        bqm = dimod.generators.uniform(6, "SPIN", seed=3)
+        sampleset = solver.sample(
+            bqm, num_reads=2, num_sweeps=20, num_temperatures=num_temperatures
+        )
+        rates = sampleset.info["swap_acceptance_rates"]
+
+        assert len(rates) == num_temperatures - 1
+        assert all(0 <= rate <= 1 for rate in rates)
+
+    def test_swaps_are_always_accepted_between_equal_temperatures(self, solver):
+        bqm = dimod.generators.uniform(6, "SPIN", seed=3)
+        sampleset = solver.sample(
+            bqm, num_reads=2, num_sweeps=20, num_temperatures=3, beta_range=(1, 1)
+        )
+
+        assert sampleset.info["swap_acceptance_rates"] == [1.0, 1.0]
+
+    @pytest.mark.parametrize("swap_interval", [0, -2])
+    def test_raises_error_for_non_positive_swap_interval(self, solver, swap_interval):
+        bqm = dimod.generators.uniform(6, "SPIN", seed=3)
+
+        with pytest.raises(ValueError):
+            solver.sample(bqm, num_reads=2, num_sweeps=20, swap_interval=swap_interval)
@@ -0,0 +1,137 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import dimod
+import numpy as np
+import pytest
+from zquantum.qubo import polish_sampleset
+
+
+def _random_sampleset(bqm, num_samples, seed):
+    rng = np.random.default_rng(seed)
+    values = [-1, 1] if bqm.vartype is dimod.SPIN else [0, 1]
+    samples = rng.choice(values, size=(num_samples, bqm.num_variables))
+    return dimod.SampleSet.from_samples_bqm((samples, list(bqm.variables)), bqm)
+
+
+def _flip(value, vartype):
+    return -value if vartype is dimod.SPIN else 1 - value
+
+
+def _naive_steepest_descent(bqm, sample, max_steps):
+    sample = dict(sample)
+    for _ in range(len(bqm.variables) ** 2 if max_steps is None else max_steps):
+        energy = bqm.energy(sample)
+        flips = [
+            {**sample, variable: _flip(sample[variable], bqm.vartype)}
+            for variable in bqm.variables
+        ]
+        energies = [bqm.energy(flipped) for flipped in flips]
+        if min(energies) >= energy - 1e-12:
+            break
+        sample = flips[int(np.argmin(energies))]
+    return sample
+
+
+# Dense and sparse models are updated differently.
+MODELS = [
+    dimod.generators.uniform(12, "SPIN", seed=3),
+    dimod.generators.uniform(12, "BINARY", seed=3),
+    dimod.generators.gnp_random_bqm(60, 0.05, "SPIN", random_state=3),
+    dimod.generators.gnp_random_bqm(60, 0.05, "BINARY", random_state=3),
+]
+
+
+class TestPolishSampleset:
+    @pytest.mark.parametrize("bqm", MODELS)
+    def test_returns_local_minima(self, bqm):
+        polished = polish_sampleset(_random_sampleset(bqm, 200, seed=1), bqm)
+
+        for sample, energy in polished.data(["sample", "energy"]):
+            assert energy == pytest.approx(bqm.energy(sample))
+            for variable in bqm.variables:
+                flipped = {**sample, variable: _flip(sample[variable], bqm.vartype)}
+                assert bqm.energy(flipped) >= energy - 1e-9
+
+    @pytest.mark.parametrize("bqm", MODELS)
+    def test_aggregates_samples_and_keeps_occurrences(self, bqm):
+        sampleset = _random_sampleset(bqm, 200, seed=1)
+        polished = polish_sampleset(sampleset, bqm)
+
+        assert polished.record.num_occurrences.sum() == 200
+        assert len(np.unique(polished.record.sample, axis=0)) == len(polished)
+        assert polished.first.energy <= sampleset.first.energy
+
+    def test_results_do_not_depend_on_order_of_variables(self):
+        bqm = dimod.generators.uniform(5, "SPIN", seed=5).relabel_variables(
+            dict(enumerate("abcde"))
+        )
+        sampleset = _random_sampleset(bqm, 30, seed=2)
+        reversed_sampleset = dimod.SampleSet.from_samples(
+            (sampleset.record.sample[:, ::-1], list(sampleset.variables)[::-1]),
+            bqm.vartype,
+            sampleset.record.energy,
+        )
+
+        polished = polish_sampleset(sampleset, bqm)
+        reversed_polished = polish_sampleset(reversed_sampleset, bqm)
+
+        def occurrences(sampleset):
+            return {
+                frozenset(sample.items()): num_occurrences
+                for sample, num_occurrences in sampleset.data(
+                    ["sample", "num_occurrences"]
+                )
+            }
+
+        assert occurrences(polished) == occurrences(reversed_polished)
+
+    def test_makes_steepest_flip_in_every_step(self):
+        bqm = dimod.BQM({0: -1.0, 1: 3.0, 2: 0.5}, {(0, 1): -1.0}, 0.0, "BINARY")
+        sampleset = dimod.SampleSet.from_samples_bqm([{0: 0, 1: 1, 2: 1}], bqm)
+
+        assert polish_sampleset(sampleset, bqm, max_steps=0).first.sample == {
+            0: 0,
+            1: 1,
+            2: 1,
+        }
+        # Flipping 1 decreases the energy by 3, flipping 0 by 2 and 2 by 0.5.
+        assert polish_sampleset(sampleset, bqm, max_steps=1).first.sample == {
+            0: 0,
+            1: 0,
+            2: 1,
+        }
+        assert polish_sampleset(sampleset, bqm).first.sample == {0: 1, 1: 0, 2: 0}
+
+    @pytest.mark.parametrize("bqm", MODELS)
+    @pytest.mark.parametrize("max_steps", [3, None])
+    def test_matches_naive_steepest_descent(self, bqm, max_steps):
+        sampleset = _random_sampleset(bqm, 20, seed=6)
+        polished = polish_sampleset(sampleset, bqm, max_steps=max_steps)
+
+        expected = {}
+        for sample in sampleset.samples():
+            key = frozenset(_naive_steepest_descent(bqm, sample, max_steps).items())
+            expected[key] = expected.get(key, 0) + 1
+        assert {
+            frozenset(sample.items()): num_occurrences
+            for sample, num_occurrences in polished.data(["sample", "num_occurrences"])
+        } == expected
+
+    def test_gives_same_results_with_many_workers(self):
+        bqm = MODELS[2]
+        sampleset = _random_sampleset(bqm, 100, seed=4)
+
+        np.testing.assert_array_equal(
+            polish_sampleset(sampleset, bqm).record,
+            polish_sampleset(sampleset, bqm, number_of_workers=2).record,
+        )
+
+    def test_handles_model_without_variables(self):
+        bqm = dimod.BQM({}, {}, 2.0, "BINARY")
+        sampleset = dimod.SampleSet.from_samples_bqm([{}, {}], bqm)
+        polished = polish_sampleset(sampleset, bqm)
+
+        assert len(polished) == 1
+        assert polished.first.energy == 2.0
+        assert polished.record.num_occurrences[0] == 2
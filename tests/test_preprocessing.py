@@ -0,0 +1,100 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import dimod
+import numpy as np
+import pytest
+from zquantum.qubo.preprocessing import expand_sampleset, preprocess_bqm
+
+
+def solve_exactly(bqm):
+    if bqm.num_variables == 0:
+        return dimod.SampleSet.from_samples([{}], bqm.vartype, bqm.offset)
+    return dimod.ExactSolver().sample(bqm)
+
+
+def random_bqms():
+    for seed in range(20):
+        for vartype in ["BINARY", "SPIN"]:
+            bqm = dimod.generators.gnp_random_bqm(
+                9, 0.2 + 0.2 * (seed % 3), vartype, random_state=seed
+            )
+            if seed % 2:
+                # Positive couplings make more variables fixable.
+                for u, v in list(bqm.quadratic):
+                    bqm.set_quadratic(u, v, abs(bqm.get_quadratic(u, v)))
+            yield bqm
+
+
+class TestPreprocessingBQM:
+    @pytest.mark.parametrize("use_roof_duality", [True, False])
+    def test_preserves_ground_state_energy(self, use_roof_duality):
+        for bqm in random_bqms():
+            reduced_bqm, fixed_variables = preprocess_bqm(bqm, use_roof_duality)
+            sampleset = expand_sampleset(
+                solve_exactly(reduced_bqm), fixed_variables, bqm
+            )
+
+            assert sampleset.first.energy == pytest.approx(
+                dimod.ExactSolver().sample(bqm).first.energy
+            )
+
+    def test_reduced_bqm_is_bqm_with_fixed_variables(self):
+        for bqm in random_bqms():
+            reduced_bqm, fixed_variables = preprocess_bqm(bqm)
+            expected_bqm = bqm.copy()
+            expected_bqm.fix_variables(fixed_variables)
+
+            assert reduced_bqm.vartype is bqm.vartype
+            assert set(fixed_variables.values()) <= set(bqm.vartype.value)
+            assert reduced_bqm.is_almost_equal(expected_bqm)
+
+    def test_fixes_dominated_variables(self):
+        bqm = dimod.BinaryQuadraticModel(
+            {"a": 2, "b": -3, "c": 1}, {("a", "b"): -1, ("b", "c"): 1}, 0, "BINARY"
+        )
+        reduced_bqm, fixed_variables = preprocess_bqm(bqm, use_roof_duality=False)
+
+        assert fixed_variables == {"a": 0, "b": 1, "c": 0}
+        assert reduced_bqm.num_variables == 0
+        assert reduced_bqm.offset == -3
+
+    def test_fixes_variables_using_roof_duality(self):
+        # No variable is dominated, but x = (0, 1, 1) is the unique optimum
+        # and the LP relaxation is tight.
+        bqm = dimod.BinaryQuadraticModel(
+            {0: -2, 1: -2, 2: -2}, {(0, 1): 2, (1, 2): 1, (0, 2): 2}, 0, "BINARY"
+        )
+        _, fixed_without_roof_duality = preprocess_bqm(bqm, use_roof_duality=False)
+        _, fixed_variables = preprocess_bqm(bqm)
+
+        assert fixed_without_roof_duality == {}
+        assert fixed_variables == {0: 0, 1: 1, 2: 1}
+
+    def test_does_not_modify_given_bqm(self):
+        bqm = dimod.generators.uniform(5, "SPIN", seed=1)
+        original_bqm = bqm.copy()
+        preprocess_bqm(bqm)
+
+        assert bqm == original_bqm
+
+
+class TestExpandingSampleset:
+    def test_combines_samples_with_fixed_variables(self):
+        bqm = dimod.BinaryQuadraticModel(
+            {"a": 1, "b": -1, "c": 0.5}, {("a", "b"): 2, ("b", "c"): -1}, 1, "SPIN"
+        )
+        reduced_sampleset = dimod.SampleSet.from_samples(
+            [{"a": 1, "c": -1}, {"a": -1, "c": -1}],
+            "SPIN",
+            energy=[0, 0],
+            num_occurrences=[3, 5],
+        )
+        sampleset = expand_sampleset(reduced_sampleset, {"b": 1}, bqm)
+
+        assert sampleset.variables == ["a", "b", "c"]
+        np.testing.assert_array_equal(
+            sampleset.record.sample, [[1, 1, -1], [-1, 1, -1]]
+        )
+        np.testing.assert_allclose(sampleset.record.energy, bqm.energies(sampleset))
+        np.testing.assert_array_equal(sampleset.record.num_occurrences, [3, 5])
@@ -0,0 +1,71 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import importlib.util
+import json
+import pathlib
+
+import dimod
+import numpy as np
+import pytest
+from scipy.optimize import OptimizeResult, minimize
+from zquantum.core.interfaces.mock_objects import MockOptimizer
+from zquantum.qubo import save_qubo
+
+_STEPS_PATH = pathlib.Path(__file__).parents[1] / "steps" / "relaxed_qubo.py"
+_spec = importlib.util.spec_from_file_location("relaxed_qubo_steps", _STEPS_PATH)
+relaxed_qubo_steps = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(relaxed_qubo_steps)
+
+
+class ConstrainedScipyOptimizer(MockOptimizer):
+    """Passes constraints to scipy's minimize, like ScipyOptimizer does.
+
+    Optimizers created with `with_bounds=True` also pass bounds.
+    """
+
+    def __init__(self, method, with_bounds=False):
+        self.method = method
+        self.constraints = None
+        if with_bounds:
+            self.bounds = None
+
+    def _minimize(self, cost_function, initial_params, keep_history=False):
+        result = minimize(
+            cost_function,
+            initial_params,
+            method=self.method,
+            constraints=self.constraints,
+            bounds=getattr(self, "bounds", None),
+        )
+        return OptimizeResult(
+            opt_value=result.fun, opt_params=result.x, nfev=result.nfev
+        )
+
+
+class TestSolveRelaxedQubo:
+    @pytest.mark.parametrize("with_bounds", [False, True])
+    @pytest.mark.parametrize("method", ["COBYLA", "trust-constr"])
+    def test_non_psd_qubo_is_solved_with_scipy_optimizer(
+        self, tmp_path, monkeypatch, method, with_bounds
+    ):
+        qubo = dimod.BinaryQuadraticModel(
+            {0: -1.0, 1: -2.0, 2: -1.5}, {(0, 1): 0.5, (1, 2): -1.0}, 0, "BINARY"
+        )
+        save_qubo(qubo, tmp_path / "qubo.json")
+        monkeypatch.chdir(tmp_path)
+
+        relaxed_qubo_steps.solve_relaxed_qubo(
+            "qubo.json",
+            {
+                "module_name": __name__,
+                "function_name": "ConstrainedScipyOptimizer",
+                "method": method,
+                "with_bounds": with_bounds,
+            },
+            number_of_trials=2,
+            seed=1,
+        )
+
+        solution = json.loads((tmp_path / "solution.json").read_text())["list"]
+        np.testing.assert_allclose(solution, [1, 1, 1], atol=1e-3)
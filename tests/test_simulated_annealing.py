@@ -0,0 +1,70 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import dimod
+import numpy as np
+import pytest
+from zquantum.qubo.compiled_qubo import compile_qubo
+from zquantum.qubo.interfaces.bqm_solver_test import BQMSolverTests
+from zquantum.qubo.solvers import SimulatedAnnealingSolver
+from zquantum.qubo.solvers.simulated_annealing import MetropolisSweeper
+
+
+class TestSimulatedAnnealingSolver(BQMSolverTests):
+    @pytest.fixture
+    def solver(self):
+        return SimulatedAnnealingSolver()
+
+    @pytest.fixture
+    def solver_params(self):
+        return {"num_reads": 20, "num_sweeps": 200, "seed": 42}
+
+    def test_returns_one_sample_per_read(self, solver):
+        bqm = dimod.generators.uniform(10, "SPIN", seed=3)
+
+        assert len(solver.sample(bqm, num_reads=17, num_sweeps=10)) == 17
+
+    def test_is_reproducible_with_seed(self, solver):
+        bqm = dimod.generators.uniform(10, "BINARY", seed=3)
+        first = solver.sample(bqm, num_reads=5, num_sweeps=10, seed=1)
+        second = solver.sample(bqm, num_reads=5, num_sweeps=10, seed=1)
+
+        np.testing.assert_array_equal(first.record.sample, second.record.sample)
+
+    @pytest.mark.parametrize("beta_schedule_type", ["linear", "geometric"])
+    def test_reports_used_beta_range(self, solver, beta_schedule_type):
+        bqm = dimod.generators.uniform(5, "SPIN", seed=3)
+        sampleset = solver.sample(
+            bqm,
+            num_sweeps=10,
+            beta_range=(0.5, 3.0),
+            beta_schedule_type=beta_schedule_type,
+        )
+
+        assert sampleset.info["beta_range"] == (0.5, 3.0)
+
+    def test_raises_error_for_unknown_beta_schedule_type(self, solver):
+        with pytest.raises(ValueError):
+            solver.sample(dimod.generators.uniform(3, "SPIN"), beta_schedule_type="x")
+
+    def test_handles_bqm_without_variables(self, solver):
+        bqm = dimod.BinaryQuadraticModel({}, {}, 1.5, "BINARY")
+        sampleset = solver.sample(bqm, num_reads=3, num_sweeps=5)
+
+        np.testing.assert_array_equal(sampleset.record.energy, [1.5, 1.5, 1.5])
+
+
+@pytest.mark.parametrize("vartype", ["BINARY", "SPIN"])
+@pytest.mark.parametrize("density", [0.05, 1.0])
+def test_sweeps_keep_local_fields_consistent_with_states(vartype, density):
+    bqm = dimod.generators.gnp_random_bqm(40, density, vartype, random_state=5)
+    sweeper = MetropolisSweeper(compile_qubo(bqm))
+    rng = np.random.default_rng(5)
+    states = sweeper.random_states(8, rng)
+    fields = sweeper.local_fields(states)
+
+    for beta in [0.1, 1.0, 10.0]:
+        sweeper.sweep(states, fields, np.full(8, beta), rng)
+
+    np.testing.assert_allclose(fields, sweeper.local_fields(states))
+    assert set(np.unique(states)) <= set(bqm.vartype.value)
@@ -0,0 +1,50 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import importlib.util
+import pathlib
+
+import dimod
+import pytest
+from zquantum.qubo import load_sampleset, load_sampleset_summary, save_qubo
+
+_STEPS_PATH = pathlib.Path(__file__).parents[1] / "steps" / "solvers.py"
+_spec = importlib.util.spec_from_file_location("solvers_steps", _STEPS_PATH)
+solvers_steps = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(solvers_steps)
+
+EXACT_SOLVER_SPECS = {
+    "module_name": "zquantum.qubo.solvers",
+    "function_name": "GrayCodeExactSolver",
+}
+
+
+class TestSolveQubo:
+    @pytest.fixture
+    def qubo_path(self, tmp_path, monkeypatch):
+        qubo = dimod.generators.uniform(6, "BINARY", seed=4)
+        save_qubo(qubo, tmp_path / "qubo.json")
+        monkeypatch.chdir(tmp_path)
+        return tmp_path / "qubo.json"
+
+    def test_saves_lowest_states_as_sampleset_and_summary(self, tmp_path, qubo_path):
+        solvers_steps.solve_qubo(
+            str(qubo_path),
+            EXACT_SOLVER_SPECS,
+            solver_params={"num_states": 20},
+            num_lowest_states=5,
+        )
+
+        sampleset = load_sampleset(tmp_path / "sampleset.json")
+        summary = load_sampleset_summary(tmp_path / "sampleset-summary.json")
+        assert len(sampleset) == 5
+        assert sampleset.record.energy.tolist() == pytest.approx(
+            summary.lowest.record.energy.tolist()
+        )
+        assert summary.energy_statistics["num_reads"] == 20
+
+    def test_raises_error_for_non_positive_num_lowest_states(self, qubo_path):
+        with pytest.raises(ValueError):
+            solvers_steps.solve_qubo(
+                str(qubo_path), EXACT_SOLVER_SPECS, num_lowest_states=0
+            )
@@ -0,0 +1,124 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import dimod
+import numpy as np
+import pytest
+from zquantum.qubo.summary import summarize_sampleset
+
+
+def _random_sampleset(num_samples, num_variables=6, seed=0):
+    bqm = dimod.generators.uniform(num_variables, "SPIN", seed=seed)
+    samples = np.random.default_rng(seed).choice([-1, 1], (num_samples, num_variables))
+    return dimod.SampleSet.from_samples_bqm(samples, bqm)
+
+
+class TestSummarizeSampleset:
+    @pytest.mark.parametrize("num_lowest", [1, 5, 64])
+    def test_keeps_lowest_distinct_samples_with_their_occurrences(self, num_lowest):
+        sampleset = _random_sampleset(1000)
+        expected = sampleset.aggregate().truncate(num_lowest)
+
+        lowest = summarize_sampleset(sampleset, num_lowest).lowest
+
+        assert lowest.variables == sampleset.variables
+        np.testing.assert_array_equal(lowest.record.sample, expected.record.sample)
+        np.testing.assert_allclose(lowest.record.energy, expected.record.energy)
+        np.testing.assert_array_equal(
+            lowest.record.num_occurrences, expected.record.num_occurrences
+        )
+
+    def test_counts_occurrences_across_chunks(self, monkeypatch):
+        monkeypatch.setattr("zquantum.qubo.summary._BATCH_CHUNK_ENTRIES", 12)
+        sampleset = _random_sampleset(300)
+        expected = sampleset.aggregate().truncate(4)
+
+        lowest = summarize_sampleset(sampleset, 4).lowest
+
+        np.testing.assert_array_equal(lowest.record.sample, expected.record.sample)
+        np.testing.assert_array_equal(
+            lowest.record.num_occurrences, expected.record.num_occurrences
+        )
+
+    def test_computes_statistics_weighted_by_occurrences(self):
+        sampleset = dimod.SampleSet.from_samples(
+            ([[0], [1], [0], [1]], ["x"]),
+            "BINARY",
+            energy=[4.0, 1.0, 4.0, 2.0],
+            num_occurrences=[1, 6, 2, 1],
+        )
+
+        statistics = summarize_sampleset(
+            sampleset, 1, quantiles=[0.0, 0.5, 0.7, 1.0], num_bins=3
+        ).energy_statistics
+
+        assert statistics["num_reads"] == 10
+        assert statistics["min"] == 1.0
+        assert statistics["max"] == 4.0
+        assert statistics["mean"] == pytest.approx(2.0)
+        assert statistics["quantiles"] == [
+            [0.0, 1.0],
+            [0.5, 1.0],
+            [0.7, 2.0],
+            [1.0, 4.0],
+        ]
+        assert statistics["histogram"] == {
+            "counts": [6, 1, 3],
+            "bin_edges": [1.0, 2.0, 3.0, 4.0],
+        }
+
+    def test_summarizes_iterable_of_samplesets_like_their_concatenation(self):
+        bqm = dimod.generators.uniform(6, "SPIN", seed=0)
+        parts = [
+            dimod.SampleSet.from_samples_bqm(
+                np.random.default_rng(seed).choice([-1, 1], (300, 6)), bqm
+            )
+            for seed in range(3)
+        ]
+        expected = summarize_sampleset(dimod.concatenate(parts), 10)
+        # Variables of one part are in a different order.
+        parts[1] = dimod.SampleSet.from_samples(
+            (parts[1].record.sample[:, ::-1], list(parts[1].variables)),
+            parts[1].vartype,
+            parts[1].record.energy,
+        ).relabel_variables({v: 5 - v for v in range(6)}, inplace=False)
+
+        summary = summarize_sampleset((part for part in parts), 10)
+
+        assert list(parts[1].variables) == [5, 4, 3, 2, 1, 0]
+        assert summary.lowest.variables == expected.lowest.variables
+        np.testing.assert_array_equal(
+            summary.lowest.record.sample, expected.lowest.record.sample
+        )
+        np.testing.assert_array_equal(
+            summary.lowest.record.num_occurrences,
+            expected.lowest.record.num_occurrences,
+        )
+        assert summary.energy_statistics == expected.energy_statistics
+
+    def test_raises_error_for_samplesets_with_different_variables(self):
+        with pytest.raises(ValueError):
+            summarize_sampleset(
+                [_random_sampleset(10), _random_sampleset(10, num_variables=5)], 3
+            )
+
+    def test_raises_error_for_nan_energies(self):
+        sampleset = dimod.SampleSet.from_samples(
+            ([[0], [1], [0]], ["x"]), "BINARY", energy=[1.0, np.nan, 0.5]
+        )
+
+        with pytest.raises(ValueError, match="NaN"):
+            summarize_sampleset(sampleset, 2)
+
+    @pytest.mark.parametrize("num_lowest", [0, -1])
+    def test_raises_error_for_non_positive_num_lowest(self, num_lowest):
+        with pytest.raises(ValueError):
+            summarize_sampleset(_random_sampleset(10), num_lowest)
+
+    def test_keeps_all_distinct_samples_if_there_are_fewer_of_them(self):
+        sampleset = _random_sampleset(1000, num_variables=3)
+
+        lowest = summarize_sampleset(sampleset, 100).lowest
+
+        assert len(lowest) == 8
+        assert lowest.record.num_occurrences.sum() == 1000
@@ -0,0 +1,82 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import dimod
+import numpy as np
+import pytest
+from zquantum.qubo.interfaces.bqm_solver_test import BQMSolverTests
+from zquantum.qubo.solvers import TabuSolver
+from zquantum.qubo.solvers.tabu import _GainBlocks
+
+
+class TestTabuSolver(BQMSolverTests):
+    @pytest.fixture
+    def solver(self):
+        return TabuSolver()
+
+    @pytest.fixture
+    def solver_params(self):
+        return {"num_reads": 3, "seed": 42}
+
+    def test_returns_one_sample_per_restart(self, solver):
+        bqm = dimod.generators.uniform(10, "SPIN", seed=3)
+        sampleset = solver.sample(bqm, num_reads=4, seed=1)
+
+        assert len(sampleset) == 4
+        assert sampleset.info == {"num_restarts": 4, "stop_reason": None}
+
+    def test_is_reproducible_with_seed(self, solver):
+        bqm = dimod.generators.uniform(20, "BINARY", seed=3)
+        first = solver.sample(bqm, num_reads=3, seed=1)
+        second = solver.sample(bqm, num_reads=3, seed=1)
+
+        np.testing.assert_array_equal(first.record.sample, second.record.sample)
+
+    def test_stops_after_reaching_target_energy(self, solver):
+        bqm = dimod.generators.uniform(10, "SPIN", seed=3)
+        ground_state_energy = dimod.ExactSolver().sample(bqm).first.energy
+        sampleset = solver.sample(
+            bqm, num_reads=100, target_energy=ground_state_energy + 1e-9, seed=1
+        )
+
+        assert sampleset.info["stop_reason"] == "target_energy"
+        assert sampleset.info["num_restarts"] < 100
+        assert sampleset.first.energy == pytest.approx(ground_state_energy)
+
+    def test_stops_after_time_limit(self, solver):
+        bqm = dimod.generators.uniform(50, "SPIN", seed=3)
+        sampleset = solver.sample(bqm, num_reads=10 ** 6, time_limit=0.2, seed=1)
+
+        assert sampleset.info["stop_reason"] == "time_limit"
+        assert 1 <= len(sampleset) < 10 ** 6
+
+    @pytest.mark.parametrize("tenure", [0, 3, 10])
+    def test_finds_ground_state_for_any_tenure(self, solver, tenure):
+        bqm = dimod.generators.uniform(10, "BINARY", seed=5)
+        sampleset = solver.sample(bqm, num_reads=3, tenure=tenure, seed=1)
+
+        assert sampleset.first.energy == pytest.approx(
+            dimod.ExactSolver().sample(bqm).first.energy
+        )
+
+
+class TestGainBlocks:
+    @pytest.mark.parametrize("num_variables", [1, 7, 16, 50])
+    def test_finds_lowest_gains_of_tabu_and_non_tabu_variables(self, num_variables):
+        rng = np.random.default_rng(num_variables)
+        gains = rng.normal(size=num_variables)
+        tabu = np.zeros(num_variables, dtype=bool)
+        blocks = _GainBlocks(gains)
+
+        for _ in range(20):
+            variables = rng.choice(num_variables, size=rng.integers(1, 4))
+            gains[variables] = rng.normal(size=len(variables))
+            tabu[variables] = rng.random(len(variables)) < 0.3
+            blocks.update(variables, gains[variables], tabu[variables])
+
+            for is_tabu in (False, True):
+                candidates = np.where(tabu == is_tabu, gains, np.inf)
+                variable, gain = blocks.argmin(tabu=is_tabu)
+                assert blocks.min(tabu=is_tabu) == candidates.min()
+                if candidates.min() < np.inf:
+                    assert (variable, gain) == (candidates.argmin(), candidates.min())
@@ -0,0 +1,96 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import itertools
+
+import dimod
+import numpy as np
+import pytest
+from zquantum.core.measurement import Measurements
+from zquantum.qubo.utils import (
+    evaluate_bitstring_for_qubo,
+    evaluate_bitstrings_for_qubo,
+)
+
+
+def qubo():
+    return dimod.BinaryQuadraticModel(
+        {0: 1, 1: 2, 2: 3},
+        {(1, 2): 0.5, (1, 0): -0.25, (0, 2): 2.125},
+        -1,
+        vartype=dimod.BINARY,
+    )
+
+
+def all_bitstrings(num_bits):
+    return list(itertools.product([0, 1], repeat=num_bits))
+
+
+class TestEvaluatingBitstringsForQubo:
+    @pytest.mark.parametrize("dtype", [np.uint8, bool, np.int64])
+    def test_energies_match_single_bitstring_evaluation(self, dtype):
+        bitstrings = np.array(all_bitstrings(3), dtype=dtype)
+
+        energies = evaluate_bitstrings_for_qubo(bitstrings, qubo())
+
+        np.testing.assert_array_equal(
+            energies,
+            [
+                evaluate_bitstring_for_qubo(bitstring, qubo())
+                for bitstring in bitstrings
+            ],
+        )
+
+    def test_measurements_can_be_evaluated(self):
+        measurements = Measurements(all_bitstrings(3))
+
+        energies = evaluate_bitstrings_for_qubo(measurements, qubo())
+
+        np.testing.assert_array_equal(
+            energies,
+            [
+                evaluate_bitstring_for_qubo(bitstring, qubo())
+                for bitstring in measurements.bitstrings
+            ],
+        )
+
+    @pytest.mark.parametrize("density", [0.05, 1.0])
+    def test_energies_of_random_qubo_match_dimod_energies(self, density):
+        bqm = dimod.generators.gnp_random_bqm(40, density, "BINARY", random_state=42)
+        bitstrings = np.random.default_rng(42).integers(0, 2, size=(100, 40))
+
+        energies = evaluate_bitstrings_for_qubo(bitstrings, bqm)
+
+        np.testing.assert_allclose(energies, bqm.energies((bitstrings, range(40))))
+
+    def test_bits_not_present_in_qubo_do_not_contribute_to_energy(self):
+        bqm = dimod.BinaryQuadraticModel({0: 1, 2: -1}, {(0, 2): 3}, 0.5, "BINARY")
+
+        energies = evaluate_bitstrings_for_qubo(np.ones((1, 4), dtype=bool), bqm)
+
+        np.testing.assert_array_equal(energies, [3.5])
+
+    def test_fails_for_variables_not_matching_bit_positions(self):
+        bqm = dimod.BinaryQuadraticModel({"a": 1, "b": -1}, {}, 0, "BINARY")
+
+        with pytest.raises(ValueError):
+            evaluate_bitstrings_for_qubo(np.ones((1, 2), dtype=bool), bqm)
+
+    def test_energies_follow_modifications_of_qubo(self):
+        bqm = qubo()
+        evaluate_bitstrings_for_qubo(np.ones((1, 3), dtype=bool), bqm)
+        evaluate_bitstring_for_qubo("111", bqm)
+
+        # Energy of all ones doesn't change.
+        bqm.add_linear(0, 1.0)
+        bqm.add_linear(1, -1.0)
+
+        assert evaluate_bitstring_for_qubo("100", bqm) == bqm.energy({0: 1, 1: 0, 2: 0})
+        np.testing.assert_array_equal(
+            evaluate_bitstrings_for_qubo(np.array([[1, 0, 0]]), bqm),
+            [bqm.energy({0: 1, 1: 0, 2: 0})],
+        )
+
+    def test_fails_for_one_dimensional_input(self):
+        with pytest.raises(ValueError):
+            evaluate_bitstrings_for_qubo(np.ones(3, dtype=bool), qubo())